@@ -1,20 +1,25 @@
 from flask import Flask, request, jsonify
+from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
-from flask_mail import Mail
 from flask_bcrypt import Bcrypt
 from config import Config
 
 # Initialize extensions without binding to app yet
 db = SQLAlchemy()
 jwt = JWTManager()
-mail = Mail()
 bcrypt = Bcrypt()
 
-def create_app():
+def create_app(config_class=Config):
     app = Flask(__name__)
-    app.config.from_object(Config)  # Load config from config.py
+    app.config.from_object(config_class)  # Load config from config.py
+
+    # Trust X-Forwarded-For/-Proto from our hosting proxy so request.remote_addr is
+    # the client and request.scheme is https. X-Forwarded-Host is not trusted
+    if app.config.get('PROXY_COUNT'):
+        proxies = app.config['PROXY_COUNT']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
     
     # Disable strict slashes before anything else
     app.url_map.strict_slashes = False
@@ -23,20 +28,51 @@ def create_app():
     db.init_app(app)
     jwt.init_app(app)
     bcrypt.init_app(app)
+
+    # Cached admin lookup behind flask_jwt_extended's current_user
+    from app.identity import admin_identities
+    admin_identities.init_app(app)
+
+    # Bounded bcrypt pool and login throttling for /api/auth/login
+    from app.login_guard import login_throttle, password_verifier
+    password_verifier.init_app(app)
+    login_throttle.init_app(app)
     
-    # Only initialize mail if credentials are present
+    # Only initialize mail if credentials are present (and only then import Flask-Mail)
     if app.config.get('MAIL_USERNAME') and app.config.get('MAIL_PASSWORD'):
-        mail.init_app(app)
+        from flask_mail import Mail
+        Mail(app)
+
+    # Background workers that send queued emails (no-op without mail credentials)
+    from app.outbox import outbox
+    outbox.init_app(app)
+
+    # File storage for gallery derivatives, and the workers that make them
+    from app.storage import init_storage
+    from app.gallery_pipeline import gallery_pipeline
+    init_storage(app)
+    gallery_pipeline.init_app(app)
+
+    # Admission document uploads: per-IP limit, and removal of abandoned ones
+    from app.uploads import upload_pruner, upload_throttle
+    upload_throttle.init_app(app)
+    upload_pruner.init_app(app)
 
     # Configure CORS
     CORS(app, 
          origins=["http://localhost:5173", "http://localhost:8080", "https://katch-jade.vercel.app"],
          supports_credentials=True,
          allow_headers=["Content-Type", "Authorization"],
+         expose_headers=["X-Next-Cursor", "X-Total-Count"],
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
     
     ALLOWED_ORIGINS = ["http://localhost:5173", "http://localhost:8080", "https://katch-jade.vercel.app"]
 
+    # Server-Timing, per-endpoint percentiles and the slow-request log. Registered
+    # before the hook below so its timing includes compression
+    from app.instrumentation import request_metrics
+    request_metrics.init_app(app)
+
     def add_cors_headers(response):
         origin = request.headers.get('Origin')
         if origin in ALLOWED_ORIGINS:
@@ -44,11 +80,18 @@ def create_app():
             response.headers['Access-Control-Allow-Credentials'] = 'true'
             response.headers['Access-Control-Allow-Headers'] = 'Content-Type,Authorization'
             response.headers['Access-Control-Allow-Methods'] = 'GET,POST,PUT,DELETE,OPTIONS'
+            response.headers['Access-Control-Expose-Headers'] = 'X-Next-Cursor,X-Total-Count'
+            # Timings only reach scripts on responses that carry them (admins, or PERF_SERVER_TIMING)
+            if request_metrics.timing_visible():
+                response.headers['Access-Control-Expose-Headers'] += ',Server-Timing'
+                response.headers['Timing-Allow-Origin'] = origin
         return response
 
+    from app.compression import compress_response
+
     @app.after_request
     def after_request(response):
-        return add_cors_headers(response)
+        return add_cors_headers(compress_response(response))
 
     @app.errorhandler(500)
     def internal_error(e):
@@ -65,9 +108,13 @@ def create_app():
     # Import all models so SQLAlchemy knows about them
     from app import models
 
-    # Create all database tables if they don't exist
-    with app.app_context():
-        db.create_all()
+    # Schema changes run via `flask --app run create-tables` at release time, not on
+    # every boot; AUTO_CREATE_TABLES keeps the old behaviour for local development
+    from app.cli import register_commands
+    register_commands(app)
+    if app.config.get('AUTO_CREATE_TABLES'):
+        with app.app_context():
+            db.create_all()
 
     # Register all blueprints with their URL prefixes
     from app.routes.auth import auth_bp
@@ -82,6 +129,13 @@ def create_app():
     from app.routes.stats import stats_bp  # Stats blueprint
     from app.routes.health import health_bp
     from app.routes.admissions import admissions_bp
+    from app.routes.outbox import outbox_bp
+    from app.routes.search import search_bp
+    from app.routes.home import home_bp
+    from app.routes.perf import perf_bp
+    from app.routes.changes import changes_bp
+    from app.routes.media import media_bp
+    from app.routes.uploads import uploads_bp
 
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(staff_bp, url_prefix="/api/staff")
@@ -94,6 +148,42 @@ def create_app():
     app.register_blueprint(contact_bp, url_prefix="/api/contact")
     app.register_blueprint(stats_bp, url_prefix="/api/stats")
     app.register_blueprint(admissions_bp, url_prefix="/api/admissions")
+    app.register_blueprint(outbox_bp, url_prefix="/api/outbox")
+    app.register_blueprint(search_bp, url_prefix="/api/search")
+    app.register_blueprint(perf_bp, url_prefix="/api/perf")
     app.register_blueprint(health_bp, url_prefix="/api")
+    app.register_blueprint(home_bp, url_prefix="/api")
+    app.register_blueprint(changes_bp, url_prefix="/api")
+    app.register_blueprint(media_bp, url_prefix="/media")
+    app.register_blueprint(uploads_bp, url_prefix="/api/uploads")
+
+    # Warm the DB pool in the background; once the database answers, drain any
+    # emails and gallery images left queued by a previous process. Not for
+    # `flask <command>` runs (the release step included): they serve nothing
+    from app.readiness import readiness
+    readiness.init_app(app)
+    readiness.on_ready(outbox.start)
+    readiness.on_ready(gallery_pipeline.start)
+    readiness.on_ready(upload_pruner.start)
+    if not _running_cli_command():
+        readiness.start()
+
+    return app
+
+
+def background_workers_allowed(app):
+    """Whether worker threads (outbox, gallery, upload pruner) may start in this process.
+
+    Checked by each worker's start(), so nothing can start them where they
+    are off: BACKGROUND_WORKERS_ENABLED is false, or a `flask` command runs.
+    """
+    return app.config.get('BACKGROUND_WORKERS_ENABLED', True) and not _running_cli_command()
+
 
-    return app
\ No newline at end of file
+def _running_cli_command():
+    """Whether a `flask` command other than `flask run` is loading the app."""
+    import click
+    from flask.cli import FlaskGroup
+    ctx = click.get_current_context(silent=True)
+    # Other click programs (uvicorn) load the app too, so look at the root command
+    return ctx is not None and isinstance(ctx.find_root().command, FlaskGroup) and ctx.command.name != 'run'
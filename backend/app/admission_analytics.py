@@ -0,0 +1,163 @@
+from datetime import datetime
+from threading import Lock
+
+import numpy as np
+
+from app import db
+from app.allocation import normalize
+from app.models.admission import Admission, GRADE_BANDS
+
+PERCENTILES = (10, 25, 50, 75, 90)
+MAX_SCORE = 72
+
+
+def _year_range(year):
+    return Admission.created_at >= datetime(year, 1, 1), Admission.created_at < datetime(year + 1, 1, 1)
+
+
+def _year_signature(year):
+    """(count, max id) of the intake year's applications."""
+    count, last_id = db.session.query(db.func.count(Admission.id), db.func.max(Admission.id)).filter(
+        *_year_range(year)).one()
+    return count, last_id or 0
+
+
+class _Groups:
+    """Integer codes for a text column, grouping spellings that differ only in case or spacing."""
+
+    def __init__(self):
+        self.labels = []  # First spelling seen of each group
+        self._code_of = {}
+
+    def codes(self, values):
+        code_of, labels = self._code_of, self.labels
+        for value in set(values):
+            key = normalize(value)
+            if key not in code_of:
+                code_of[key] = len(labels)
+                labels.append((value or '').strip())
+            code_of[value] = code_of[key]
+        return np.fromiter((code_of[value] for value in values), dtype=np.int64, count=len(values))
+
+
+class YearAnalytics:
+    """Score arrays of one intake year's applications, kept up to date incrementally.
+
+    refresh() compares the year's (count, max id) with what is held: new
+    submissions are fetched by id and appended; anything else (a delete, or
+    a transaction that committed below the highest id seen) rebuilds the
+    arrays. Scores, genders and schools are never edited after submission,
+    so status changes need no refresh.
+    """
+
+    def __init__(self, year):
+        self.year = year
+        self.lock = Lock()
+        self._reset()
+
+    def _reset(self):
+        self.signature = (0, 0)
+        self.scores = np.zeros(0, dtype=np.float64)
+        self.genders, self.gender_groups = np.zeros(0, dtype=np.int64), _Groups()
+        self.schools, self.school_groups = np.zeros(0, dtype=np.int64), _Groups()
+        self.reports = {}
+
+    def _append(self, rows):
+        self.scores = np.concatenate([self.scores, np.fromiter(
+            (row.kjsea_score for row in rows), dtype=np.float64, count=len(rows))])
+        self.genders = np.concatenate([self.genders, self.gender_groups.codes([row.gender for row in rows])])
+        self.schools = np.concatenate([self.schools, self.school_groups.codes([row.previous_school for row in rows])])
+        self.reports = {}
+
+    def _fetch(self, after_id):
+        return db.session.query(
+            Admission.id, Admission.kjsea_score, Admission.gender, Admission.previous_school,
+        ).filter(*_year_range(self.year), Admission.id > after_id).all()
+
+    def refresh(self):
+        """Bring the arrays up to date. Returns how many rows were read."""
+        count, last_id = _year_signature(self.year)
+        if (count, last_id) == self.signature:
+            return 0
+        held, held_last_id = self.signature
+        if count > held and last_id > held_last_id:
+            rows = self._fetch(held_last_id)
+            if held + len(rows) == count:
+                self._append(rows)
+                self.signature = (count, max(row.id for row in rows))
+                return len(rows)
+        self._reset()
+        rows = self._fetch(0)
+        self._append(rows)
+        self.signature = (len(rows), max((row.id for row in rows), default=0))
+        return len(rows)
+
+    def report(self, bin_width):
+        """Distribution, percentiles, grade bands and group averages in one pass over the arrays."""
+        if bin_width in self.reports:
+            return self.reports[bin_width]
+
+        scores = self.scores
+        total = len(scores)
+        edges = np.arange(0, MAX_SCORE + bin_width, bin_width, dtype=np.float64)  # Last bin includes 72
+        counts, _ = np.histogram(scores, bins=edges)
+
+        # get_grade_band, vectorized: index of the highest band whose lowest score is reached
+        bands = [band for band, _ in reversed(GRADE_BANDS)]
+        band_index = np.searchsorted([lowest for _, lowest in reversed(GRADE_BANDS)][1:], scores, side='right')
+        band_counts = np.bincount(band_index, minlength=len(bands))
+
+        if total:
+            summary = {'mean': round(float(scores.mean()), 2), 'std': round(float(scores.std()), 2),
+                       'min': float(scores.min()), 'max': float(scores.max())}
+            percentiles = [round(float(value), 2) for value in np.percentile(scores, PERCENTILES)]
+        else:
+            summary = {'mean': None, 'std': None, 'min': None, 'max': None}
+            percentiles = [None] * len(PERCENTILES)
+
+        report = {
+            'year': self.year,
+            'total': total,
+            **summary,
+            'percentiles': {f'p{p}': value for p, value in zip(PERCENTILES, percentiles)},
+            'histogram': [{'from': float(low), 'to': float(high), 'count': int(count)}
+                          for low, high, count in zip(edges[:-1], edges[1:], counts)],
+            'grade_bands': {band: int(count) for band, count in zip(bands, band_counts)},
+            'by_gender': {group.pop('name'): group for group in
+                          self._group_averages(self.genders, self.gender_groups.labels)},
+            'by_school': sorted(self._group_averages(self.schools, self.school_groups.labels),
+                                key=lambda group: (-group['applicants'], group['name'])),
+        }
+        self.reports[bin_width] = report
+        return report
+
+    def _group_averages(self, codes, labels):
+        counts = np.bincount(codes, minlength=len(labels))
+        sums = np.bincount(codes, weights=self.scores, minlength=len(labels))
+        return [{'name': label, 'applicants': int(count), 'mean': round(float(total / count), 2)}
+                for label, count, total in zip(labels, counts, sums) if count]
+
+    def percentile_rank(self, score):
+        """Percentage of the year's applicants scoring at or below `score`."""
+        if not len(self.scores):
+            return None
+        below = np.count_nonzero(self.scores <= score)
+        return round(100 * below / len(self.scores), 2)
+
+
+class AdmissionAnalytics:
+    """YearAnalytics per intake year, shared by every request in this process."""
+
+    def __init__(self):
+        self._years = {}
+        self._lock = Lock()
+
+    def year(self, year):
+        with self._lock:
+            analytics = self._years.get(year)
+            if analytics is None:
+                analytics = self._years[year] = YearAnalytics(year)
+        return analytics
+
+
+admission_analytics = AdmissionAnalytics()
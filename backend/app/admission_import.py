@@ -0,0 +1,212 @@
+import csv
+import io
+import json
+from collections import Counter
+from datetime import datetime
+
+from app import db
+from app.changes import log_changes
+from app.models.admission import Admission, admission_values
+from app.models.admission_counter import AdmissionCounter
+from app.models.admission_sequence import AdmissionSequence
+from app.outbox import enqueue_emails
+
+MAX_REPORTED_ERRORS = 1000
+JSON_CHUNK_SIZE = 64 * 1024
+
+# Column order for COPY; every key admission_values() returns plus the three set here
+IMPORT_COLUMNS = [
+    'application_number', 'applicant_name', 'gender', 'date_of_birth', 'nationality',
+    'previous_school', 'parent_name', 'parent_relationship', 'parent_phone', 'parent_email',
+    'kjsea_score', 'kjsea_result_url', 'birth_cert_url', 'passport_photo_url',
+    'school_leaving_cert_url', 'medical_report_url', 'phone_key', 'email_key', 'identity_key',
+    'status', 'is_flagged', 'created_at', 'updated_at',
+]
+
+
+def iter_csv_rows(stream):
+    """Yield one dict per CSV line from a binary stream; the header row names the fields."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    for row in csv.DictReader(text):
+        yield {key.strip(): (value.strip() if isinstance(value, str) else value)
+               for key, value in row.items() if key}
+
+
+def iter_json_rows(stream):
+    """Yield objects from a JSON array or newline-delimited JSON, reading in chunks.
+
+    Only the objects not yet yielded are held in memory, never the whole file.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig')
+    decoder = json.JSONDecoder()
+    buffer = ''
+    eof = False
+    while True:
+        buffer = buffer.lstrip(' \t\r\n,[')
+        if buffer.startswith(']'):
+            return
+        if buffer:
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError('Invalid JSON in import file')
+                obj = None  # Object continues in the next chunk
+            if obj is not None:
+                yield obj
+                buffer = buffer[end:]
+                continue
+        elif eof:
+            return
+        chunk = text.read(JSON_CHUNK_SIZE)
+        eof = not chunk
+        buffer += chunk
+
+
+IMPORT_READERS = {'csv': iter_csv_rows, 'json': iter_json_rows}
+
+
+def guess_format(filename=None, mimetype=None):
+    """'csv' or 'json' from a file name or content type, or None."""
+    name = (filename or '').lower()
+    mimetype = mimetype or ''
+    if name.endswith('.csv') or mimetype in ('text/csv', 'application/csv'):
+        return 'csv'
+    if name.endswith(('.json', '.jsonl', '.ndjson')) or mimetype in ('application/json', 'application/x-ndjson'):
+        return 'json'
+    return None
+
+
+def _copy_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _copy_rows(rows):
+    """Bulk load with Postgres COPY through the session's own connection."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)  # Quoted empty strings stay '' instead of NULL
+    for row in rows:
+        writer.writerow([_copy_value(row[column]) for column in IMPORT_COLUMNS])
+    buffer.seek(0)
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {Admission.__tablename__} ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _insert_rows(rows):
+    connection = db.session.connection()
+    if connection.dialect.name == 'postgresql' and connection.dialect.driver == 'psycopg2':
+        _copy_rows(rows)
+    else:
+        # A list of parameter sets runs as one executemany
+        db.session.execute(db.insert(Admission), rows)
+
+
+def _count_rows(rows):
+    """Bump the running admission counters once per key instead of once per row."""
+    if not AdmissionCounter.is_built():
+        return
+    totals = Counter()
+    for row in rows:
+        totals['status', row['status']] += 1
+        totals['gender', row['gender']] += 1
+        totals['grade_band', Admission.get_grade_band(row['kjsea_score'])] += 1
+    totals['total', 'all'] += len(rows)
+    for (dimension, key), delta in totals.items():
+        AdmissionCounter.bump(dimension, key, delta)
+
+
+class ImportReport:
+    def __init__(self):
+        self.valid = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.errors = []
+        self.first_number = None
+        self.last_number = None
+        self.error = None  # Set when the file itself could not be read
+
+    def reject(self, line, error):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': line, 'error': error})
+
+    def to_dict(self):
+        data = {
+            'valid': self.valid,
+            'inserted': self.inserted,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'errors_truncated': self.rejected > len(self.errors),
+            'first_application_number': self.first_number,
+            'last_application_number': self.last_number,
+        }
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+def import_admissions(rows, batch_size=1000, dry_run=False, count=False, emails=None, first_row=1):
+    """Validate and insert admission rows, committing once per batch.
+
+    `rows` is any iterable of dicts (see iter_csv_rows / iter_json_rows).
+    Rows failing submit_admission's rules are reported by row number
+    (counting from first_row) and skipped; the rest get application numbers
+    reserved a batch at a time. `count` keeps AdmissionCounter in step; `emails`, if given, maps the
+    inserted rows to (subject, recipients, body) emails queued in the same
+    transaction. With dry_run nothing is written.
+
+    If the file turns out to be unreadable part way through, batches already
+    committed stay and report.error says why the import stopped.
+    """
+    report = ImportReport()
+    batch = []
+
+    def flush():
+        report.valid += len(batch)
+        if dry_run:
+            batch.clear()
+            return
+        year = datetime.utcnow().year
+        last = AdmissionSequence.next_value(year, len(batch))
+        now = datetime.utcnow()
+        for number, row in enumerate(batch, start=last - len(batch) + 1):
+            row['application_number'] = f"KS-{year}-{number:04d}"
+            row['created_at'] = row['updated_at'] = now
+        _insert_rows(batch)
+        log_changes(Admission, Admission.application_number.in_([row['application_number'] for row in batch]))
+        if count:
+            _count_rows(batch)
+        if emails is not None:
+            enqueue_emails(emails(batch))
+        db.session.commit()
+
+        report.inserted += len(batch)
+        report.first_number = report.first_number or batch[0]['application_number']
+        report.last_number = batch[-1]['application_number']
+        batch.clear()
+
+    try:
+        for line, data in enumerate(rows, start=first_row):
+            if not isinstance(data, dict):
+                report.reject(line, 'Row must be an object')
+                continue
+            try:
+                batch.append(admission_values(data))
+            except ValueError as e:
+                report.reject(line, str(e))
+                continue
+            if len(batch) >= batch_size:
+                flush()
+    except (ValueError, csv.Error) as e:
+        # Unreadable file (bad encoding, broken JSON/CSV): keep the batches already committed
+        report.error = f"Could not read import file: {e}"
+        batch.clear()
+    if batch:
+        flush()
+    return report
@@ -0,0 +1,242 @@
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+
+from app import db
+from app.models.admission import Admission
+
+DEFAULT_POOL = ('pending', 'flagged', 'accepted')  # Statuses competing for seats unless told otherwise
+MAX_CACHED_RESULTS = 16
+
+
+def normalize(value):
+    """Case- and whitespace-insensitive key for genders, schools and quota names."""
+    return ' '.join(str(value or '').lower().split())
+
+
+class AllocationRequest:
+    """Validated parameters of one allocation run. Raises ValueError on bad input.
+
+    Body: {"capacity": 400, "gender_quotas": {"Female": 200}, "school_quotas":
+    {"Kakamega Primary": 20}, "default_school_quota": 10, "statuses": [...],
+    "waitlist": 50}. Quotas are caps: at most that many proposed seats per
+    gender or feeder school; groups without a quota are only bounded by
+    capacity (or default_school_quota for schools).
+    """
+
+    def __init__(self, data):
+        self.capacity = self._count(data, 'capacity', required=True)
+        self.gender_quotas = self._quotas(data, 'gender_quotas')
+        self.school_quotas = self._quotas(data, 'school_quotas')
+        self.default_school_quota = self._count(data, 'default_school_quota')
+        self.waitlist = self._count(data, 'waitlist')
+        if self.waitlist is None:
+            self.waitlist = 50
+        statuses = data.get('statuses') or DEFAULT_POOL
+        if not isinstance(statuses, (list, tuple)) or not all(isinstance(s, str) for s in statuses):
+            raise ValueError('statuses must be a list of application statuses')
+        self.statuses = tuple(sorted(set(statuses)))
+
+    @staticmethod
+    def _count(data, name, required=False):
+        value = data.get(name)
+        if value is None:
+            if required:
+                raise ValueError(f'{name} is required')
+            return None
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ValueError(f'{name} must be a non-negative integer')
+        return value
+
+    @classmethod
+    def _quotas(cls, data, name):
+        quotas = data.get(name) or {}
+        if not isinstance(quotas, dict):
+            raise ValueError(f'{name} must map names to seat counts')
+        return {normalize(key): cls._count(quotas, key) for key in quotas}
+
+    def key(self):
+        return (self.capacity, tuple(sorted(self.gender_quotas.items())), tuple(sorted(self.school_quotas.items())),
+                self.default_school_quota, self.statuses, self.waitlist)
+
+
+class _Grouping:
+    """Applicants (in rank order) split by one attribute, for counting within each group."""
+
+    def __init__(self, codes, names, quotas, default=None):
+        unlimited = len(codes) + 1
+        caps = np.array([quotas.get(name, unlimited if default is None else default) for name in names],
+                        dtype=np.int64)
+        self.caps = caps[codes]
+        self.limited = bool(quotas) or default is not None
+        # Stable sort by group keeps rank order inside each group
+        self._perm = np.argsort(codes, kind='stable')
+        sorted_codes = codes[self._perm]
+        self._starts = np.searchsorted(sorted_codes, sorted_codes, side='left')
+
+    def taken_before(self, mask):
+        """For every applicant, how many higher-ranked applicants of the same group are in `mask`."""
+        counted = mask[self._perm].astype(np.int64)
+        before = np.cumsum(counted) - counted
+        result = np.empty_like(before)
+        result[self._perm] = before - before[self._starts]
+        return result
+
+    def within(self, mask):
+        return self.taken_before(mask) < self.caps
+
+
+class _Pool:
+    """Score arrays for every competing application, in rank order.
+
+    Rows arrive sorted by score descending, then the earlier application,
+    then the lower id (see _load_pool). `rank` is the standard competition
+    rank: tied scores share the better rank (1, 2, 2, 4).
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.size = len(rows)
+        self.scores = np.fromiter((row.kjsea_score for row in rows), dtype=np.float64, count=self.size)
+        self.ranks = np.searchsorted(-self.scores, -self.scores, side='left') + 1
+        self.genders, self.gender_names = self._codes([row.gender for row in rows])
+        self.schools, self.school_names = self._codes([row.previous_school for row in rows])
+
+    @staticmethod
+    def _codes(values):
+        """Integer group per value, with the sorted normalized group names."""
+        keys = {value: normalize(value) for value in set(values)}  # Few distinct values; normalize each once
+        names = sorted(set(keys.values()))
+        code_of = {name: code for code, name in enumerate(names)}
+        codes = np.fromiter((code_of[keys[value]] for value in values), dtype=np.int64, count=len(values))
+        return codes, names
+
+
+def _signature():
+    """Changes whenever an application is added, edited or removed."""
+    return tuple(db.session.query(
+        db.func.count(Admission.id), db.func.max(Admission.id), db.func.max(Admission.updated_at),
+    ).one())
+
+
+def _load_pool(statuses):
+    rows = db.session.query(
+        Admission.id, Admission.application_number, Admission.applicant_name, Admission.gender,
+        Admission.previous_school, Admission.kjsea_score, Admission.status, Admission.created_at,
+    ).filter(Admission.status.in_(statuses)).order_by(
+        Admission.kjsea_score.desc(), Admission.created_at.asc().nulls_last(), Admission.id.asc(),
+    ).all()
+    return _Pool(rows)
+
+
+def allocate(pool, params):
+    """Propose who gets the seats: every applicant in rank order, accepted
+    unless their gender or school quota is already full or capacity is reached.
+
+    Vectorized: an applicant's outcome depends only on the outcomes of
+    higher-ranked applicants, so it is the fixed point of applying both
+    quotas to the previous pass's accepted set. Each pass settles at least
+    one more applicant and the loop usually ends after a handful. Capacity
+    just keeps the first `capacity` applicants the quotas let through.
+    Returns (accepted mask, reason array) in rank order.
+    """
+    genders = _Grouping(pool.genders, pool.gender_names, params.gender_quotas)
+    schools = _Grouping(pool.schools, pool.school_names, params.school_quotas, params.default_school_quota)
+    groupings = [g for g in (genders, schools) if g.limited]
+
+    passed = np.ones(pool.size, dtype=bool)
+    for _ in range(pool.size + 1):
+        candidate = np.ones(pool.size, dtype=bool)
+        for grouping in groupings:
+            candidate &= grouping.within(passed)
+        if np.array_equal(candidate, passed):
+            break
+        passed = candidate
+        if len(groupings) < 2:
+            break  # One quota alone needs no second pass
+
+    accepted = passed & (np.cumsum(passed) <= params.capacity)
+
+    reason = np.full(pool.size, 'capacity', dtype=object)
+    reason[accepted] = 'accepted'
+    reason[~genders.within(passed)] = 'gender_quota'
+    reason[~schools.within(passed)] = 'school_quota'
+    return accepted, reason
+
+
+def _applicant(pool, i, reason):
+    row = pool.rows[i]
+    return {
+        'id': row.id,
+        'application_number': row.application_number,
+        'applicant_name': row.applicant_name,
+        'gender': row.gender,
+        'previous_school': row.previous_school,
+        'kjsea_score': row.kjsea_score,
+        'status': row.status,
+        'rank': int(pool.ranks[i]),
+        'position': int(i) + 1,
+        'outcome': reason,
+    }
+
+
+def _counts(names, codes, mask):
+    counts = np.bincount(codes[mask], minlength=len(names))
+    return {name: int(count) for name, count in zip(names, counts) if count}
+
+
+def allocation_report(pool, params):
+    accepted, reason = allocate(pool, params)
+    accepted_at = np.flatnonzero(accepted)
+    waiting_at = np.flatnonzero(~accepted)[:params.waitlist]
+    return {
+        'capacity': params.capacity,
+        'pool_size': pool.size,
+        'accepted_count': int(accepted.sum()),
+        'cutoff_score': float(pool.scores[accepted_at[-1]]) if len(accepted_at) else None,
+        'by_gender': _counts(pool.gender_names, pool.genders, accepted),
+        'by_school': _counts(pool.school_names, pool.schools, accepted),
+        'accepted': [_applicant(pool, i, 'accepted') for i in accepted_at],
+        'waitlist': [_applicant(pool, i, reason[i]) for i in waiting_at],
+    }
+
+
+class AllocationCache:
+    """Pools and reports kept until the admissions table changes.
+
+    Checking costs one aggregate query per call; the pool is rebuilt only when
+    the signature moves, and each distinct set of parameters is computed once
+    per pool.
+    """
+
+    def __init__(self):
+        self._pools = {}
+        self._reports = OrderedDict()
+        self._lock = Lock()
+
+    def report(self, params):
+        signature = _signature()
+        key = (signature, params.key())
+        with self._lock:
+            if key in self._reports:
+                self._reports.move_to_end(key)
+                return self._reports[key]
+            pool = self._pools.get((signature, params.statuses))
+
+        if pool is None:
+            pool = _load_pool(params.statuses)
+        report = allocation_report(pool, params)
+
+        with self._lock:
+            self._pools = {k: v for k, v in self._pools.items() if k[0] == signature}
+            self._pools[signature, params.statuses] = pool
+            self._reports[key] = report
+            for stale in [k for k in self._reports if k[0] != signature]:
+                del self._reports[stale]
+            while len(self._reports) > MAX_CACHED_RESULTS:
+                self._reports.popitem(last=False)
+        return report
+
+
+allocation_cache = AllocationCache()
@@ -0,0 +1,146 @@
+import io
+
+from a2wsgi import WSGIMiddleware
+from a2wsgi.wsgi import build_environ
+from flask import jsonify, request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import create_app, db
+from app.cache import serve_cached
+from app.instrumentation import time_pool_checkouts
+from app.models.alumni import Alumni
+from app.models.events import Event
+from app.models.gallery import Gallery
+from app.models.kcse_results import KcseResult
+from app.models.news import News
+from app.models.school_stats import SchoolStat
+from app.models.staff import Staff
+from app.models.testimonials import Testimonial
+from app.pagination import KEYSET_PARAMS, keyset_items, keyset_select, page_response
+from app.serializers import json_response
+from config import Config
+
+# Sync driver -> the async driver used for the same database
+ASYNC_DRIVERS = {'postgresql': 'postgresql+asyncpg', 'sqlite': 'sqlite+aiosqlite'}
+
+
+def _full_list(model, *order_by):
+    serializer = model.serializer()
+    return serializer, db.select(*serializer.columns).order_by(*order_by), None
+
+
+# Public GET lists served on the event loop:
+# path -> (cache tag, fn() -> (serializer, statement, keyset limit), query params read).
+# Each mirrors its Flask view in app/routes, which still serves every other method and path.
+PUBLIC_READS = {
+    '/api/news': ('news', lambda: keyset_select(News), KEYSET_PARAMS),
+    '/api/events': ('events', lambda: keyset_select(Event), KEYSET_PARAMS),
+    '/api/gallery': ('gallery', lambda: keyset_select(Gallery), KEYSET_PARAMS),
+    '/api/staff': ('staff', lambda: _full_list(Staff), ()),
+    '/api/stats': ('stats', lambda: _full_list(SchoolStat), ()),
+    '/api/alumni': ('alumni', lambda: _full_list(Alumni, Alumni.created_at.desc()), ()),
+    '/api/kcse': ('kcse', lambda: _full_list(KcseResult, KcseResult.year.desc()), ()),
+    '/api/testimonials': ('testimonials', lambda: _full_list(Testimonial, Testimonial.created_at.desc()), ()),
+}
+
+
+def async_engine_for(app):
+    """An AsyncEngine on the same database as the app's sync engine."""
+    config = app.config
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for {backend} databases")
+    url = url.set(drivername=ASYNC_DRIVERS[backend])
+
+    options = {}
+    if backend == 'postgresql':
+        # asyncpg takes ssl= rather than libpq's sslmode
+        query = dict(url.query)
+        sslmode = query.pop('sslmode', None)
+        url = url.set(query=query)
+        options = {
+            'pool_size': config.get('ASYNC_DB_POOL_SIZE', 10),
+            'pool_pre_ping': True,
+            'pool_recycle': 300,
+            'connect_args': {'ssl': sslmode} if sslmode else {},
+        }
+    engine = create_async_engine(url, **options)
+    time_pool_checkouts(engine.sync_engine.pool)
+    return engine
+
+
+class PublicReadApp:
+    """ASGI app: public list reads on the event loop, everything else through Flask.
+
+    GETs for PUBLIC_READS paths are answered by coroutines that await an
+    async-driver query instead of holding a worker thread while the database
+    answers. They run inside a Flask request context, so the response cache,
+    Server-Timing, compression and CORS are the same as on the WSGI path, and
+    the cache is shared: an admin write through Flask invalidates the entries
+    the async path serves.
+
+    Admin writes and every other request go to the unchanged Flask app via
+    a2wsgi, which runs them on a thread pool of ASGI_WSGI_THREADS.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.engine = async_engine_for(flask_app)
+        self.wsgi = WSGIMiddleware(flask_app, workers=flask_app.config.get('ASGI_WSGI_THREADS', 10))
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        route = None
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            route = PUBLIC_READS.get(scope['path'].rstrip('/'))
+        if route is None:
+            return await self.wsgi(scope, receive, send)
+        await self._public_read(scope, send, *route)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _query(self, build):
+        try:
+            serializer, statement, limit = build()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        async with self.engine.connect() as connection:
+            rows = (await connection.execute(statement)).all()
+        if limit is None:
+            return json_response(serializer.rows_to_dicts(rows))
+        return page_response(*keyset_items(serializer, rows, limit))
+
+    async def _public_read(self, scope, send, tag, build, params):
+        app = self.flask_app
+        # The context lives in contextvars, so it stays current across the await
+        with app.request_context(build_environ(scope, io.BytesIO())):
+            try:
+                response = app.preprocess_request()
+                if response is None:
+                    response = await serve_cached((tag,), lambda: self._query(build), params)
+                response = app.process_response(app.make_response(response))
+            except Exception as e:
+                response = app.handle_exception(e)
+            # As on the WSGI path: no body for 304s, final header fix-ups
+            app_iter, status, headers = response.get_wsgi_response(request.environ)
+            body = b''.join(app_iter)
+
+        await send({'type': 'http.response.start', 'status': int(status.split(' ', 1)[0]),
+                    'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                for name, value in headers]})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+def create_asgi_app(config_class=Config):
+    return PublicReadApp(create_app(config_class))
@@ -0,0 +1,198 @@
+import hashlib
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from urllib.parse import urlencode
+
+from flask import current_app, make_response, request
+
+from app.compression import compress, negotiate_encoding
+
+
+class ResponseCache:
+    """In-memory store of serialized GET responses, grouped by tag.
+
+    Each entry remembers the tags (usually blueprint names) it was built from,
+    so a write to any of those tags drops it. Every tag also carries a
+    generation counter: a response that was being built while a write landed
+    is not stored, so a slow reader can never put stale data back in.
+
+    Entries are kept least recently used first: storing past max_entries
+    evicts from the front, and expired entries are swept out at most once
+    per TTL, so memory stays bounded whatever URLs clients request.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = Lock()
+        self._swept_at = time.monotonic()
+
+    def generation(self, tags):
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def get(self, key, ttl):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if ttl and time.monotonic() - entry['stored_at'] > ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _sweep(self, ttl, now):
+        expired = [key for key, entry in self._entries.items() if now - entry['stored_at'] > ttl]
+        for key in expired:
+            del self._entries[key]
+        self._swept_at = now
+
+    def set(self, key, tags, generation, body, mimetype, headers=(), ttl=None, max_entries=None):
+        entry = {
+            'tags': tuple(tags),
+            'body': body,
+            'mimetype': mimetype,
+            'headers': tuple(headers),
+            'encoded': {},
+            'etag': hashlib.sha1(body).hexdigest(),
+            'stored_at': time.monotonic(),
+        }
+        with self._lock:
+            current = tuple(self._generations.get(tag, 0) for tag in tags)
+            if current == generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+            if ttl and entry['stored_at'] - self._swept_at > ttl:
+                self._sweep(ttl, entry['stored_at'])
+            while max_entries and len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [key for key, entry in self._entries.items()
+                     if any(tag in entry['tags'] for tag in tags)]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+response_cache = ResponseCache()
+
+
+def _encoded_body(entry, encoding):
+    # Compressed once per encoding and kept with the entry, so hits cost no compression CPU
+    encoded = entry['encoded'].get(encoding)
+    if encoded is None:
+        encoded = entry['encoded'][encoding] = compress(entry['body'], encoding, cached=True)
+    return encoded
+
+
+def _build_response(entry):
+    body, etag, encoding = entry['body'], entry['etag'], None
+    compressible = (current_app.config.get('COMPRESSION_ENABLED', True)
+                    and entry['mimetype'] == 'application/json')
+    if compressible:
+        encoding = negotiate_encoding(len(body))
+        if encoding:
+            body, etag = _encoded_body(entry, encoding), f"{etag}-{encoding}"
+
+    response = current_app.response_class(body, status=200, mimetype=entry['mimetype'])
+    response.headers.extend(entry['headers'])
+    if compressible and len(entry['body']) >= current_app.config.get('COMPRESSION_MIN_SIZE', 1024):
+        response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    # Browsers must revalidate each time, which costs a 304 at most
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+def _store(key, tags, generation, response):
+    headers = [(name, value) for name, value in response.headers
+               if name.lower() not in ('content-type', 'content-length')]
+    return response_cache.set(key, tags, generation, response.get_data(), response.mimetype, headers,
+                              ttl=current_app.config.get('RESPONSE_CACHE_TTL'),
+                              max_entries=current_app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 1000))
+
+
+def cache_key(params=()):
+    """The request path plus only the query params the view reads, in a fixed order.
+
+    Unknown params (cache busters) and their order don't make new entries.
+    """
+    query = [(name, request.args[name]) for name in sorted(params) if name in request.args]
+    path = request.path.rstrip('/') or '/'  # /api/news and /api/news/ share entries
+    return f"{path}?{urlencode(query)}" if query else path
+
+
+def cached(*tags, params=()):
+    """Cache a public GET view's body and answer If-None-Match with 304.
+
+    `params` names the query params the view reads; the cache key includes
+    those, so filtered or paginated variants are stored separately.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get('RESPONSE_CACHE_ENABLED', True):
+                return view(*args, **kwargs)
+
+            key = cache_key(params)
+            ttl = current_app.config.get('RESPONSE_CACHE_TTL')
+            entry = response_cache.get(key, ttl)
+            if entry is None:
+                generation = response_cache.generation(tags)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                entry = _store(key, tags, generation, response)
+            return _build_response(entry)
+        return wrapper
+    return decorator
+
+
+async def serve_cached(tags, view, params=()):
+    """cached() for a coroutine view, used by the ASGI read path (see app/asgi.py).
+
+    Same keys and tags as the Flask views, so both paths share entries and
+    writes through Flask invalidate both.
+    """
+    if not current_app.config.get('RESPONSE_CACHE_ENABLED', True):
+        return await view()
+
+    key = cache_key(params)
+    entry = response_cache.get(key, current_app.config.get('RESPONSE_CACHE_TTL'))
+    if entry is None:
+        generation = response_cache.generation(tags)
+        response = make_response(await view())
+        if response.status_code != 200:
+            return response
+        entry = _store(key, tags, generation, response)
+    return _build_response(entry)
+
+
+def invalidates(*tags):
+    """Drop cached responses for the given tags after a successful write."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+            if response.status_code < 400:
+                response_cache.invalidate(*tags)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.admission import Admission
+from app.models.alumni import Alumni
+from app.models.change_log import ChangeLog
+from app.models.contact import ContactSubmission
+from app.models.events import Event
+from app.models.gallery import Gallery
+from app.models.kcse_results import KcseResult
+from app.models.news import News
+from app.models.school_stats import SchoolStat
+from app.models.staff import Staff
+from app.models.testimonials import Testimonial
+
+# Tables in the change feed, by the name clients see
+TRACKED_MODELS = {model.__tablename__: model for model in (
+    Admission, ContactSubmission, News, Event, Gallery, Staff, Alumni, KcseResult, Testimonial, SchoolStat,
+)}
+_TRACKED = set(TRACKED_MODELS.values())
+
+
+@event.listens_for(Session, 'after_flush')
+def _log_flushed_changes(session, flush_context):
+    """Record ORM inserts, updates and deletes of tracked rows in change_log."""
+    now = datetime.utcnow()
+    rows = []
+    for obj in list(session.new) + [obj for obj in session.dirty if session.is_modified(obj)]:
+        if type(obj) in _TRACKED:
+            rows.append({'table_name': obj.__tablename__, 'row_id': obj.id, 'operation': 'upsert', 'changed_at': now})
+    for obj in session.deleted:
+        if type(obj) in _TRACKED:
+            rows.append({'table_name': obj.__tablename__, 'row_id': obj.id, 'operation': 'delete', 'changed_at': now})
+    if rows:
+        session.connection().execute(db.insert(ChangeLog), rows)
+
+
+def log_changes(model, where, operation='upsert'):
+    """Record a bulk UPDATE/DELETE/INSERT of `model` rows matching `where`.
+
+    Statements executed directly skip the flush hook above, so they log
+    their rows with one INSERT ... SELECT. Call it before a bulk DELETE
+    (the rows must still exist) and after a bulk INSERT. Does not commit.
+    """
+    selected = db.select(
+        db.literal(model.__tablename__), model.id, db.literal(operation), db.literal(datetime.utcnow(), db.DateTime),
+    ).where(where)
+    db.session.execute(db.insert(ChangeLog).from_select(
+        ['table_name', 'row_id', 'operation', 'changed_at'], selected))
+
+
+def _expired(since):
+    """True if entries after `since` may already have been pruned."""
+    oldest = db.session.query(db.func.min(ChangeLog.id)).scalar()
+    return oldest is not None and since + 1 < oldest
+
+
+def latest_cursor():
+    return db.session.query(db.func.max(ChangeLog.id)).scalar() or 0
+
+
+def changes_since(since, limit, tables=None, settle_seconds=0):
+    """Changes after cursor `since`, oldest first, at most `limit` change_log entries.
+
+    Returns (changes, cursor, has_more), or None if the cursor is older than
+    the retained log and the client must reload everything. Several changes
+    to one row collapse into its latest state: an upsert carries the row as
+    it is now, a delete is a tombstone. Entries younger than settle_seconds
+    are held back so a transaction that took its id earlier but commits
+    later is not skipped over.
+    """
+    if _expired(since):
+        return None
+
+    query = db.session.query(ChangeLog).filter(ChangeLog.id > since)
+    if tables:
+        query = query.filter(ChangeLog.table_name.in_(tables))
+    if settle_seconds:
+        query = query.filter(ChangeLog.changed_at <= datetime.utcnow() - timedelta(seconds=settle_seconds))
+    entries = query.order_by(ChangeLog.id).limit(limit + 1).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        return [], since, False
+
+    latest = {}  # (table, id) -> entry; dict order follows each row's last change
+    for entry in entries:
+        key = (entry.table_name, entry.row_id)
+        latest.pop(key, None)
+        latest[key] = entry
+
+    # Current state of every upserted row, one query per table
+    data = {}
+    upserted = {}
+    for (table, row_id), entry in latest.items():
+        if entry.operation == 'upsert':
+            upserted.setdefault(table, []).append(row_id)
+    for table, ids in upserted.items():
+        serializer = TRACKED_MODELS[table].serializer()
+        rows = db.session.query(*serializer.columns).filter(TRACKED_MODELS[table].id.in_(ids)).all()
+        for item in serializer.rows_to_dicts(rows):
+            data[table, item['id']] = item
+
+    changes = []
+    for (table, row_id), entry in latest.items():
+        change = {'table': table, 'id': row_id, 'changed_at': entry.changed_at}
+        row = data.get((table, row_id))
+        if row is None:
+            change['op'] = 'delete'  # Gone since this entry; its own tombstone follows later
+        else:
+            change['op'] = 'upsert'
+            change['data'] = row
+        changes.append(change)
+    return changes, entries[-1].id, has_more
+
+
+def prune_changes(days):
+    """Delete change_log entries older than `days`. Returns how many. Commits.
+
+    The newest entry is always kept, so _expired() can still recognise
+    cursors from before the pruned range.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    deleted = db.session.execute(db.delete(ChangeLog).where(
+        ChangeLog.changed_at < cutoff, ChangeLog.id < latest_cursor())).rowcount
+    db.session.commit()
+    return deleted
@@ -0,0 +1,129 @@
+import click
+from flask import current_app
+from sqlalchemy import inspect, text
+
+from app import db
+
+
+def add_missing_columns_and_indexes():
+    """Bring existing tables up to the models: add new nullable columns and new indexes.
+
+    create_all() only creates whole tables. Returns the names of what was added.
+    """
+    engine = db.engine
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    added = []
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"))
+                added.append(f"{table.name}.{column.name}")
+            indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(connection)
+                    added.append(index.name)
+    return added
+
+
+def register_commands(app):
+    @app.cli.command('create-tables')
+    def create_tables():
+        """Create missing tables, columns and indexes. Run once per deploy, not on every boot."""
+        for name in add_missing_columns_and_indexes():
+            click.echo(f'Added {name}')
+        db.create_all()
+        click.echo('Database tables are up to date.')
+
+    @app.cli.command('prune-changes')
+    @click.option('--days', type=int, help='Default: CHANGE_LOG_RETENTION_DAYS')
+    def prune_changes_command(days):
+        """Drop change feed history older than the retention period."""
+        from app.changes import prune_changes
+        deleted = prune_changes(days or current_app.config.get('CHANGE_LOG_RETENTION_DAYS', 30))
+        click.echo(f'Removed {deleted} change log entries.')
+
+    @app.cli.command('prune-uploads')
+    @click.option('--hours', type=int, help='Default: UPLOAD_EXPIRY_HOURS')
+    def prune_uploads_command(hours):
+        """Remove abandoned uploads and stored documents no application uses."""
+        from app.uploads import prune_uploads
+        uploads, files = prune_uploads(hours or current_app.config.get('UPLOAD_EXPIRY_HOURS', 24))
+        click.echo(f'Removed {uploads} uploads and {files} unused files.')
+
+    @app.cli.command('dedupe-admissions')
+    @click.option('--rekey', is_flag=True, help='Recompute every lookup key, not just missing ones')
+    def dedupe_admissions_command(rekey):
+        """Link repeated applications to the first one so admins can merge them."""
+        from app.duplicates import backfill_keys, cluster_duplicates
+        filled = backfill_keys(rekey=rekey)
+        if filled:
+            click.echo(f'Filled lookup keys for {filled} applications.')
+        groups, relinked = cluster_duplicates()
+        click.echo(f'{groups} applications have duplicates; {relinked} links changed.')
+
+    @app.cli.command('import-admissions')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'json']), help='Default: from the file extension')
+    @click.option('--batch-size', type=int, help='Default: ADMISSION_IMPORT_BATCH_SIZE')
+    @click.option('--dry-run', is_flag=True, help='Validate only; write nothing')
+    @click.option('--notify', is_flag=True, help='Queue confirmation emails; the web app\'s outbox workers send them')
+    def import_admissions_command(path, fmt, batch_size, dry_run, notify):
+        """Bulk-import admission applications from a CSV or JSON file."""
+        from app.admission_import import IMPORT_READERS, guess_format, import_admissions
+        from app.routes.admissions import confirmation_emails
+
+        fmt = fmt or guess_format(path)
+        if fmt is None:
+            raise click.UsageError('Cannot tell the format from the file name; pass --format')
+
+        with open(path, 'rb') as f:
+            report = import_admissions(
+                IMPORT_READERS[fmt](f),
+                batch_size=batch_size or current_app.config.get('ADMISSION_IMPORT_BATCH_SIZE', 1000),
+                dry_run=dry_run,
+                count=current_app.config.get('ADMISSION_COUNTERS_ENABLED', False),
+                emails=confirmation_emails if notify else None,
+                first_row=2 if fmt == 'csv' else 1,
+            )
+
+        for error in report.errors:
+            click.echo(f"row {error['row']}: {error['error']}", err=True)
+        if report.rejected > len(report.errors):
+            click.echo(f"... and {report.rejected - len(report.errors)} more rejected rows", err=True)
+        if dry_run:
+            click.echo(f"{report.valid} valid, {report.rejected} rejected (dry run, nothing written)")
+        else:
+            click.echo(f"{report.inserted} imported ({report.first_number} to {report.last_number}), "
+                       f"{report.rejected} rejected")
+        if report.error:
+            raise click.ClickException(report.error)
+
+    @app.cli.command('process-gallery')
+    @click.option('--retry-failed', is_flag=True, help='Also queue images that failed before')
+    def process_gallery_command(retry_failed):
+        """Queue gallery images without derivatives (e.g. added before the pipeline) and process them."""
+        from app.gallery_pipeline import gallery_pipeline
+        from app.models.gallery import Gallery
+
+        waiting = Gallery.image_status.is_(None)
+        if retry_failed:
+            waiting = waiting | (Gallery.image_status == 'failed')
+        queued = db.session.execute(
+            db.update(Gallery).where(waiting).values(image_status='pending')
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        click.echo(f'Queued {queued} images.')
+        processed = 0
+        while gallery_pipeline.process_next():
+            processed += 1
+        failed = Gallery.query.filter_by(image_status='failed').count()
+        click.echo(f'Processed {processed} images; {failed} failed in total.')
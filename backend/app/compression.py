@@ -0,0 +1,63 @@
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip alone still works
+    brotli = None
+
+# Bodies served from the response cache are compressed once, so they can
+# afford the slowest, smallest settings; everything else favours speed
+CACHED_LEVELS = {'br': 11, 'gzip': 9}
+DYNAMIC_LEVELS = {'br': 5, 'gzip': 6}
+
+
+def supported_encodings():
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def negotiate_encoding(size):
+    """Pick the encoding to use for a body of `size` bytes, or None."""
+    if size < current_app.config.get('COMPRESSION_MIN_SIZE', 1024):
+        return None
+    return request.accept_encodings.best_match(supported_encodings())
+
+
+def compress(body, encoding, cached=False):
+    level = (CACHED_LEVELS if cached else DYNAMIC_LEVELS)[encoding]
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def is_compressible(response):
+    return (
+        response.mimetype == 'application/json'
+        and response.status_code == 200
+        and not response.direct_passthrough
+        and 'Content-Encoding' not in response.headers
+    )
+
+
+def compress_response(response):
+    """after_request hook: compress JSON responses the client accepts compressed.
+
+    Responses from the response cache arrive already encoded and are skipped.
+    """
+    if not current_app.config.get('COMPRESSION_ENABLED', True) or not is_compressible(response):
+        return response
+    body = response.get_data()
+    if len(body) < current_app.config.get('COMPRESSION_MIN_SIZE', 1024):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(len(body))
+    if encoding is None:
+        return response
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
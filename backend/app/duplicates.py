@@ -0,0 +1,148 @@
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from app import db
+from app.changes import log_changes
+from app.models.admission import Admission, DOCUMENT_FIELDS, duplicate_keys
+from app.models.admission_counter import AdmissionCounter
+from app.models.admission_document import AdmissionDocument
+
+
+# Two applications are for the same child when they share the normalized name
+# and date of birth, or the name and a parent phone or email. Parents of twins
+# share contacts but not names; siblings share neither name nor date of birth.
+
+def _intake_start(when=None):
+    return datetime((when or datetime.utcnow()).year, 1, 1)
+
+
+def find_duplicate(values):
+    """The first application this intake year that `values` (from admission_values) repeats, or None.
+
+    Three indexed equality lookups OR-ed together; no scan. Applications
+    whose name has no letters are never matched, as in cluster_duplicates.
+    """
+    name = values['identity_key'].split('|', 1)[0]
+    if not name:
+        return None
+    same_child = [Admission.identity_key == values['identity_key']]
+    contacts = [getattr(Admission, key) == values[key] for key in ('phone_key', 'email_key') if values[key]]
+    if contacts:
+        same_child.append(and_(or_(*contacts), Admission.identity_key.startswith(f'{name}|', autoescape=True)))
+    match = db.session.query(Admission.id, Admission.duplicate_of_id).filter(
+        or_(*same_child), Admission.created_at >= _intake_start(),
+    ).order_by(Admission.id).first()
+    if match is None:
+        return None
+    return db.session.get(Admission, match.duplicate_of_id or match.id)
+
+
+def backfill_keys(batch_size=1000, rekey=False):
+    """Fill the lookup keys of applications saved before they existed, or with
+    `rekey` recompute every application's keys after the normalization changed.
+    Returns how many. Commits.
+    """
+    filled = last_id = 0
+    while True:
+        query = db.session.query(
+            Admission.id, Admission.parent_phone, Admission.parent_email, Admission.applicant_name,
+            Admission.date_of_birth,
+        )
+        query = query.filter(Admission.id > last_id) if rekey else query.filter(Admission.identity_key.is_(None))
+        rows = query.order_by(Admission.id).limit(batch_size).all()
+        if not rows:
+            return filled
+        last_id = rows[-1].id
+        # Bulk UPDATE by primary key, one executemany per batch
+        db.session.execute(db.update(Admission), [{'id': row.id, **duplicate_keys(row._asdict())} for row in rows])
+        db.session.commit()
+        filled += len(rows)
+
+
+class _Clusters:
+    """Union-find over application ids."""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        parent = self.parent.setdefault(item, item)
+        if parent != item:
+            parent = self.parent[item] = self.find(parent)
+        return parent
+
+    def union(self, items):
+        roots = sorted({self.find(item) for item in items})
+        for root in roots[1:]:
+            self.parent[root] = roots[0]  # Smallest id wins, so the earliest application is the primary
+
+
+def cluster_duplicates():
+    """Group every application with the others it repeats (same intake year, same rule as
+    find_duplicate) and point each at the earliest of its group through duplicate_of_id.
+
+    Catches what submit-time checks cannot: imports, applications from before
+    the keys existed and two submissions racing each other. Returns
+    (groups with duplicates, applications relinked). Commits.
+    """
+    rows = db.session.query(
+        Admission.id, Admission.created_at, Admission.phone_key, Admission.email_key, Admission.identity_key,
+        Admission.duplicate_of_id,
+    ).all()
+
+    groups = {}
+    for row in rows:
+        year = row.created_at.year if row.created_at else None
+        name = (row.identity_key or '').split('|', 1)[0]
+        if row.identity_key and name:
+            groups.setdefault(('identity', year, row.identity_key), []).append(row.id)
+            for kind in ('phone_key', 'email_key'):
+                if getattr(row, kind):
+                    groups.setdefault((kind, year, getattr(row, kind), name), []).append(row.id)
+
+    clusters = _Clusters()
+    for ids in groups.values():
+        if len(ids) > 1:
+            clusters.union(ids)
+
+    primaries = set()
+    relink = {}  # new duplicate_of_id -> ids to point at it
+    for row in rows:
+        root = clusters.find(row.id)
+        target = root if root != row.id else None
+        if target is not None:
+            primaries.add(target)
+        if row.duplicate_of_id != target:
+            relink.setdefault(target, []).append(row.id)
+
+    relinked = 0
+    for target, ids in relink.items():
+        for start in range(0, len(ids), 1000):
+            chunk = Admission.id.in_(ids[start:start + 1000])
+            db.session.execute(db.update(Admission).where(chunk).values(duplicate_of_id=target))
+            log_changes(Admission, chunk)
+            relinked += len(ids[start:start + 1000])
+    db.session.commit()
+    return len(primaries), relinked
+
+
+def merge_duplicates(primary, count=False):
+    """Fold the applications linked to `primary` into it and delete them.
+
+    Document links the primary lacks are taken from the newest duplicate
+    that has one. Returns the deleted applications. Does not commit.
+    """
+    duplicates = Admission.query.filter_by(duplicate_of_id=primary.id).order_by(Admission.id.desc()).all()
+    for duplicate in duplicates:
+        for field in DOCUMENT_FIELDS:
+            if getattr(duplicate, field) and not getattr(primary, field):
+                setattr(primary, field, getattr(duplicate, field))
+                db.session.execute(db.update(AdmissionDocument).where(
+                    AdmissionDocument.admission_id == duplicate.id, AdmissionDocument.field == field,
+                ).values(admission_id=primary.id))
+        AdmissionDocument.query.filter_by(admission_id=duplicate.id).delete()
+        db.session.delete(duplicate)
+        if count:
+            AdmissionCounter.record_admission(duplicate, -1)
+    return duplicates
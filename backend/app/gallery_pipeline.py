@@ -0,0 +1,239 @@
+import hashlib
+import http.client
+import ipaddress
+import os
+import socket
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+from urllib.parse import urlparse
+from urllib.error import HTTPError, URLError
+from urllib.request import (
+    FileHandler, FTPHandler, HTTPHandler, HTTPRedirectHandler, HTTPSHandler, ProxyHandler, build_opener,
+)
+
+from sqlalchemy import and_, or_
+
+from app import background_workers_allowed, db
+from app.cache import response_cache
+from app.imaging import make_derivatives
+from app.models.gallery import Gallery
+from app.storage import get_storage
+
+
+MAX_REDIRECTS = 3
+
+
+def _public_connection(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None, **kwargs):
+    """socket.create_connection that refuses hosts resolving to private, loopback
+    or other non-public addresses, and connects to the address it checked so a
+    second DNS answer can't swap in another."""
+    host, port = address
+    addresses = []
+    for *_, sockaddr in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+        ip = ipaddress.ip_address(sockaddr[0].split('%', 1)[0])
+        if ip.version == 6 and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global:
+            raise ValueError(f'Image host {host} resolves to a non-public address')
+        addresses.append(sockaddr[0])
+    return socket.create_connection((addresses[0], port), timeout, source_address)
+
+
+class _PublicHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _public_connection
+
+
+class _PublicHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _public_connection
+
+
+class _PublicHTTPHandler(HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_PublicHTTPConnection, req)
+
+
+class _PublicHTTPSHandler(HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_PublicHTTPSConnection, req, context=self._context)
+
+
+class _CheckedRedirectHandler(HTTPRedirectHandler):
+    """Follows at most MAX_REDIRECTS, to http(s) URLs only; each hop connects
+    through the checks above."""
+    max_redirections = MAX_REDIRECTS
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        if urlparse(newurl).scheme not in ('http', 'https'):
+            raise HTTPError(newurl, code, f'Redirect to non-http(s) URL refused: {newurl}', headers, fp)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+class _RefusedFTPHandler(FTPHandler):
+    """Replaces urllib's default so an ftp:// URL can't skip the address checks."""
+
+    def ftp_open(self, req):
+        raise URLError(f'Unsupported image URL: {req.full_url}')
+
+
+class _RefusedFileHandler(FileHandler):
+    """Replaces urllib's default so a file:// URL can't read local files."""
+
+    def file_open(self, req):
+        raise URLError(f'Unsupported image URL: {req.full_url}')
+
+
+# No ProxyHandler from the environment: the proxy's address would be checked, not the image host's
+_opener = build_opener(ProxyHandler({}), _PublicHTTPHandler, _PublicHTTPSHandler, _CheckedRedirectHandler,
+                       _RefusedFTPHandler, _RefusedFileHandler)
+
+
+def fetch_original(url, config):
+    """Bytes of the uploaded original.
+
+    With GALLERY_SOURCE_DIR set, the URL's path is read from that directory
+    instead of the remote host (a local stand-in for Cloudinary in
+    development and benchmarks). Remote fetches are http(s) only, to public
+    addresses only (redirects included), and stop at GALLERY_MAX_SOURCE_BYTES.
+    """
+    limit = config.get('GALLERY_MAX_SOURCE_BYTES', 20 * 1024 * 1024)
+    source_dir = config.get('GALLERY_SOURCE_DIR')
+    if source_dir:
+        root = os.path.abspath(source_dir)
+        path = os.path.abspath(os.path.join(root, urlparse(url).path.lstrip('/')))
+        if not path.startswith(root + os.sep):
+            raise ValueError(f'Image path outside GALLERY_SOURCE_DIR: {url}')
+        with open(path, 'rb') as f:
+            data = f.read(limit + 1)
+    else:
+        if urlparse(url).scheme not in ('http', 'https'):
+            raise ValueError(f'Unsupported image URL: {url}')
+        with _opener.open(url, timeout=config.get('GALLERY_FETCH_TIMEOUT', 15)) as response:
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > limit:
+                raise ValueError(f'Image larger than {limit} bytes')
+            data = response.read(limit + 1)
+    if len(data) > limit:
+        raise ValueError(f'Image larger than {limit} bytes')
+    return data
+
+
+def process_image(image, config, storage):
+    """Build and store the derivatives for one Gallery row and record them on it. Does not commit."""
+    data = fetch_original(image.image_url, config)
+    widths = [int(w) for w in config.get('GALLERY_WIDTHS', '320,640,960,1280').split(',')]
+    width, height, placeholder, derivatives = make_derivatives(
+        data, widths, config.get('GALLERY_WEBP_QUALITY', 78), config.get('GALLERY_JPEG_QUALITY', 80))
+
+    # Content hash in the name: a replaced image never reuses a cached URL
+    version = hashlib.sha1(data).hexdigest()[:10]
+    srcsets = {'webp': [], 'jpeg': []}
+    for target, fmt, encoded in derivatives:
+        key = storage.save(f"gallery/{image.id}/{version}-{target}.{'jpg' if fmt == 'jpeg' else fmt}", encoded)
+        srcsets[fmt].append(f"{key} {target}w")
+
+    image.width, image.height, image.blurhash = width, height, placeholder
+    image.srcset = ', '.join(srcsets['webp'])
+    image.jpeg_srcset = ', '.join(srcsets['jpeg'])
+    image.image_status = 'ready'
+    image.processed_at = datetime.utcnow()
+
+
+class GalleryPipeline:
+    """Background threads that turn new gallery uploads into derivatives.
+
+    create_gallery saves the row as pending and calls notify(). A worker
+    claims it, fetches the original, writes resized WebP/JPEG copies to the
+    storage backend and records the size, blurhash and srcsets. Claims older
+    than GALLERY_CLAIM_TIMEOUT (a worker that died) are picked up again, so
+    nothing is lost across restarts. Rows that fail are marked failed;
+    `flask process-gallery --retry-failed` queues them again.
+    """
+
+    def __init__(self):
+        self._app = None
+        self._threads = []
+        self._wake = Event()
+        self._stop = Event()
+        self._lock = Lock()
+
+    def init_app(self, app):
+        self._app = app
+        app.extensions['gallery_pipeline'] = self
+
+    def start(self):
+        with self._lock:
+            if self._threads or self._app is None or not background_workers_allowed(self._app):
+                return
+            self._stop.clear()
+            for i in range(self._app.config.get('GALLERY_WORKERS', 1)):
+                thread = Thread(target=self._run, name=f'gallery-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout=5)
+
+    def notify(self):
+        """Wake a worker now instead of waiting for the next poll. Never starts one."""
+        self._wake.set()
+
+    def _run(self):
+        poll_interval = self._app.config.get('GALLERY_POLL_INTERVAL', 60)
+        while not self._stop.is_set():
+            try:
+                with self._app.app_context():
+                    processed = self.process_next()
+            except Exception as e:
+                print(f"Gallery worker error: {e}")
+                processed = False
+            if not processed:
+                self._wake.wait(poll_interval)
+                self._wake.clear()
+
+    def _claim(self):
+        """Mark the oldest waiting row as processing and return it, or None."""
+        now = datetime.utcnow()
+        stale_claim = now - timedelta(seconds=self._app.config.get('GALLERY_CLAIM_TIMEOUT', 600))
+        due = or_(
+            Gallery.image_status == 'pending',
+            and_(Gallery.image_status == 'processing', Gallery.processed_at < stale_claim),
+        )
+        candidate = db.session.query(Gallery.id).filter(due).order_by(Gallery.id).first()
+        if candidate is None:
+            return None
+        # Repeating `due` makes the claim atomic when several workers race for the row
+        claimed = db.session.execute(
+            db.update(Gallery).where(Gallery.id == candidate.id, due)
+            .values(image_status='processing', processed_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        return db.session.get(Gallery, candidate.id) if claimed else None
+
+    def process_next(self):
+        """Process one waiting image. Returns False when there was nothing to do."""
+        image = self._claim()
+        if image is None:
+            return False  # Nothing waiting, or the row was deleted after being claimed
+        try:
+            process_image(image, self._app.config, get_storage())
+        except Exception as e:
+            print(f"Gallery image {image.id} failed: {e}")
+            db.session.rollback()
+            image.image_status = 'failed'
+            image.processed_at = datetime.utcnow()
+        db.session.commit()
+        response_cache.invalidate('gallery')
+        return True
+
+
+gallery_pipeline = GalleryPipeline()
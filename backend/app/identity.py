@@ -0,0 +1,90 @@
+import time
+from collections import namedtuple
+from threading import Lock
+
+from flask import jsonify
+from sqlalchemy import event
+
+from app import db, jwt
+from app.models.admin import AdminUser
+
+
+_admin_serializer = AdminUser.serializer()  # The fields AdminUser.to_dict() returns, no password hash
+
+
+class AdminIdentity(namedtuple('AdminIdentity', _admin_serializer.keys)):
+    """Read-only snapshot of an AdminUser, safe to share between requests.
+
+    This is what flask_jwt_extended's current_user returns on protected routes;
+    role checks can be added here later without touching every route. Holds
+    the serialized columns, so to_dict() matches AdminUser.to_dict().
+    """
+
+    @classmethod
+    def of(cls, admin):
+        return cls(*(getattr(admin, key) for key in cls._fields))
+
+    def to_dict(self):
+        return _admin_serializer.object_to_dict(self)
+
+
+class IdentityCache:
+    """Admin snapshots by id, kept for ADMIN_IDENTITY_TTL seconds.
+
+    Any update or delete of an AdminUser row drops its entry straight away.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = Lock()
+        self.ttl = 300
+
+    def init_app(self, app):
+        self.ttl = app.config.get('ADMIN_IDENTITY_TTL', 300)
+
+    def get(self, admin_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(admin_id)
+            if entry and entry[0] > now:
+                return entry[1]
+
+        admin = db.session.get(AdminUser, admin_id)
+        if admin is None:
+            return None
+        identity = AdminIdentity.of(admin)
+        with self._lock:
+            self._entries[admin_id] = (now + self.ttl, identity)
+        return identity
+
+    def invalidate(self, admin_id):
+        with self._lock:
+            self._entries.pop(admin_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+admin_identities = IdentityCache()
+
+
+@event.listens_for(AdminUser, 'after_update')
+@event.listens_for(AdminUser, 'after_delete')
+def _drop_cached_identity(mapper, connection, admin):
+    admin_identities.invalidate(admin.id)
+
+
+@jwt.user_lookup_loader
+def load_admin(jwt_header, jwt_data):
+    """Resolve the token's admin id for every @jwt_required() route"""
+    try:
+        return admin_identities.get(int(jwt_data['sub']))
+    except (TypeError, ValueError):
+        return None
+
+
+@jwt.user_lookup_error_loader
+def admin_not_found(jwt_header, jwt_data):
+    """A valid token for an admin that no longer exists: 404, as /api/auth/me always answered"""
+    return jsonify({'error': 'Admin not found'}), 404
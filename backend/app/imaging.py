@@ -0,0 +1,108 @@
+import io
+import math
+
+BLURHASH_CHARACTERS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~'
+BLURHASH_SAMPLE = 32  # Longest side of the image the placeholder is computed from
+
+
+def _base83(value, length):
+    return ''.join(BLURHASH_CHARACTERS[value // 83 ** (length - i) % 83] for i in range(1, length + 1))
+
+
+def _to_linear(value):
+    value /= 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def _to_srgb(value):
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(image, x_components=4, y_components=3):
+    """BlurHash string (https://blurha.sh) for a PIL image: ~30 characters the
+    frontend can paint as a blurred placeholder before the image loads."""
+    image = image.convert('RGB')
+    image.thumbnail((BLURHASH_SAMPLE, BLURHASH_SAMPLE))
+    width, height = image.size
+    data = image.tobytes()
+    linear = [(_to_linear(r), _to_linear(g), _to_linear(b)) for r, g, b in zip(data[0::3], data[1::3], data[2::3])]
+
+    factors = []
+    for j in range(y_components):
+        cos_y = [math.cos(math.pi * j * y / height) for y in range(height)]
+        for i in range(x_components):
+            cos_x = [math.cos(math.pi * i * x / width) for x in range(width)]
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                for x in range(width):
+                    basis = cos_x[x] * cos_y[y]
+                    pr, pg, pb = linear[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = (1 if i == 0 and j == 0 else 2) / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        quantised_max = max(0, min(82, int(max(abs(v) for f in ac for v in f) * 166 - 0.5)))
+        maximum = (quantised_max + 1) / 166
+        result += _base83(quantised_max, 1)
+    else:
+        maximum = 1
+        result += _base83(0, 1)
+    result += _base83((_to_srgb(dc[0]) << 16) + (_to_srgb(dc[1]) << 8) + _to_srgb(dc[2]), 4)
+
+    def quantise(value):
+        return max(0, min(18, int(math.copysign(abs(value / maximum) ** 0.5, value) * 9 + 9.5)))
+
+    for r, g, b in ac:
+        result += _base83(quantise(r) * 19 * 19 + quantise(g) * 19 + quantise(b), 2)
+    return result
+
+
+def target_widths(original_width, widths):
+    """The configured widths narrower than the original, plus the original
+    (capped at the largest configured width); images are never upscaled."""
+    widths = sorted(widths)
+    return sorted({w for w in widths if w < original_width} | {min(original_width, widths[-1])})
+
+
+def make_derivatives(data, widths, webp_quality=78, jpeg_quality=80):
+    """Decode an uploaded image and re-encode it at each target width.
+
+    Returns (width, height, blurhash, [(width, 'webp' | 'jpeg', bytes)]).
+    EXIF rotation is applied first, so width and height are as displayed.
+    Raises ValueError for data Pillow cannot read.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError  # Only the pipeline worker needs Pillow
+
+    try:
+        source = Image.open(io.BytesIO(data))
+        source.load()
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError(f'Unreadable image: {e}')
+    with source:
+        image = ImageOps.exif_transpose(source).convert('RGB')
+    width, height = image.size
+
+    derivatives = []
+    # Largest first; each smaller size is resized from the previous one, which is much cheaper
+    current = image
+    for target in reversed(target_widths(width, widths)):
+        if target != current.width:
+            current = current.resize((target, max(1, round(height * target / width))),
+                                     Image.Resampling.LANCZOS, reducing_gap=3.0)
+        webp, jpeg = io.BytesIO(), io.BytesIO()
+        current.save(webp, 'WEBP', quality=webp_quality, method=4)
+        current.save(jpeg, 'JPEG', quality=jpeg_quality, optimize=True, progressive=True)
+        derivatives.append((target, 'webp', webp.getvalue()))
+        derivatives.append((target, 'jpeg', jpeg.getvalue()))
+
+    components = (4, 3) if width >= height else (3, 4)
+    return width, height, blurhash(current, *components), derivatives[::-1]
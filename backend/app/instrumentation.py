@@ -0,0 +1,263 @@
+import time
+from collections import Counter, deque
+from datetime import datetime
+from threading import Lock
+
+from flask import g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import db
+
+STATEMENT_PREVIEW = 500     # Characters of each SQL statement kept in the slow log
+MAX_STATEMENTS = 200        # Statements kept per request
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class RequestStats:
+    """Timings collected while one request is handled. Times are in seconds."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.serialize_time = 0.0
+        self.statements = []  # (statement, seconds)
+
+    def add_query(self, statement, elapsed):
+        self.query_count += 1
+        self.db_time += elapsed
+        if len(self.statements) < MAX_STATEMENTS:
+            self.statements.append((statement, elapsed))
+
+    def repeated_statements(self):
+        """The most repeated statement and how often it ran (the N+1 signature)."""
+        counts = Counter(statement for statement, _ in self.statements)
+        return counts.most_common(1)[0] if counts else (None, 0)
+
+    def server_timing(self, total):
+        return ', '.join([
+            f'db;desc="{self.query_count} {"query" if self.query_count == 1 else "queries"}";'
+            f'dur={self.db_time * 1000:.1f}',
+            f'pool;desc="pool wait";dur={self.pool_wait * 1000:.1f}',
+            f'ser;desc="serialization";dur={self.serialize_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+
+def current_stats():
+    """The RequestStats of the request being handled, or None outside a request."""
+    if not has_request_context():
+        return None
+    return g.get('request_stats')
+
+
+class timed_serialization:
+    """Context manager adding the time spent inside it to the request's serialization time."""
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        stats = current_stats()
+        if stats is not None:
+            stats.serialize_time += time.perf_counter() - self.started
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Counts jsonify() encoding as serialization time."""
+
+    def dumps(self, obj, **kwargs):
+        with timed_serialization():
+            return super().dumps(obj, **kwargs)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    stats = current_stats()
+    if stats is not None:
+        stats.add_query(statement, elapsed)
+
+
+def time_pool_checkouts(pool):
+    """Wrap pool.connect() so requests see how long they waited for a connection.
+
+    This includes opening a new connection when the pool has none idle.
+    engine.dispose() replaces the pool via recreate(), so that is wrapped too.
+    """
+    connect, recreate = pool.connect, pool.recreate
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            stats = current_stats()
+            if stats is not None:
+                stats.pool_wait += time.perf_counter() - started
+
+    pool.connect = timed_connect
+    pool.recreate = lambda: time_pool_checkouts(recreate())
+    return pool
+
+
+def _admin_request():
+    """True when the request carries a valid token for an existing admin."""
+    if 'Authorization' not in request.headers:
+        return False
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity() is not None
+    except Exception:  # Expired, malformed or for a deleted admin: treated as public
+        return False
+
+
+class RequestMetrics:
+    """Per-request query, DB, pool and serialization timings.
+
+    Admin requests get a Server-Timing header, every response does with
+    PERF_SERVER_TIMING (it tells anyone how the database is doing). A rolling window of the last
+    PERF_WINDOW requests per endpoint backs the admin percentile summary, and
+    requests slower than PERF_SLOW_REQUEST_MS, running more than
+    PERF_MAX_QUERIES statements or repeating one statement
+    PERF_REPEATED_STATEMENTS times (an N+1 pattern) go to the slow log with
+    their SQL.
+    """
+
+    def __init__(self):
+        self._windows = {}  # endpoint -> deque of (total, queries, db_time, serialize_time)
+        self._slow = deque()
+        self._lock = Lock()
+
+    def init_app(self, app):
+        config = app.config
+        self.enabled = config.get('PERF_TIMING_ENABLED', True)
+        self.public_timing = config.get('PERF_SERVER_TIMING', False)
+        self.window = config.get('PERF_WINDOW', 500)
+        self.slow_ms = config.get('PERF_SLOW_REQUEST_MS', 500)
+        self.max_queries = config.get('PERF_MAX_QUERIES', 20)
+        self.repeated_statements = config.get('PERF_REPEATED_STATEMENTS', 10)
+        self._slow = deque(maxlen=config.get('PERF_SLOW_LOG_SIZE', 100))
+        self._logger = app.logger
+        app.extensions['request_metrics'] = self
+        if not self.enabled:
+            return
+
+        app.json = TimedJSONProvider(app)
+        with app.app_context():
+            for engine in db.engines.values():
+                time_pool_checkouts(engine.pool)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    def _start(self):
+        g.request_stats = RequestStats()
+
+    def timing_visible(self):
+        """Whether this response carries Server-Timing; decided once per request."""
+        if not self.enabled:
+            return False
+        if 'server_timing_visible' not in g:
+            g.server_timing_visible = self.public_timing or _admin_request()
+        return g.server_timing_visible
+
+    def _finish(self, response):
+        stats = g.pop('request_stats', None)
+        if stats is None:
+            return response
+        total = time.perf_counter() - stats.started
+        if self.timing_visible():
+            response.headers['Server-Timing'] = stats.server_timing(total)
+
+        # One shared window for 404s and the like, so random paths can't create windows
+        endpoint = f"{request.method} {request.url_rule.rule}" if request.url_rule else '<unmatched>'
+        with self._lock:
+            window = self._windows.get(endpoint)
+            if window is None:
+                window = self._windows[endpoint] = deque(maxlen=self.window)
+            window.append((total, stats.query_count, stats.db_time, stats.serialize_time))
+
+        repeated, repeats = stats.repeated_statements()
+        reasons = []
+        if total * 1000 >= self.slow_ms:
+            reasons.append('slow')
+        if stats.query_count > self.max_queries:
+            reasons.append('many_queries')
+        if repeats >= self.repeated_statements:
+            reasons.append('repeated_statement')
+        if reasons:
+            self._log_slow(endpoint, response.status_code, total, stats, reasons, repeated, repeats)
+        return response
+
+    def _log_slow(self, endpoint, status, total, stats, reasons, repeated, repeats):
+        entry = {
+            'at': datetime.utcnow().isoformat(),
+            'endpoint': endpoint,
+            'path': request.full_path.rstrip('?'),
+            'status': status,
+            'reasons': reasons,
+            'total_ms': round(total * 1000, 1),
+            'db_ms': round(stats.db_time * 1000, 1),
+            'pool_wait_ms': round(stats.pool_wait * 1000, 1),
+            'serialize_ms': round(stats.serialize_time * 1000, 1),
+            'query_count': stats.query_count,
+            'statements': [{'sql': sql[:STATEMENT_PREVIEW], 'ms': round(elapsed * 1000, 2)}
+                           for sql, elapsed in stats.statements],
+        }
+        if 'repeated_statement' in reasons:
+            entry['repeated'] = {'sql': repeated[:STATEMENT_PREVIEW], 'count': repeats}
+        with self._lock:
+            self._slow.append(entry)
+        self._logger.warning("Slow request %s (%s): %.1f ms, %d queries, %.1f ms in DB",
+                             entry['path'], ', '.join(reasons), entry['total_ms'],
+                             stats.query_count, entry['db_ms'])
+
+    def summary(self):
+        """Percentiles per endpoint over the rolling window, slowest p95 first."""
+        with self._lock:
+            windows = {endpoint: list(window) for endpoint, window in self._windows.items()}
+        endpoints = []
+        for endpoint, samples in windows.items():
+            totals = sorted(sample[0] * 1000 for sample in samples)
+            count = len(samples)
+            endpoints.append({
+                'endpoint': endpoint,
+                'count': count,
+                'p50_ms': round(percentile(totals, 50), 1),
+                'p95_ms': round(percentile(totals, 95), 1),
+                'p99_ms': round(percentile(totals, 99), 1),
+                'max_ms': round(totals[-1], 1),
+                'avg_queries': round(sum(sample[1] for sample in samples) / count, 1),
+                'avg_db_ms': round(sum(sample[2] for sample in samples) / count * 1000, 1),
+                'avg_serialize_ms': round(sum(sample[3] for sample in samples) / count * 1000, 1),
+            })
+        endpoints.sort(key=lambda e: e['p95_ms'], reverse=True)
+        return endpoints
+
+    def slow_requests(self):
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._windows.clear()
+            self._slow.clear()
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,175 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from importlib import import_module
+from threading import BoundedSemaphore, Lock
+
+from app import bcrypt
+
+
+class VerifierBusy(Exception):
+    """Raised when too many password checks are already running or waiting."""
+
+
+class PasswordVerifier:
+    """Runs bcrypt checks on a small dedicated thread pool.
+
+    bcrypt is deliberately slow, so a burst of logins can tie up every request
+    worker. Checks go through LOGIN_HASH_WORKERS threads, and at most
+    LOGIN_HASH_QUEUE_DEPTH checks may be running or waiting at once; beyond
+    that the login is refused right away instead of queueing behind the burst.
+    bcrypt releases the GIL, so the pool's threads hash in parallel.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._timeout = None
+        self._log_rounds = None
+
+    def init_app(self, app):
+        workers = app.config.get('LOGIN_HASH_WORKERS', 2)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = BoundedSemaphore(app.config.get('LOGIN_HASH_QUEUE_DEPTH', workers * 4))
+        self._timeout = app.config.get('LOGIN_HASH_TIMEOUT', 10)
+        self._log_rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        app.extensions['password_verifier'] = self
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise VerifierBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Freed when the check finishes, not when we stop waiting: a timed-out
+        # check still holds a thread, and must not let more pile up behind it
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self._timeout)
+        except TimeoutError:
+            raise VerifierBusy()
+
+    def check(self, password_hash, password):
+        return self._run(bcrypt.check_password_hash, password_hash, password)
+
+    def generate(self, password):
+        return self._run(lambda p: bcrypt.generate_password_hash(p).decode('utf-8'), password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with a different cost than BCRYPT_LOG_ROUNDS."""
+        try:
+            # bcrypt hashes look like $2b$12$<salt+hash>
+            cost = int(password_hash.split('$')[2])
+        except (IndexError, ValueError):
+            return True
+        return cost != self._log_rounds
+
+
+class MemoryThrottleBackend:
+    """Sliding-window attempt log kept in this process.
+
+    Fine for a single worker. For several workers or instances, point
+    LOGIN_THROTTLE_BACKEND at a class with the same three methods backed by
+    shared storage. Keys nobody has tried for a whole window are swept out
+    once per window, so addresses that never come back don't accumulate.
+    """
+
+    def __init__(self, app=None):
+        self._hits = {}
+        self._lock = Lock()
+        self._swept_at = time.monotonic()
+
+    def _sweep(self, window, now):
+        if now - self._swept_at < window:
+            return
+        self._swept_at = now
+        for key in [key for key, hits in self._hits.items() if hits[-1] <= now - window]:
+            del self._hits[key]
+
+    def _prune(self, key, window, now):
+        hits = self._hits.get(key)
+        if hits is None:
+            return None
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if not hits:
+            del self._hits[key]
+            return None
+        return hits
+
+    def count(self, key, window):
+        """Attempts recorded for key within the last `window` seconds, and seconds until the oldest expires."""
+        now = time.monotonic()
+        with self._lock:
+            hits = self._prune(key, window, now)
+            if not hits:
+                return 0, 0
+            return len(hits), hits[0] + window - now
+
+    def hit(self, key, window):
+        now = time.monotonic()
+        with self._lock:
+            self._sweep(window, now)
+            self._prune(key, window, now)
+            self._hits.setdefault(key, deque()).append(now)
+
+    def reset(self, key):
+        with self._lock:
+            self._hits.pop(key, None)
+
+
+def throttle_backend(app):
+    """An attempt log for `app`: the LOGIN_THROTTLE_BACKEND class if set, else MemoryThrottleBackend."""
+    backend = app.config.get('LOGIN_THROTTLE_BACKEND') or MemoryThrottleBackend
+    if isinstance(backend, str):
+        module, _, name = backend.partition(':')
+        backend = getattr(import_module(module), name)
+    return backend(app)
+
+
+class LoginThrottle:
+    """Per-IP and per-email limits on login attempts over a sliding window.
+
+    Every attempt counts against the client IP; only failed attempts count
+    against the email, so the real admin is not locked out by successes.
+    """
+
+    def __init__(self):
+        self.backend = None
+
+    def init_app(self, app):
+        config = app.config
+        self.window = config.get('LOGIN_THROTTLE_WINDOW', 900)
+        self.max_per_ip = config.get('LOGIN_MAX_ATTEMPTS_PER_IP', 20)
+        self.max_per_email = config.get('LOGIN_MAX_FAILURES_PER_EMAIL', 5)
+
+        self.backend = throttle_backend(app)
+        app.extensions['login_throttle'] = self
+
+    def retry_after(self, ip, email):
+        """Seconds the caller must wait before trying again, or 0 if allowed."""
+        ip_count, ip_wait = self.backend.count(f'ip:{ip}', self.window)
+        email_count, email_wait = self.backend.count(f'email:{email}', self.window)
+        waits = []
+        if ip_count >= self.max_per_ip:
+            waits.append(ip_wait)
+        if email_count >= self.max_per_email:
+            waits.append(email_wait)
+        return int(max(waits)) + 1 if waits else 0
+
+    def record_attempt(self, ip):
+        self.backend.hit(f'ip:{ip}', self.window)
+
+    def record_failure(self, email):
+        self.backend.hit(f'email:{email}', self.window)
+
+    def record_success(self, email):
+        self.backend.reset(f'email:{email}')
+
+
+password_verifier = PasswordVerifier()
+login_throttle = LoginThrottle()
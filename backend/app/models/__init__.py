@@ -11,4 +11,11 @@ from app.models.kcse_results import KcseResult
 from app.models.testimonials import Testimonial
 from app.models.contact import ContactSubmission
 from app.models.school_stats import SchoolStat
-from app.models.admission import Admission
\ No newline at end of file
+from app.models.admission import Admission
+from app.models.admission_counter import AdmissionCounter
+from app.models.admission_sequence import AdmissionSequence
+from app.models.outbox import OutboxEmail
+from app.models.search_document import SearchDocument
+from app.models.change_log import ChangeLog
+from app.models.upload import StoredFile, Upload
+from app.models.admission_document import AdmissionDocument
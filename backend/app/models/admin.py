@@ -1,17 +1,12 @@
 from app import db
+from app.serializers import SerializerMixin
 from datetime import datetime
 
-class AdminUser(db.Model):
+class AdminUser(SerializerMixin, db.Model):
     __tablename__ = 'admin_users'
+    __serialize_exclude__ = ('password_hash',)  # Never sent to clients
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'email': self.email,
-            'created_at': self.created_at.isoformat()
-        }
@@ -1,9 +1,125 @@
 from app import db
+from app.serializers import SerializerMixin
 from datetime import datetime
+import re
+import unicodedata
 
 
-class Admission(db.Model):
+# KJSEA grade bands as (band, lowest score in band), highest band first
+GRADE_BANDS = [('EE', 60), ('ME', 50), ('AE', 40), ('BE', 0)]
+
+DOCUMENT_FIELDS = ['kjsea_result_url', 'birth_cert_url', 'passport_photo_url',
+                   'school_leaving_cert_url', 'medical_report_url']
+
+REQUIRED_FIELDS = ['applicant_name', 'gender', 'date_of_birth', 'previous_school',
+                   'parent_name', 'parent_phone', 'parent_email', 'kjsea_score']
+
+CUTOFF_SCORE = 50  # KJSEA auto-flag threshold out of 72
+
+DATE_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y']
+
+
+def normalize_phone(phone):
+    """Kenyan numbers as their 9 national digits, so 0712..., +254 712... and 712... match."""
+    digits = re.sub(r'\D', '', str(phone or ''))
+    if digits.startswith('254') and len(digits) == 12:
+        digits = digits[3:]
+    elif digits.startswith('0') and len(digits) == 10:
+        digits = digits[1:]
+    return digits or None
+
+
+def normalize_email(email):
+    """Lowercased address without a +tag (and without dots for Gmail, which ignores them)."""
+    email = str(email or '').strip().lower()
+    local, at, domain = email.partition('@')
+    if not at:
+        return email or None
+    local = local.split('+', 1)[0]
+    if domain in ('gmail.com', 'googlemail.com'):
+        local, domain = local.replace('.', ''), 'gmail.com'
+    return f"{local}@{domain}"
+
+
+def normalize_name(name):
+    """Letters of each name, case- and accent-folded and sorted, so 'Kiprop  Kevin'
+    matches 'kevin kiprop' and 'Chébet' matches 'Chebet'. Letters of any script count."""
+    decomposed = unicodedata.normalize('NFKD', str(name or '').casefold())
+    letters = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(sorted(re.findall(r'[^\W\d_]+', letters)))
+
+
+def normalize_identity(name, date_of_birth):
+    """Applicant name plus date of birth (as ISO when it parses in a common format)."""
+    dob = str(date_of_birth or '').strip()
+    for fmt in DATE_FORMATS:
+        try:
+            dob = datetime.strptime(dob, fmt).date().isoformat()
+            break
+        except ValueError:
+            continue
+    return f"{normalize_name(name)}|{dob}"
+
+
+def admission_values(data):
+    """Check one application and return its Admission column values.
+
+    Raises ValueError with the message to show for a rejected application.
+    Used by the submission form and by bulk imports so both apply the same rules.
+    """
+    missing = [f for f in REQUIRED_FIELDS if not data.get(f) and data.get(f) != 0]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+    try:
+        score = float(data['kjsea_score'])
+    except (TypeError, ValueError):
+        raise ValueError('KJSEA score must be a number')
+    if not 0 <= score <= 72:
+        raise ValueError('KJSEA score must be between 0 and 72')
+
+    is_flagged = score >= CUTOFF_SCORE
+    values = {
+        'applicant_name': data['applicant_name'],
+        'gender': data['gender'],
+        'date_of_birth': data['date_of_birth'],
+        'nationality': data.get('nationality') or 'Kenyan',
+        'previous_school': data['previous_school'],
+        'parent_name': data['parent_name'],
+        'parent_relationship': data.get('parent_relationship', ''),
+        'parent_phone': data['parent_phone'],
+        'parent_email': data['parent_email'],
+        'kjsea_score': score,
+        'status': 'flagged' if is_flagged else 'pending',
+        'is_flagged': is_flagged,
+    }
+    for field in DOCUMENT_FIELDS:
+        values[field] = data.get(field, '')
+    values.update(duplicate_keys(values))
+    return values
+
+
+def duplicate_keys(values):
+    """The normalized lookup columns for duplicate detection (see app/duplicates.py)."""
+    return {
+        'phone_key': normalize_phone(values['parent_phone']),
+        'email_key': normalize_email(values['parent_email']),
+        'identity_key': normalize_identity(values['applicant_name'], values['date_of_birth']),
+    }
+
+
+class Admission(SerializerMixin, db.Model):
     __tablename__ = 'admissions'
+    __table_args__ = (
+        db.Index('ix_admissions_status_score', 'status', 'kjsea_score'),  # Filter by status, rank by score
+        db.Index('ix_admissions_score', 'kjsea_score'),
+        db.Index('ix_admissions_created_at', 'created_at'),
+        # Duplicate lookups at submit time and in `flask dedupe-admissions`
+        db.Index('ix_admissions_phone_key', 'phone_key'),
+        db.Index('ix_admissions_email_key', 'email_key'),
+        db.Index('ix_admissions_identity_key', 'identity_key'),
+        db.Index('ix_admissions_duplicate_of_id', 'duplicate_of_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     application_number = db.Column(db.String(20), unique=True)
@@ -36,45 +152,48 @@ class Admission(db.Model):
     is_flagged = db.Column(db.Boolean, default=False)      # auto-set when kjsea_score >= 50
     admin_notes = db.Column(db.Text)
 
+    # Duplicate detection: normalized keys, and the earliest application this one repeats
+    phone_key = db.Column(db.String(20))
+    email_key = db.Column(db.String(255))
+    identity_key = db.Column(db.String(200))
+    duplicate_of_id = db.Column(db.Integer, db.ForeignKey('admissions.id', ondelete='SET NULL'))
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def generate_application_number(self):
+        # Numbers count up per intake year, so this works before the row has an id
+        from app.models.admission_sequence import AdmissionSequence
         year = datetime.utcnow().year
-        self.application_number = f"KS-{year}-{self.id:04d}"
+        self.application_number = f"KS-{year}-{AdmissionSequence.next_value(year):04d}"
 
     @staticmethod
     def get_grade_band(score):
-        if score >= 60:
-            return 'EE'
-        elif score >= 50:
-            return 'ME'
-        elif score >= 40:
-            return 'AE'
-        else:
-            return 'BE'
-
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'application_number': self.application_number,
-            'applicant_name': self.applicant_name,
-            'gender': self.gender,
-            'date_of_birth': self.date_of_birth,
-            'nationality': self.nationality,
-            'previous_school': self.previous_school,
-            'parent_name': self.parent_name,
-            'parent_relationship': self.parent_relationship,
-            'parent_phone': self.parent_phone,
-            'parent_email': self.parent_email,
-            'kjsea_score': self.kjsea_score,
-            'grade_band': self.get_grade_band(self.kjsea_score),
-            'kjsea_result_url': self.kjsea_result_url,
-            'birth_cert_url': self.birth_cert_url,
-            'passport_photo_url': self.passport_photo_url,
-            'school_leaving_cert_url': self.school_leaving_cert_url,
-            'medical_report_url': self.medical_report_url,
-            'status': self.status,
-            'is_flagged': self.is_flagged,
-            'admin_notes': self.admin_notes,
-            'created_at': self.created_at.isoformat(),
-        }
+        for band, lowest in GRADE_BANDS:
+            if score >= lowest:
+                return band
+        return GRADE_BANDS[-1][0]
+
+    __serialize_exclude__ = ('phone_key', 'email_key', 'identity_key')  # Internal lookup keys
+
+    # Every serialized admission carries its band next to the score
+    __serialize_computed__ = {'grade_band': ('kjsea_score', get_grade_band)}
+
+    @classmethod
+    def grade_band_expression(cls):
+        """SQL CASE expression equivalent to get_grade_band, for GROUP BY queries."""
+        whens = [(cls.kjsea_score >= lowest, band) for band, lowest in GRADE_BANDS[:-1]]
+        return db.case(*whens, else_=GRADE_BANDS[-1][0])
+
+    @staticmethod
+    def grade_band_range(band):
+        """Return the (lowest, next band's lowest) score bounds for a band; upper is None for EE."""
+        for i, (name, lowest) in enumerate(GRADE_BANDS):
+            if name == band:
+                upper = GRADE_BANDS[i - 1][1] if i > 0 else None
+                return lowest, upper
+        raise ValueError(f"Unknown grade band: {band}")
+
+    def to_summary_dict(self):
+        # List view: everything except the document links
+        return self.serializer(exclude=DOCUMENT_FIELDS).object_to_dict(self)
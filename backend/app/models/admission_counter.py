@@ -0,0 +1,118 @@
+from app import db
+from app.models.admission import Admission, GRADE_BANDS
+from sqlalchemy.exc import IntegrityError
+
+STATUSES = ['pending', 'flagged', 'accepted', 'rejected']
+BUILT_MARKER = ('meta', 'built')  # Written by rebuild(); without it the counters are not trusted
+
+
+class AdmissionCounter(db.Model):
+    """Running admission totals so the dashboard stats are a single small read.
+
+    One row per (dimension, key), e.g. ('status', 'flagged') or ('gender', 'Female').
+    Routes adjust these in the same transaction as the admission write.
+    Until rebuild() has run once the table holds no ('meta', 'built') row and
+    writes are skipped: bumping from zero on a database that already has
+    admissions would only produce wrong totals.
+    """
+    __tablename__ = 'admission_counters'
+
+    dimension = db.Column(db.String(20), primary_key=True)  # total | status | gender | grade_band | meta
+    key = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def is_built(cls):
+        """Whether rebuild() has seeded the counters, so adjusting them is meaningful."""
+        return db.session.get(cls, BUILT_MARKER) is not None
+
+    @classmethod
+    def bump(cls, dimension, key, delta):
+        """Add delta to one counter as an atomic UPDATE, creating the row if needed."""
+        updated = db.session.execute(
+            db.update(cls)
+            .where(cls.dimension == dimension, cls.key == key)
+            .values(count=cls.count + delta)
+        ).rowcount
+        if updated:
+            return
+        try:
+            with db.session.begin_nested():
+                db.session.add(cls(dimension=dimension, key=key, count=delta))
+        except IntegrityError:
+            # Another request created the row first; add to theirs instead
+            db.session.execute(
+                db.update(cls)
+                .where(cls.dimension == dimension, cls.key == key)
+                .values(count=cls.count + delta)
+            )
+
+    @classmethod
+    def record_admission(cls, admission, delta=1):
+        """Count a new admission (delta=1) or a deleted one (delta=-1)."""
+        if not cls.is_built():
+            return
+        cls.bump('total', 'all', delta)
+        cls.bump('status', admission.status, delta)
+        cls.bump('gender', admission.gender, delta)
+        cls.bump('grade_band', Admission.get_grade_band(admission.kjsea_score), delta)
+
+    @classmethod
+    def record_status_change(cls, old_status, new_status, count=1):
+        if old_status == new_status or not cls.is_built():
+            return
+        cls.bump('status', old_status, -count)
+        cls.bump('status', new_status, count)
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every counter from the admissions table. Does not commit."""
+        db.session.execute(db.delete(cls))
+        db.session.add(cls(dimension=BUILT_MARKER[0], key=BUILT_MARKER[1], count=1))
+        for dimension, counts in aggregate_admission_stats().items():
+            if dimension == 'total':
+                db.session.add(cls(dimension='total', key='all', count=counts))
+                continue
+            for key, count in counts.items():
+                db.session.add(cls(dimension=dimension, key=key, count=count))
+
+    @classmethod
+    def read(cls):
+        """Return the counters shaped like aggregate_admission_stats(), or None if never built."""
+        rows = cls.query.all()
+        if not any((row.dimension, row.key) == BUILT_MARKER for row in rows):
+            return None
+        stats = _empty_stats()
+        for row in rows:
+            if row.dimension == BUILT_MARKER[0]:
+                continue
+            if row.dimension == 'total':
+                stats['total'] = row.count
+            else:
+                stats[row.dimension][row.key] = row.count
+        return stats
+
+
+def _empty_stats():
+    return {
+        'total': 0,
+        'status': {status: 0 for status in STATUSES},
+        'gender': {},
+        'grade_band': {band: 0 for band, _ in GRADE_BANDS},
+    }
+
+
+def aggregate_admission_stats():
+    """Count admissions by status, gender and grade band in one GROUP BY query."""
+    band = Admission.grade_band_expression().label('grade_band')
+    rows = db.session.query(
+        Admission.status, Admission.gender, band, db.func.count(Admission.id)
+    ).group_by(Admission.status, Admission.gender, band).all()
+
+    stats = _empty_stats()
+    for status, gender, grade_band, count in rows:
+        stats['total'] += count
+        stats['status'][status] = stats['status'].get(status, 0) + count
+        stats['gender'][gender] = stats['gender'].get(gender, 0) + count
+        stats['grade_band'][grade_band] = stats['grade_band'].get(grade_band, 0) + count
+    return stats
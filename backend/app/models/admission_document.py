@@ -0,0 +1,22 @@
+from app import db
+from app.models.admission import Admission
+from app.models.upload import StoredFile
+from datetime import datetime
+
+
+class AdmissionDocument(db.Model):
+    """A finished upload attached to one of an application's document fields."""
+    __tablename__ = 'admission_documents'
+    __table_args__ = (
+        db.UniqueConstraint('admission_id', 'field', name='uq_admission_documents_field'),
+        db.Index('ix_admission_documents_file_id', 'file_id'),  # Is a stored file still in use
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    admission_id = db.Column(db.Integer, db.ForeignKey('admissions.id', ondelete='CASCADE'), nullable=False)
+    field = db.Column(db.String(40), nullable=False)  # One of DOCUMENT_FIELDS
+    file_id = db.Column(db.Integer, db.ForeignKey('stored_files.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    admission = db.relationship(Admission)
+    file = db.relationship(StoredFile)
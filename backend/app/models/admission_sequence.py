@@ -0,0 +1,49 @@
+from app import db
+from sqlalchemy.exc import IntegrityError
+
+
+class AdmissionSequence(db.Model):
+    """Last application number handed out per intake year.
+
+    Incrementing this row inside the admission's own transaction lets the
+    number be assigned before the single INSERT/COMMIT, instead of committing
+    once to learn the id and again to store the number.
+    """
+    __tablename__ = 'admission_sequences'
+
+    year = db.Column(db.Integer, primary_key=True)
+    last_value = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def next_value(cls, year, count=1):
+        """Reserve the next `count` numbers for `year` and return the last one. Does not commit."""
+        # The UPDATE row-locks the year until commit, so concurrent
+        # submissions queue here and never get the same value
+        increment = (
+            db.update(cls)
+            .where(cls.year == year)
+            .values(last_value=cls.last_value + count)
+            .returning(cls.last_value)
+        )
+        value = db.session.execute(increment).scalar()
+        if value is not None:
+            return value
+
+        try:
+            with db.session.begin_nested():
+                value = cls._highest_issued(year) + count
+                db.session.add(cls(year=year, last_value=value))
+        except IntegrityError:
+            # Another submission created the year's row first
+            value = db.session.execute(increment).scalar()
+        return value
+
+    @staticmethod
+    def _highest_issued(year):
+        """Highest number already used for `year`, so a new counter never reissues one."""
+        from app.models.admission import Admission
+        prefix = f"KS-{year}-"
+        numbers = db.session.query(Admission.application_number).filter(
+            Admission.application_number.like(f"{prefix}%")
+        ).all()
+        return max((int(n[len(prefix):]) for (n,) in numbers if n[len(prefix):].isdigit()), default=0)
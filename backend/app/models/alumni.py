@@ -1,7 +1,8 @@
 from app import db
+from app.serializers import SerializerMixin
 from datetime import datetime
 
-class Alumni(db.Model):
+class Alumni(SerializerMixin, db.Model):
     __tablename__ = 'alumni'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -9,13 +10,4 @@ class Alumni(db.Model):
     achievement = db.Column(db.String(255))  # Short achievement title e.g "Former Vice President"
     description = db.Column(db.Text)  # Longer description about the alumni
     created_at = db.Column(db.DateTime, default=datetime.utcnow)  # Auto timestamp
-
-    def to_dict(self):
-        # Returns alumni data as JSON-friendly dictionary
-        return {
-            'id': self.id,
-            'name': self.name,
-            'achievement': self.achievement,
-            'description': self.description,
-            'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Set on every change
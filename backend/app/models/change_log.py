@@ -0,0 +1,17 @@
+from app import db
+from datetime import datetime
+
+
+class ChangeLog(db.Model):
+    """One created, updated or deleted content or admission row.
+
+    Written by app/changes.py in the same transaction as the change. The id
+    is the /api/changes cursor; a delete entry is the row's tombstone.
+    """
+    __tablename__ = 'change_log'
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(40), nullable=False)  # __tablename__ of the changed model
+    row_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(10), nullable=False)  # upsert | delete
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)  # Pruning
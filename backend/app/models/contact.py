@@ -1,8 +1,13 @@
 from app import db
+from app.serializers import SerializerMixin
 from datetime import datetime
 
-class ContactSubmission(db.Model):
+class ContactSubmission(SerializerMixin, db.Model):
     __tablename__ = 'contact_submissions'
+    __table_args__ = (
+        # Unread count and the inbox filtered by read state, newest first
+        db.Index('ix_contact_submissions_is_read_created_at', 'is_read', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)  # Sender's name
@@ -12,16 +17,4 @@ class ContactSubmission(db.Model):
     message = db.Column(db.Text, nullable=False)  # Message body
     is_read = db.Column(db.Boolean, default=False)  # Admin marks as read
     created_at = db.Column(db.DateTime, default=datetime.utcnow)  # Auto timestamp
-
-    def to_dict(self):
-        # Returns contact submission as JSON-friendly dictionary
-        return {
-            'id': self.id,
-            'name': self.name,
-            'email': self.email,
-            'phone': self.phone,
-            'subject': self.subject,
-            'message': self.message,
-            'is_read': self.is_read,
-            'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Set on every change
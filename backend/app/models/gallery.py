@@ -1,21 +1,43 @@
 from app import db
+from app.serializers import SerializerMixin
 from datetime import datetime
 
-class Gallery(db.Model):
+
+def absolute_srcset(srcset):
+    """Turn "<key> 320w, <key> 640w" into the same list with public URLs."""
+    if not srcset:
+        return srcset
+    from app.storage import get_storage
+    storage = get_storage()
+    return ', '.join(f"{storage.url(key)} {descriptor}"
+                     for key, descriptor in (entry.rsplit(' ', 1) for entry in srcset.split(', ')))
+
+
+class Gallery(SerializerMixin, db.Model):
     __tablename__ = 'gallery'
+    __table_args__ = (
+        db.Index('ix_gallery_created_at_id', 'created_at', 'id'),  # Keyset pagination order
+        db.Index('ix_gallery_image_status', 'image_status'),  # Pipeline worker polling
+    )
+    # Stored srcsets hold storage keys so MEDIA_URL can change; responses get full URLs
+    __serialize_computed__ = {
+        'srcset': ('srcset', absolute_srcset),
+        'jpeg_srcset': ('jpeg_srcset', absolute_srcset),
+    }
     
     id = db.Column(db.Integer, primary_key=True)
     image_url = db.Column(db.String(500), nullable=False)  # Cloudinary image URL
     title = db.Column(db.String(255))  # Image title/caption
     category = db.Column(db.String(100))  # e.g Sports, Academics, Events
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)  # Auto timestamp
 
-    def to_dict(self):
-        # Returns image data as JSON-friendly dictionary
-        return {
-            'id': self.id,
-            'image_url': self.image_url,
-            'title': self.title,
-            'category': self.category,
-            'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+    # Filled in by the derivative pipeline (app/gallery_pipeline.py)
+    image_status = db.Column(db.String(20), default='pending')  # pending | processing | ready | failed
+    width = db.Column(db.Integer)  # Original size, after EXIF rotation
+    height = db.Column(db.Integer)
+    blurhash = db.Column(db.String(40))  # Placeholder to paint while the image loads
+    srcset = db.Column(db.Text)  # WebP derivatives, "<storage key> 640w, ..."; served with full URLs
+    jpeg_srcset = db.Column(db.Text)  # Same widths as JPEG, for browsers without WebP
+    processed_at = db.Column(db.DateTime)  # When processing was claimed or finished
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)  # Auto timestamp
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Set on every change
@@ -1,7 +1,8 @@
 from app import db
+from app.serializers import SerializerMixin
 from datetime import datetime
 
-class KcseResult(db.Model):
+class KcseResult(SerializerMixin, db.Model):
     __tablename__ = 'kcse_results'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -9,13 +10,4 @@ class KcseResult(db.Model):
     mean_grade = db.Column(db.String(10))  # Mean grade e.g "A-"
     university_entry_percentage = db.Column(db.String(10))  # e.g "92%"
     created_at = db.Column(db.DateTime, default=datetime.utcnow)  # Auto timestamp
-
-    def to_dict(self):
-        # Returns KCSE result as JSON-friendly dictionary
-        return {
-            'id': self.id,
-            'year': self.year,
-            'mean_grade': self.mean_grade,
-            'university_entry_percentage': self.university_entry_percentage,
-            'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Set on every change
@@ -1,8 +1,12 @@
 from app import db
+from app.serializers import SerializerMixin
 from datetime import datetime
 
-class News(db.Model):
+class News(SerializerMixin, db.Model):
     __tablename__ = 'news'
+    __table_args__ = (
+        db.Index('ix_news_created_at_id', 'created_at', 'id'),  # Keyset pagination order
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -10,13 +14,4 @@ class News(db.Model):
     content = db.Column(db.Text)
     category = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'excerpt': self.excerpt,
-            'content': self.content,
-            'category': self.category,
-            'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
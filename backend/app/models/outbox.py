@@ -0,0 +1,36 @@
+from app import db
+from app.serializers import SerializerMixin
+from datetime import datetime
+
+
+def split_recipients(recipients):
+    """The stored comma-separated recipients as a list."""
+    return [r for r in (recipients or '').split(',') if r]
+
+
+class OutboxEmail(SerializerMixin, db.Model):
+    """An email waiting to be sent (or already sent) by the outbox workers."""
+    __tablename__ = 'outbox_emails'
+    __table_args__ = (
+        db.Index('ix_outbox_emails_status_next_attempt', 'status', 'next_attempt_at'),  # Worker polling
+    )
+    __serialize_exclude__ = ('body', 'claimed_at', 'claim_token')  # Worker internals; bodies can hold notes
+    __serialize_computed__ = {'recipients': ('recipients', split_recipients)}
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    recipients = db.Column(db.Text, nullable=False)  # Comma-separated addresses
+    body = db.Column(db.Text, nullable=False)
+
+    status = db.Column(db.String(20), default='queued')  # queued | sending | sent | failed
+    attempts = db.Column(db.Integer, default=0)
+    last_error = db.Column(db.Text)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    claimed_at = db.Column(db.DateTime)  # When a worker picked it up; stale claims are retried
+    claim_token = db.Column(db.String(32))  # Identifies which worker's batch this belongs to
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    def recipient_list(self):
+        return split_recipients(self.recipients)
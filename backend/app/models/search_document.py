@@ -0,0 +1,38 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import DDL, event
+
+# Weighted tsvector over a document; the GIN index and search queries must use
+# this exact expression for Postgres to pick the index
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(body, '')), 'B')"
+)
+
+
+class SearchDocument(db.Model):
+    """Searchable text for one news article, event, alumni or testimonial.
+
+    Kept in step with the source rows by app/search.py. On Postgres it is
+    searched through a GIN full-text index; elsewhere an in-process inverted
+    index is built from it.
+    """
+    __tablename__ = 'search_documents'
+    __table_args__ = (
+        db.UniqueConstraint('source', 'source_id', name='uq_search_documents_source'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(20), nullable=False)  # news | events | alumni | testimonials
+    source_id = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(255))
+    body = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+event.listen(
+    SearchDocument.__table__,
+    'after_create',
+    DDL(f"CREATE INDEX ix_search_documents_vector ON search_documents USING gin (({SEARCH_VECTOR_SQL}))")
+    .execute_if(dialect='postgresql'),
+)
@@ -1,7 +1,8 @@
 from app import db
+from app.serializers import SerializerMixin
 from datetime import datetime
 
-class Staff(db.Model):
+class Staff(SerializerMixin, db.Model):
     __tablename__ = 'staff'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -13,16 +14,4 @@ class Staff(db.Model):
     role = db.Column(db.String(120))
     is_leadership = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'name': self.name,
-            'photo_url': self.photo_url,
-            'subject': self.subject,
-            'email': self.email,
-            'phone': self.phone,
-            'role': self.role,
-            'is_leadership': self.is_leadership,
-            'created_at': self.created_at.isoformat()
-        }
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,35 @@
+from app import db
+from datetime import datetime
+
+
+class StoredFile(db.Model):
+    """One distinct uploaded file, stored once however many times it was uploaded."""
+    __tablename__ = 'stored_files'
+
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), unique=True, nullable=False)  # Deduplication key
+    size = db.Column(db.BigInteger, nullable=False)
+    content_type = db.Column(db.String(100))
+    storage_key = db.Column(db.String(255), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class Upload(db.Model):
+    """A resumable upload in progress (see app/uploads.py).
+
+    The id is a random token handed to the browser; bytes land in a part file
+    until `received` reaches `size`, then the upload points at its StoredFile.
+    """
+    __tablename__ = 'uploads'
+
+    id = db.Column(db.String(32), primary_key=True)
+    filename = db.Column(db.String(255))
+    content_type = db.Column(db.String(100))
+    size = db.Column(db.BigInteger, nullable=False)  # Declared by the client up front
+    received = db.Column(db.BigInteger, nullable=False, default=0)  # Where the next chunk starts
+    status = db.Column(db.String(20), nullable=False, default='uploading')  # uploading | complete
+    file_id = db.Column(db.Integer, db.ForeignKey('stored_files.id'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # Expiry of abandoned uploads
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    file = db.relationship(StoredFile)
@@ -0,0 +1,191 @@
+import smtplib
+import uuid
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+
+from sqlalchemy import and_, or_
+
+from app import background_workers_allowed, db
+from app.models.outbox import OutboxEmail
+
+
+def enqueue_email(subject, recipients, body):
+    """Add an email to the outbox in the current transaction.
+
+    Nothing is sent until the caller commits, so the email is only delivered
+    if the row that triggered it was saved. Call outbox.notify() after the
+    commit to wake a worker straight away.
+    """
+    email = OutboxEmail(subject=subject, recipients=','.join(recipients), body=body)
+    db.session.add(email)
+    return email
+
+
+def enqueue_emails(emails):
+    """Add many (subject, recipients, body) emails with one multi-row INSERT.
+
+    Same transaction rules as enqueue_email.
+    """
+    rows = [{'subject': subject, 'recipients': ','.join(recipients), 'body': body,
+             'status': 'queued', 'attempts': 0, 'next_attempt_at': datetime.utcnow(),
+             'created_at': datetime.utcnow()}
+            for subject, recipients, body in emails]
+    if rows:
+        db.session.execute(db.insert(OutboxEmail), rows)
+    return len(rows)
+
+
+class OutboxWorkerPool:
+    """A fixed number of threads that drain outbox_emails.
+
+    Each worker claims a batch of due emails, sends them all over one SMTP
+    connection and records the outcome per email. Failures are retried with
+    exponential backoff until MAIL_MAX_ATTEMPTS is reached. Emails claimed by
+    a worker that died (e.g. the process restarted) are picked up again once
+    their claim is older than MAIL_CLAIM_TIMEOUT.
+    """
+
+    def __init__(self):
+        self._app = None
+        self._threads = []
+        self._wake = Event()
+        self._stop = Event()
+        self._lock = Lock()
+
+    def init_app(self, app):
+        self._app = app
+        app.extensions['outbox'] = self
+
+    def start(self):
+        with self._lock:
+            if self._threads or self._app is None or not background_workers_allowed(self._app):
+                return
+            if 'mail' not in self._app.extensions:
+                return  # Mail credentials not configured; emails stay queued
+            self._stop.clear()
+            for i in range(self._app.config.get('MAIL_WORKERS', 2)):
+                thread = Thread(target=self._run, name=f'outbox-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout=5)
+
+    def worker_count(self):
+        return sum(1 for thread in self._threads if thread.is_alive())
+
+    def notify(self):
+        """Wake a worker now instead of waiting for the next poll. Never starts one."""
+        self._wake.set()
+
+    def _run(self):
+        poll_interval = self._app.config.get('MAIL_POLL_INTERVAL', 30)
+        while not self._stop.is_set():
+            try:
+                with self._app.app_context():
+                    sent_any = self.process_batch()
+            except Exception as e:
+                print(f"Outbox worker error: {e}")
+                sent_any = False
+            if not sent_any:
+                self._wake.wait(poll_interval)
+                self._wake.clear()
+
+    def _claim_batch(self):
+        config = self._app.config
+        now = datetime.utcnow()
+        stale_claim = now - timedelta(seconds=config.get('MAIL_CLAIM_TIMEOUT', 300))
+        due = or_(
+            and_(OutboxEmail.status == 'queued', OutboxEmail.next_attempt_at <= now),
+            and_(OutboxEmail.status == 'sending', OutboxEmail.claimed_at < stale_claim),
+        )
+        # SKIP LOCKED lets several workers (and processes) pick disjoint rows on Postgres;
+        # repeating `due` in the UPDATE keeps the claim atomic on SQLite, which ignores it
+        candidates = (
+            db.select(OutboxEmail.id).where(due)
+            .order_by(OutboxEmail.id)
+            .limit(config.get('MAIL_BATCH_SIZE', 20))
+            .with_for_update(skip_locked=True)
+        )
+        token = uuid.uuid4().hex
+        db.session.execute(
+            db.update(OutboxEmail)
+            .where(OutboxEmail.id.in_(candidates.scalar_subquery()), due)
+            .values(status='sending', claimed_at=now, claim_token=token)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return OutboxEmail.query.filter_by(claim_token=token).order_by(OutboxEmail.id).all()
+
+    def _settle(self, email, token, attempts, **values):
+        """Record the outcome of one send, unless the claim has moved on. Commits.
+
+        Conditional on the batch's claim `token`: if this send outlived
+        MAIL_CLAIM_TIMEOUT and another worker reclaimed the email, that
+        worker's newer state is left alone. Returns whether the row was written.
+        """
+        written = db.session.execute(
+            db.update(OutboxEmail)
+            .where(OutboxEmail.id == email.id, OutboxEmail.claim_token == token,
+                   OutboxEmail.status == 'sending')
+            .values(attempts=attempts, **values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if not written:
+            print(f"Outbox email {email.id} was reclaimed by another worker; not recording this attempt")
+        return bool(written)
+
+    def _record_failure(self, email, token, error):
+        config = self._app.config
+        attempts = (email.attempts or 0) + 1
+        values = {'last_error': str(error)[:1000], 'claimed_at': None}
+        if attempts >= config.get('MAIL_MAX_ATTEMPTS', 5):
+            values['status'] = 'failed'
+        else:
+            delay = config.get('MAIL_RETRY_BACKOFF', 30) * 2 ** (attempts - 1)
+            values['status'] = 'queued'
+            values['next_attempt_at'] = datetime.utcnow() + timedelta(seconds=delay)
+        self._settle(email, token, attempts, **values)
+
+    def process_batch(self):
+        """Send one batch of due emails. Returns True if anything was claimed."""
+        batch = self._claim_batch()
+        if not batch:
+            return False
+        from flask_mail import Message  # Only needed once there is mail to send
+
+        token = batch[0].claim_token  # Read now: each commit below reloads the rows, maybe under a newer claim
+
+        pending = list(batch)
+        try:
+            with self._app.extensions['mail'].connect() as connection:
+                while pending:
+                    email = pending[0]
+                    try:
+                        connection.send(Message(subject=email.subject,
+                                                recipients=email.recipient_list(),
+                                                body=email.body))
+                    except smtplib.SMTPServerDisconnected:
+                        raise  # The connection is gone; retry the rest of the batch later
+                    except Exception as e:
+                        pending.pop(0)
+                        self._record_failure(email, token, e)
+                        continue
+                    pending.pop(0)
+                    # Commit per email so a crash never resends what already went out
+                    self._settle(email, token, (email.attempts or 0) + 1,
+                                 status='sent', sent_at=datetime.utcnow(), last_error=None)
+        except Exception as e:
+            print(f"Outbox SMTP connection failed: {e}")
+            for email in pending:
+                self._record_failure(email, token, e)
+        return True
+
+
+outbox = OutboxWorkerPool()
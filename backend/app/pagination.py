@@ -0,0 +1,140 @@
+import base64
+from datetime import datetime
+
+from flask import current_app, request
+from sqlalchemy import and_, or_
+
+from app import db
+from app.serializers import json_response
+
+# Query params read by keyset_select and parse_page, for cached() keys
+KEYSET_PARAMS = ('limit', 'cursor', 'fields')
+PAGE_PARAMS = ('page', 'per_page')
+
+
+def encode_cursor(created_at, id):
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, id = base64.urlsafe_b64decode(padded).decode().split('|')
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def parse_limit(param='limit'):
+    default = current_app.config.get('PAGE_SIZE_DEFAULT', 50)
+    maximum = current_app.config.get('PAGE_SIZE_MAX', 100)
+    try:
+        limit = int(request.args.get(param, default))
+    except ValueError:
+        raise ValueError(f'{param} must be an integer')
+    if limit < 1:
+        raise ValueError(f'{param} must be at least 1')
+    return min(limit, maximum)
+
+
+def parse_fields(model):
+    """Return the requested column names, or None when the full row is wanted.
+
+    id and created_at are always included because the cursor is built from them.
+    """
+    raw = request.args.get('fields')
+    if not raw:
+        return None
+    columns = model.__table__.columns.keys()
+    fields = [f.strip() for f in raw.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    for required in ('created_at', 'id'):
+        if required not in fields:
+            fields.insert(0, required)
+    return fields
+
+
+def keyset_select(model):
+    """Build the SELECT for one page of `model` newest first, keyed on (created_at, id).
+
+    Reads `limit`, `cursor` and `fields` from the query string and returns
+    (serializer, statement, limit); the statement fetches one row more than
+    the limit so keyset_items() can tell whether another page exists. Raises
+    ValueError on bad input so the route can answer 400.
+    """
+    limit = parse_limit()
+    serializer = model.serializer(only=parse_fields(model))
+    # Plain column rows: no ORM objects are built for list pages
+    statement = db.select(*serializer.columns)
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        statement = statement.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < id),
+        ))
+
+    statement = statement.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+    return serializer, statement, limit
+
+
+def keyset_items(serializer, rows, limit):
+    """Turn the rows of a keyset_select() statement into (items, next_cursor)."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = serializer.rows_to_dicts(rows)
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    return items, next_cursor
+
+
+def keyset_page(model):
+    """Fetch one page of `model` newest first; returns (items, next_cursor).
+
+    next_cursor is None on the last page. Raises ValueError on bad input.
+    """
+    serializer, statement, limit = keyset_select(model)
+    rows = db.session.execute(statement).all()
+    return keyset_items(serializer, rows, limit)
+
+
+def page_response(items, next_cursor):
+    """Build the list response, exposing the next page's cursor as a header."""
+    response = json_response(items)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
+
+
+def parse_page():
+    """Return (page, per_page) from the query string; page is 1-based."""
+    per_page = parse_limit('per_page')
+    try:
+        page = int(request.args.get('page', 1))
+    except ValueError:
+        raise ValueError('page must be an integer')
+    if page < 1:
+        raise ValueError('page must be at least 1')
+    return page, per_page
+
+
+def offset_page(query):
+    """Apply `page` and `per_page` from the query string to `query`.
+
+    Returns (rows, total). Meant for admin tables that need page numbers and
+    arbitrary sort orders; public lists use keyset_page instead.
+    """
+    page, per_page = parse_page()
+    total = query.order_by(None).count()
+    rows = query.limit(per_page).offset((page - 1) * per_page).all()
+    return rows, total
+
+
+def offset_response(items, total):
+    """Build the list response, exposing paging info as headers."""
+    response = json_response(items)
+    response.headers['X-Total-Count'] = str(total)
+    return response
@@ -0,0 +1,84 @@
+import time
+from threading import Lock, Thread
+
+from sqlalchemy import text
+
+from app import db
+
+
+class Readiness:
+    """Tracks boot progress for /api/ready: process up vs database pool warm.
+
+    create_app() does not touch the database. Instead a background thread
+    opens DB_WARM_CONNECTIONS pooled connections, retrying with backoff while
+    the database wakes up, and only then runs the work registered with
+    on_ready() (e.g. starting the outbox workers).
+    """
+
+    def __init__(self):
+        self._app = None
+        self._thread = None
+        self._callbacks = []
+        self._lock = Lock()
+        self.booted_at = None
+        self.warmed_at = None
+
+    def init_app(self, app):
+        self._app = app
+        self._callbacks = []
+        self.booted_at = time.monotonic()
+        self.warmed_at = None
+        app.extensions['readiness'] = self
+
+    @property
+    def ready(self):
+        return self.warmed_at is not None
+
+    def on_ready(self, fn):
+        self._callbacks.append(fn)
+
+    def start(self):
+        with self._lock:
+            if self._app is None or (self._thread and self._thread.is_alive()):
+                return
+            self._thread = Thread(target=self._run, name='db-warmup', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        delay = 0.5
+        while True:
+            try:
+                with self._app.app_context():
+                    self.warm()
+                break
+            except Exception as e:
+                print(f"Database warm-up failed, retrying in {delay}s: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+        self.warmed_at = time.monotonic()
+        for fn in self._callbacks:
+            fn()
+
+    def warm(self):
+        """Open the configured number of connections at once so the pool keeps them."""
+        connections = []
+        try:
+            for _ in range(max(1, self._app.config.get('DB_WARM_CONNECTIONS', 2))):
+                connection = db.engine.connect()
+                connections.append(connection)
+                connection.execute(text('SELECT 1'))
+        finally:
+            for connection in connections:
+                connection.close()
+
+    def status(self):
+        data = {
+            'status': 'ready' if self.ready else 'warming',
+            'uptime_ms': round((time.monotonic() - self.booted_at) * 1000),
+        }
+        if self.ready:
+            data['warmup_ms'] = round((self.warmed_at - self.booted_at) * 1000)
+        return data
+
+
+readiness = Readiness()
@@ -1,95 +1,113 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, send_file
 from flask_jwt_extended import jwt_required
-from flask_mail import Message
-from app import db, mail
-from app.models.admission import Admission
-from threading import Thread
+from app import db
+from app.admission_analytics import admission_analytics
+from app.admission_import import IMPORT_READERS, guess_format, import_admissions
+from app.allocation import AllocationRequest, allocation_cache
+from app.changes import log_changes
+from app.duplicates import find_duplicate, merge_duplicates
+from app.models.admission import Admission, DOCUMENT_FIELDS, admission_values
+from app.models.admission_counter import AdmissionCounter, aggregate_admission_stats
+from app.models.admission_document import AdmissionDocument
+from app.models.upload import StoredFile
+from app.outbox import enqueue_email, enqueue_emails, outbox
+from app.pagination import offset_page, offset_response
+from app.storage import get_storage
+from app.uploads import attach_documents, resolve_uploads
+from datetime import datetime
 import os
 
 admissions_bp = Blueprint('admissions', __name__)
 
-CUTOFF_SCORE = 50  # KJSEA auto-flag threshold out of 72
 
+def _counters_enabled():
+    return current_app.config.get('ADMISSION_COUNTERS_ENABLED', False)
 
-def _send_admission_emails(app, applicant_email, applicant_name, application_number, status, admin_email):
-    """Send confirmation to applicant and notification to admin — non-blocking."""
-    with app.app_context():
-        try:
-            grade_note = (
-                "Your score qualifies you for consideration. An admin will review and confirm your status shortly."
-                if status == 'flagged'
-                else "Your application has been received. Our admissions team will review it and contact you."
-            )
-            applicant_msg = Message(
-                subject=f"Admission Application Received — {application_number}",
-                recipients=[applicant_email],
-                body=(
-                    f"Dear {applicant_name},\n\n"
-                    f"Thank you for applying to Kakamega School.\n\n"
-                    f"Application Number: {application_number}\n"
-                    f"Status: {'Under Review (Flagged for consideration)' if status == 'flagged' else 'Pending Review'}\n\n"
-                    f"{grade_note}\n\n"
-                    f"Please keep your application number for reference. "
-                    f"You will receive an email once a decision has been made.\n\n"
-                    f"Warm regards,\nKakamega School Admissions Office\n"
-                    f"Once a Katcherian, always a Katcherian"
-                )
-            )
-            mail.send(applicant_msg)
-        except Exception as e:
-            print(f"Applicant email failed: {e}")
 
-        try:
-            admin_msg = Message(
-                subject=f"New Admission Application — {application_number}",
-                recipients=[admin_email],
-                body=(
-                    f"A new admission application has been submitted.\n\n"
-                    f"Application Number: {application_number}\n"
-                    f"Applicant: {applicant_name}\n"
-                    f"Email: {applicant_email}\n"
-                    f"Status: {status.upper()}\n\n"
-                    f"Log in to the admin dashboard to review the full application."
-                )
-            )
-            mail.send(admin_msg)
-        except Exception as e:
-            print(f"Admin notification email failed: {e}")
+def _confirmation_email(applicant_name, application_number, status):
+    """Build the (subject, body) of the 'application received' email to the applicant."""
+    grade_note = (
+        "Your score qualifies you for consideration. An admin will review and confirm your status shortly."
+        if status == 'flagged'
+        else "Your application has been received. Our admissions team will review it and contact you."
+    )
+    subject = f"Admission Application Received — {application_number}"
+    body = (
+        f"Dear {applicant_name},\n\n"
+        f"Thank you for applying to Kakamega School.\n\n"
+        f"Application Number: {application_number}\n"
+        f"Status: {'Under Review (Flagged for consideration)' if status == 'flagged' else 'Pending Review'}\n\n"
+        f"{grade_note}\n\n"
+        f"Please keep your application number for reference. "
+        f"You will receive an email once a decision has been made.\n\n"
+        f"Warm regards,\nKakamega School Admissions Office\n"
+        f"Once a Katcherian, always a Katcherian"
+    )
+    return subject, body
 
 
-def _send_status_email(app, applicant_email, applicant_name, application_number, status, admin_notes):
-    """Notify applicant of acceptance or rejection."""
-    with app.app_context():
-        try:
-            if status == 'accepted':
-                subject = f"Congratulations! Admission Accepted — {application_number}"
-                body = (
-                    f"Dear {applicant_name},\n\n"
-                    f"We are pleased to inform you that your application to Kakamega School "
-                    f"has been ACCEPTED.\n\n"
-                    f"Application Number: {application_number}\n"
-                    f"Status: ACCEPTED\n\n"
-                    f"{'Admin Notes: ' + admin_notes + chr(10) + chr(10) if admin_notes else ''}"
-                    f"Please report to the school admissions office with all original documents "
-                    f"within 7 working days to complete your enrolment.\n\n"
-                    f"Congratulations and welcome to the Katcherian family!\n\n"
-                    f"Warm regards,\nKakamega School Admissions Office"
-                )
-            else:
-                subject = f"Admission Application Update — {application_number}"
-                body = (
-                    f"Dear {applicant_name},\n\n"
-                    f"Thank you for your interest in Kakamega School. After careful review, "
-                    f"we regret to inform you that your application has not been successful at this time.\n\n"
-                    f"Application Number: {application_number}\n"
-                    f"Status: NOT ACCEPTED\n\n"
-                    f"{'Reason: ' + admin_notes + chr(10) + chr(10) if admin_notes else ''}"
-                    f"We encourage you to explore other opportunities and wish you the very best.\n\n"
-                    f"Warm regards,\nKakamega School Admissions Office"
-                )
-            mail.send(Message(subject=subject, recipients=[applicant_email], body=body))
-        except Exception as e:
-            print(f"Status email failed: {e}")
+def confirmation_emails(rows):
+    """(subject, recipients, body) confirmations for imported admission rows."""
+    emails = []
+    for row in rows:
+        subject, body = _confirmation_email(row['applicant_name'], row['application_number'], row['status'])
+        emails.append((subject, [row['parent_email']], body))
+    return emails
+
+
+def _queue_admission_emails(applicant_email, applicant_name, application_number, status, admin_email):
+    """Queue confirmation to applicant and notification to admin in the outbox."""
+    subject, body = _confirmation_email(applicant_name, application_number, status)
+    enqueue_email(subject=subject, recipients=[applicant_email], body=body)
+    enqueue_email(
+        subject=f"New Admission Application — {application_number}",
+        recipients=[admin_email],
+        body=(
+            f"A new admission application has been submitted.\n\n"
+            f"Application Number: {application_number}\n"
+            f"Applicant: {applicant_name}\n"
+            f"Email: {applicant_email}\n"
+            f"Status: {status.upper()}\n\n"
+            f"Log in to the admin dashboard to review the full application."
+        )
+    )
+
+
+def _status_email(applicant_name, application_number, status, admin_notes):
+    """Build the (subject, body) of the acceptance or rejection notice."""
+    if status == 'accepted':
+        subject = f"Congratulations! Admission Accepted — {application_number}"
+        body = (
+            f"Dear {applicant_name},\n\n"
+            f"We are pleased to inform you that your application to Kakamega School "
+            f"has been ACCEPTED.\n\n"
+            f"Application Number: {application_number}\n"
+            f"Status: ACCEPTED\n\n"
+            f"{'Admin Notes: ' + admin_notes + chr(10) + chr(10) if admin_notes else ''}"
+            f"Please report to the school admissions office with all original documents "
+            f"within 7 working days to complete your enrolment.\n\n"
+            f"Congratulations and welcome to the Katcherian family!\n\n"
+            f"Warm regards,\nKakamega School Admissions Office"
+        )
+    else:
+        subject = f"Admission Application Update — {application_number}"
+        body = (
+            f"Dear {applicant_name},\n\n"
+            f"Thank you for your interest in Kakamega School. After careful review, "
+            f"we regret to inform you that your application has not been successful at this time.\n\n"
+            f"Application Number: {application_number}\n"
+            f"Status: NOT ACCEPTED\n\n"
+            f"{'Reason: ' + admin_notes + chr(10) + chr(10) if admin_notes else ''}"
+            f"We encourage you to explore other opportunities and wish you the very best.\n\n"
+            f"Warm regards,\nKakamega School Admissions Office"
+        )
+    return subject, body
+
+
+def _queue_status_email(applicant_email, applicant_name, application_number, status, admin_notes):
+    """Queue the acceptance or rejection notice for an applicant."""
+    subject, body = _status_email(applicant_name, application_number, status, admin_notes)
+    enqueue_email(subject=subject, recipients=[applicant_email], body=body)
 
 
 @admissions_bp.route('/', methods=['POST', 'OPTIONS'])
@@ -102,43 +120,41 @@ def submit_admission():
         if not data:
             return jsonify({'error': 'No data provided'}), 400
 
-        required = ['applicant_name', 'gender', 'date_of_birth', 'previous_school',
-                    'parent_name', 'parent_phone', 'parent_email', 'kjsea_score']
-        missing = [f for f in required if not data.get(f) and data.get(f) != 0]
-        if missing:
-            return jsonify({'error': f"Missing required fields: {', '.join(missing)}"}), 400
-
-        score = float(data['kjsea_score'])
-        if score < 0 or score > 72:
-            return jsonify({'error': 'KJSEA score must be between 0 and 72'}), 400
-
-        is_flagged = score >= CUTOFF_SCORE
-        status = 'flagged' if is_flagged else 'pending'
-
-        admission = Admission(
-            applicant_name=data['applicant_name'],
-            gender=data['gender'],
-            date_of_birth=data['date_of_birth'],
-            nationality=data.get('nationality', 'Kenyan'),
-            previous_school=data['previous_school'],
-            parent_name=data['parent_name'],
-            parent_relationship=data.get('parent_relationship', ''),
-            parent_phone=data['parent_phone'],
-            parent_email=data['parent_email'],
-            kjsea_score=score,
-            kjsea_result_url=data.get('kjsea_result_url', ''),
-            birth_cert_url=data.get('birth_cert_url', ''),
-            passport_photo_url=data.get('passport_photo_url', ''),
-            school_leaving_cert_url=data.get('school_leaving_cert_url', ''),
-            medical_report_url=data.get('medical_report_url', ''),
-            status=status,
-            is_flagged=is_flagged,
-        )
+        try:
+            values = admission_values(data)
+            # Documents sent earlier through /api/uploads, as {field: upload id}
+            documents = resolve_uploads(data.get('uploads'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        policy = current_app.config.get('DUPLICATE_POLICY', 'link')
+        duplicate = find_duplicate(values) if policy in ('link', 'reject') else None
+        if duplicate is not None:
+            if policy == 'reject':
+                return jsonify({'error': 'An application for this applicant has already been received. '
+                                         'Check your email for its application number.'}), 409
+            values['duplicate_of_id'] = duplicate.id  # Kept for an admin to merge (see app/duplicates.py)
+
+        admission = Admission(**values)
+        status = admission.status
+        is_flagged = admission.is_flagged
 
         try:
-            db.session.add(admission)
-            db.session.commit()
+            # Number, counters, emails and the row itself all land in one commit
             admission.generate_application_number()
+            db.session.add(admission)
+            attach_documents(admission, documents)
+            if _counters_enabled():
+                AdmissionCounter.record_admission(admission)
+            mail_username = os.getenv('MAIL_USERNAME')
+            if mail_username and os.getenv('MAIL_PASSWORD'):
+                _queue_admission_emails(
+                    data['parent_email'],
+                    data['applicant_name'],
+                    admission.application_number,
+                    status,
+                    mail_username,
+                )
             db.session.commit()
         except Exception as db_err:
             import traceback
@@ -146,21 +162,7 @@ def submit_admission():
             db.session.rollback()
             return jsonify({'error': 'Database error saving application'}), 500
 
-        mail_username = os.getenv('MAIL_USERNAME')
-        mail_password = os.getenv('MAIL_PASSWORD')
-        if mail_username and mail_password:
-            Thread(
-                target=_send_admission_emails,
-                args=(
-                    current_app._get_current_object(),
-                    data['parent_email'],
-                    data['applicant_name'],
-                    admission.application_number,
-                    status,
-                    mail_username,
-                ),
-                daemon=True,
-            ).start()
+        outbox.notify()
 
         return jsonify({
             'message': 'Application submitted successfully',
@@ -175,70 +177,410 @@ def submit_admission():
         return jsonify({'error': 'Failed to submit application'}), 500
 
 
+SORTABLE_FIELDS = {
+    'kjsea_score': Admission.kjsea_score,
+    'created_at': Admission.created_at,
+    'applicant_name': Admission.applicant_name,
+    'application_number': Admission.application_number,
+    'status': Admission.status,
+}
+
+
+def _parse_datetime(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO date, e.g. 2026-01-31")
+
+
+def _parse_score(name):
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+
+
+def _filtered_admissions_query():
+    """Build the admissions query from the list endpoint's filter and sort params."""
+    query = Admission.query
+
+    statuses = [s for s in request.args.get('status', '').split(',') if s]
+    if statuses:
+        query = query.filter(Admission.status.in_(statuses))
+
+    gender = request.args.get('gender')
+    if gender:
+        query = query.filter(Admission.gender == gender)
+
+    grade_band = request.args.get('grade_band')
+    if grade_band:
+        lowest, upper = Admission.grade_band_range(grade_band.upper())
+        query = query.filter(Admission.kjsea_score >= lowest)
+        if upper is not None:
+            query = query.filter(Admission.kjsea_score < upper)
+
+    min_score = _parse_score('min_score')
+    if min_score is not None:
+        query = query.filter(Admission.kjsea_score >= min_score)
+    max_score = _parse_score('max_score')
+    if max_score is not None:
+        query = query.filter(Admission.kjsea_score <= max_score)
+
+    created_from = _parse_datetime('created_from')
+    if created_from:
+        query = query.filter(Admission.created_at >= created_from)
+    created_to = _parse_datetime('created_to')
+    if created_to:
+        query = query.filter(Admission.created_at <= created_to)
+
+    previous_school = request.args.get('previous_school')
+    if previous_school:
+        # Substring match; % and _ in the search term match themselves, not anything
+        query = query.filter(Admission.previous_school.icontains(previous_school, autoescape=True))
+
+    # sort=-kjsea_score (default) sorts descending; id breaks ties so pages are stable
+    sort = request.args.get('sort', '-kjsea_score')
+    descending = sort.startswith('-')
+    column = SORTABLE_FIELDS.get(sort.lstrip('-'))
+    if column is None:
+        raise ValueError(f"Cannot sort by {sort.lstrip('-')}")
+    if descending:
+        return query.order_by(column.desc(), Admission.id.desc())
+    return query.order_by(column.asc(), Admission.id.asc())
+
+
 @admissions_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_admissions():
-    status_filter = request.args.get('status')
-    query = Admission.query.order_by(Admission.kjsea_score.desc())
-    if status_filter:
-        query = query.filter_by(status=status_filter)
-    admissions = query.all()
-    return jsonify([a.to_dict() for a in admissions]), 200
+    """List applications a page at a time.
+
+    Filters: status (comma-separated), gender, grade_band, min_score, max_score,
+    created_from, created_to, previous_school. Paging: page, per_page. Sorting:
+    sort=<field> or sort=-<field>. view=summary leaves out the document links.
+    The total match count is returned in the X-Total-Count header.
+    """
+    exclude = DOCUMENT_FIELDS if request.args.get('view') == 'summary' else ()
+    serializer = Admission.serializer(exclude=exclude)
+    try:
+        # Select just the serialized columns as rows instead of loading Admission objects
+        rows, total = offset_page(_filtered_admissions_query().with_entities(*serializer.columns))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return offset_response(serializer.rows_to_dicts(rows), total), 200
+
+
+@admissions_bp.route('/<int:id>', methods=['GET'])
+@jwt_required()
+def get_admission(id):
+    """Get one application with its document links"""
+    admission = Admission.query.get_or_404(id)
+    return jsonify(admission.to_dict()), 200
 
 
 @admissions_bp.route('/stats', methods=['GET'])
 @jwt_required()
 def get_admission_stats():
-    total = Admission.query.count()
-    flagged = Admission.query.filter_by(status='flagged').count()
-    accepted = Admission.query.filter_by(status='accepted').count()
-    rejected = Admission.query.filter_by(status='rejected').count()
-    pending = Admission.query.filter_by(status='pending').count()
+    """Totals by status, plus breakdowns by gender and grade band.
+
+    Reads the admission_counters table when ADMISSION_COUNTERS_ENABLED is set,
+    otherwise runs one GROUP BY over admissions.
+    """
+    stats = None
+    if _counters_enabled():
+        stats = AdmissionCounter.read()
+        if stats is None:
+            AdmissionCounter.rebuild()
+            db.session.commit()
+            stats = AdmissionCounter.read()
+    if stats is None:
+        stats = aggregate_admission_stats()
+
     return jsonify({
-        'total': total,
-        'flagged': flagged,
-        'accepted': accepted,
-        'rejected': rejected,
-        'pending': pending,
+        'total': stats['total'],
+        **stats['status'],
+        'by_gender': stats['gender'],
+        'by_grade_band': stats['grade_band'],
     }), 200
 
 
+@admissions_bp.route('/analytics', methods=['GET'])
+@jwt_required()
+def get_admission_analytics():
+    """Score distribution of one intake year's applications.
+
+    Histogram (bin_width, default 4), percentiles, grade-band counts, and
+    averages per gender and per previous school. year defaults to the
+    current one; ?score=N adds the percentile rank of that score. Results
+    are kept per year and only new submissions are read on refresh.
+    """
+    try:
+        year = int(request.args.get('year', datetime.utcnow().year))
+        bin_width = int(request.args.get('bin_width', 4))
+        score = _parse_score('score')
+    except ValueError:
+        return jsonify({'error': 'year and bin_width must be integers, score a number'}), 400
+    if not 1 <= bin_width <= 72:
+        return jsonify({'error': 'bin_width must be between 1 and 72'}), 400
+    if not 1970 <= year <= 9998:
+        return jsonify({'error': 'year is out of range'}), 400
+
+    analytics = admission_analytics.year(year)
+    with analytics.lock:
+        analytics.refresh()
+        report = analytics.report(bin_width)
+        rank = analytics.percentile_rank(score) if score is not None else None
+    if score is not None:
+        report = {**report, 'score': score, 'percentile_rank': rank}
+    return jsonify(report), 200
+
+
+@admissions_bp.route('/stats/rebuild', methods=['POST'])
+@jwt_required()
+def rebuild_admission_stats():
+    """Recompute the admission counters from scratch, e.g. after turning them on"""
+    AdmissionCounter.rebuild()
+    db.session.commit()
+    return jsonify({'message': 'Admission counters rebuilt'}), 200
+
+
+@admissions_bp.route('/allocation', methods=['POST'])
+@jwt_required()  # Only admin can run seat allocation
+def propose_allocation():
+    """Rank the applicant pool and propose who gets the seats.
+
+    Body: {"capacity", "gender_quotas", "school_quotas", "default_school_quota",
+    "statuses", "waitlist"} (see app/allocation.py). Nothing is changed: the
+    proposed ids can be accepted through /bulk-status. Results are cached
+    until an application is added, edited or removed.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    try:
+        params = AllocationRequest(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(allocation_cache.report(params)), 200
+
+
+@admissions_bp.route('/import', methods=['POST'])
+@jwt_required()  # Only admin can import applications
+def import_admissions_file():
+    """Bulk-import applications from CSV or JSON, sent as a multipart 'file' or as the raw body.
+
+    Rows are validated like submit_admission. ?dry_run=true only validates;
+    ?notify=true queues the usual confirmation email to each applicant.
+    """
+    upload = request.files.get('file')
+    if upload:
+        stream, fmt = upload.stream, guess_format(upload.filename, upload.mimetype)
+    else:
+        stream, fmt = request.stream, guess_format(mimetype=request.mimetype)
+    fmt = request.args.get('format', fmt)
+    if fmt not in IMPORT_READERS:
+        return jsonify({'error': 'format must be csv or json'}), 400
+
+    dry_run = request.args.get('dry_run', 'false').lower() == 'true'
+    notify = request.args.get('notify', 'false').lower() == 'true'
+    mail_configured = os.getenv('MAIL_USERNAME') and os.getenv('MAIL_PASSWORD')
+
+    report = import_admissions(
+        IMPORT_READERS[fmt](stream),
+        batch_size=current_app.config.get('ADMISSION_IMPORT_BATCH_SIZE', 1000),
+        dry_run=dry_run,
+        count=_counters_enabled(),
+        emails=confirmation_emails if notify and mail_configured else None,
+        first_row=2 if fmt == 'csv' else 1,  # CSV row 1 is the header
+    )
+    if report.inserted:
+        outbox.notify()
+    return jsonify({**report.to_dict(), 'dry_run': dry_run}), 400 if report.error else 200
+
+
 @admissions_bp.route('/<int:id>/status', methods=['PUT'])
 @jwt_required()
 def update_status(id):
-    admission = Admission.query.get_or_404(id)
+    # Row-locked until commit so a concurrent change can't make the old status (and counters) stale
+    admission = Admission.query.with_for_update().populate_existing().get_or_404(id)
     data = request.get_json()
     new_status = data.get('status')
     if new_status not in ('accepted', 'rejected', 'pending', 'flagged'):
         return jsonify({'error': 'Invalid status'}), 400
 
+    if _counters_enabled():
+        AdmissionCounter.record_status_change(admission.status, new_status)
     admission.status = new_status
     admission.admin_notes = data.get('admin_notes', admission.admin_notes)
-    db.session.commit()
 
     mail_username = os.getenv('MAIL_USERNAME')
     mail_password = os.getenv('MAIL_PASSWORD')
     if mail_username and mail_password and new_status in ('accepted', 'rejected'):
-        Thread(
-            target=_send_status_email,
-            args=(
-                current_app._get_current_object(),
-                admission.parent_email,
-                admission.applicant_name,
-                admission.application_number,
-                new_status,
-                admission.admin_notes,
-            ),
-            daemon=True,
-        ).start()
+        _queue_status_email(
+            admission.parent_email,
+            admission.applicant_name,
+            admission.application_number,
+            new_status,
+            admission.admin_notes,
+        )
+    db.session.commit()
+    outbox.notify()
 
     return jsonify(admission.to_dict()), 200
 
 
+@admissions_bp.route('/bulk-status', methods=['PUT'])
+@jwt_required()
+def bulk_update_status():
+    """Decide many applications at once.
+
+    Body: {"status": "accepted", "ids": [1, 2, 3]} or {"status": "accepted",
+    "top_flagged": 200} for the highest-scoring flagged applicants. Optional
+    admin_notes applies to all of them. Everything is changed with one UPDATE
+    and the decision emails are queued together in the same transaction. The
+    targets are read FOR UPDATE, so the old statuses the counters and emails
+    rely on can't change underneath until the commit.
+    """
+    data = request.get_json() or {}
+    new_status = data.get('status')
+    if new_status not in ('accepted', 'rejected', 'pending', 'flagged'):
+        return jsonify({'error': 'Invalid status'}), 400
+
+    limit = current_app.config.get('BULK_STATUS_MAX', 1000)
+    columns = (Admission.id, Admission.status, Admission.parent_email,
+               Admission.applicant_name, Admission.application_number, Admission.admin_notes)
+    if data.get('ids'):
+        if not isinstance(data['ids'], list) or len(data['ids']) > limit:
+            return jsonify({'error': f'ids must be a list of at most {limit} integers'}), 400
+        try:
+            ids = [int(i) for i in data['ids']]
+        except (TypeError, ValueError):
+            return jsonify({'error': 'ids must be a list of integers'}), 400
+        targets = (
+            db.session.query(*columns)
+            .filter(Admission.id.in_(ids))
+            .order_by(Admission.id)  # Same lock order in every request, so two bulk updates can't deadlock
+            .with_for_update().all()
+        )
+    elif 'top_flagged' in data:
+        top = data['top_flagged']
+        if isinstance(top, bool) or not isinstance(top, int) or not 1 <= top <= limit:
+            return jsonify({'error': f'top_flagged must be an integer from 1 to {limit}'}), 400
+        targets = (
+            db.session.query(*columns)
+            .filter(Admission.status == 'flagged')
+            .order_by(Admission.kjsea_score.desc(), Admission.id.asc())
+            .limit(top).with_for_update().all()
+        )
+    else:
+        return jsonify({'error': 'Provide ids or top_flagged'}), 400
+
+    if not targets:
+        return jsonify({'updated': 0, 'ids': [], 'status': new_status}), 200
+
+    values = {'status': new_status}
+    if 'admin_notes' in data:
+        values['admin_notes'] = data['admin_notes']
+    target_ids = [t.id for t in targets]
+    log_changes(Admission, Admission.id.in_(target_ids))
+    db.session.execute(
+        db.update(Admission)
+        .where(Admission.id.in_(target_ids))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+    if _counters_enabled():
+        previous = {}
+        for t in targets:
+            previous[t.status] = previous.get(t.status, 0) + 1
+        for old_status, count in previous.items():
+            AdmissionCounter.record_status_change(old_status, new_status, count)
+
+    mail_username = os.getenv('MAIL_USERNAME')
+    mail_password = os.getenv('MAIL_PASSWORD')
+    if mail_username and mail_password and new_status in ('accepted', 'rejected'):
+        emails = []
+        for t in targets:
+            if t.status == new_status:
+                continue  # Already told about this decision
+            notes = values.get('admin_notes', t.admin_notes)
+            subject, body = _status_email(t.applicant_name, t.application_number, new_status, notes)
+            emails.append((subject, [t.parent_email], body))
+        enqueue_emails(emails)
+
+    db.session.commit()
+    outbox.notify()
+    return jsonify({'updated': len(target_ids), 'ids': target_ids, 'status': new_status}), 200
+
+
+@admissions_bp.route('/documents/<sha256>', methods=['GET'])
+@jwt_required()  # Only admin can read applicants' documents
+def get_admission_document(sha256):
+    """A document uploaded through /api/uploads, by content hash.
+
+    Applications link here instead of to the public /media route.
+    """
+    stored = StoredFile.query.filter_by(sha256=sha256).first_or_404()
+    response = send_file(get_storage().open(stored.storage_key), mimetype=stored.content_type,
+                         download_name=os.path.basename(stored.storage_key))
+    response.headers['Cache-Control'] = 'private, no-store'
+    return response
+
+
 @admissions_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()
 def delete_admission(id):
     admission = Admission.query.get_or_404(id)
+    AdmissionDocument.query.filter_by(admission_id=id).delete()
+    # Its duplicates stand alone until the next `flask dedupe-admissions` regroups them
+    log_changes(Admission, Admission.duplicate_of_id == id)
+    Admission.query.filter_by(duplicate_of_id=id).update({'duplicate_of_id': None}, synchronize_session=False)
     db.session.delete(admission)
+    if _counters_enabled():
+        AdmissionCounter.record_admission(admission, -1)
     db.session.commit()
     return jsonify({'message': 'Application deleted'}), 200
+
+
+@admissions_bp.route('/duplicates', methods=['GET'])
+@jwt_required()
+def get_duplicate_groups():
+    """Applications that others repeat, each with its duplicates, a page at a time.
+
+    Groups come from submit-time linking and `flask dedupe-admissions`.
+    The group count is returned in the X-Total-Count header.
+    """
+    serializer = Admission.serializer(exclude=DOCUMENT_FIELDS)
+    primary_ids = db.select(Admission.duplicate_of_id).where(Admission.duplicate_of_id.isnot(None))
+    query = db.session.query(*serializer.columns).filter(Admission.id.in_(primary_ids)).order_by(Admission.id.desc())
+    try:
+        rows, total = offset_page(query)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    groups = serializer.rows_to_dicts(rows)
+    duplicates = {}
+    if groups:
+        duplicate_rows = db.session.query(*serializer.columns).filter(
+            Admission.duplicate_of_id.in_([group['id'] for group in groups])).order_by(Admission.id).all()
+        for item in serializer.rows_to_dicts(duplicate_rows):
+            duplicates.setdefault(item['duplicate_of_id'], []).append(item)
+    for group in groups:
+        group['duplicates'] = duplicates.get(group['id'], [])
+    return offset_response(groups, total), 200
+
+
+@admissions_bp.route('/<int:id>/merge', methods=['POST'])
+@jwt_required()  # Only admin can merge duplicate applications
+def merge_duplicate_applications(id):
+    """Delete the applications linked to this one as duplicates, keeping their missing documents"""
+    primary = Admission.query.get_or_404(id)
+    merged = merge_duplicates(primary, count=_counters_enabled())
+    db.session.commit()
+    return jsonify({'merged': [admission.application_number for admission in merged]}), 200
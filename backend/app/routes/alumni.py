@@ -1,12 +1,14 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
+from app.cache import cached, invalidates
 from app.models.alumni import Alumni
 
 # Blueprint for all alumni-related routes
 alumni_bp = Blueprint('alumni', __name__)
 
 @alumni_bp.route('/', methods=['GET'])
+@cached('alumni')
 def get_alumni():
     """Get all alumni - public endpoint"""
     alumni = Alumni.query.order_by(Alumni.created_at.desc()).all()
@@ -14,6 +16,7 @@ def get_alumni():
 
 @alumni_bp.route('/', methods=['POST'])
 @jwt_required()  # Only admin can add alumni
+@invalidates('alumni')
 def create_alumni():
     """Add a new alumni record"""
     data = request.get_json()
@@ -28,6 +31,7 @@ def create_alumni():
 
 @alumni_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()  # Only admin can update alumni
+@invalidates('alumni')
 def update_alumni(id):
     """Update an alumni record by ID"""
     alumni = Alumni.query.get_or_404(id)
@@ -39,6 +43,7 @@ def update_alumni(id):
 
 @alumni_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()  # Only admin can delete alumni
+@invalidates('alumni')
 def delete_alumni(id):
     """Delete an alumni record by ID"""
     alumni = Alumni.query.get_or_404(id)
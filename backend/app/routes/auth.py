@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from app import db, bcrypt
+from flask_jwt_extended import create_access_token, current_user, jwt_required
+from app import db
+from app.login_guard import VerifierBusy, login_throttle, password_verifier
 from app.models.admin import AdminUser
 
 # Create a Blueprint for auth routes
@@ -10,18 +11,46 @@ auth_bp = Blueprint('auth', __name__)
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """Admin login endpoint - accepts email and password, returns JWT token"""
-    data = request.get_json()  # Get JSON data from request body
+    data = request.get_json(silent=True)  # Get JSON data from request body
 
-    # Validate that email and password are provided
-    if not data or not data.get('email') or not data.get('password'):
+    # Validate that email and password are provided, as non-empty strings
+    email = data.get('email') if isinstance(data, dict) else None
+    password = data.get('password') if isinstance(data, dict) else None
+    if not isinstance(email, str) or not email.strip() or not isinstance(password, str) or not password:
         return jsonify({'error': 'Email and password are required'}), 400
 
+    # Refuse early if this IP or email has too many recent attempts
+    ip = request.remote_addr
+    email_key = email.strip().lower()
+    wait = login_throttle.retry_after(ip, email_key)
+    if wait:
+        response = jsonify({'error': 'Too many login attempts. Please try again later.'})
+        response.headers['Retry-After'] = str(wait)
+        return response, 429
+    login_throttle.record_attempt(ip)
+
     # Find admin user by email in database
-    admin = AdminUser.query.filter_by(email=data['email']).first()
+    admin = AdminUser.query.filter_by(email=email).first()
 
-    # Check if admin exists and password is correct
-    if not admin or not bcrypt.check_password_hash(admin.password_hash, data['password']):
+    # Check if admin exists and password is correct (bcrypt runs on the bounded pool)
+    try:
+        valid = admin is not None and password_verifier.check(admin.password_hash, password)
+    except VerifierBusy:
+        response = jsonify({'error': 'Login is busy. Please try again shortly.'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    if not valid:
+        login_throttle.record_failure(email_key)
         return jsonify({'error': 'Invalid email or password'}), 401
+    login_throttle.record_success(email_key)
+
+    # Upgrade the stored hash if BCRYPT_LOG_ROUNDS changed since it was made
+    if password_verifier.needs_rehash(admin.password_hash):
+        try:
+            admin.password_hash = password_verifier.generate(password)
+            db.session.commit()
+        except VerifierBusy:
+            pass  # Not needed for this login; try again next time
 
     # Create JWT access token with admin's id as identity
     access_token = create_access_token(identity=str(admin.id))
@@ -35,13 +64,8 @@ def login():
 @jwt_required()  # This route requires a valid JWT token
 def get_current_admin():
     """Returns the currently logged in admin's details"""
-    admin_id = get_jwt_identity()  # Get admin id from JWT token
-    admin = AdminUser.query.get(admin_id)
-
-    if not admin:
-        return jsonify({'error': 'Admin not found'}), 404
-
-    return jsonify(admin.to_dict()), 200
+    # Loaded from the identity cache by the JWT user loader, not the database
+    return jsonify(current_user.to_dict()), 200
 
 @auth_bp.route('/logout', methods=['POST'])
 @jwt_required()
@@ -0,0 +1,41 @@
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from app.changes import TRACKED_MODELS, changes_since, latest_cursor
+from app.pagination import parse_limit
+from app.serializers import json_response
+
+# Blueprint for the admin dashboard's incremental sync feed
+changes_bp = Blueprint('changes', __name__)
+
+@changes_bp.route('/changes', methods=['GET'])
+@jwt_required()  # Only admin can read the change feed
+def get_changes():
+    """Rows created, updated or deleted after a cursor, oldest first.
+
+    Query params: since (cursor from a previous response), limit, tables
+    (comma-separated, e.g. tables=admissions,contact_submissions). Without
+    since nothing is returned but the current cursor: take it before loading
+    the tables, then poll with it. Keep requesting while has_more is true.
+    A 410 means the cursor is older than the kept history; reload everything.
+    """
+    tables = [t for t in request.args.get('tables', '').split(',') if t]
+    unknown = [t for t in tables if t not in TRACKED_MODELS]
+    if unknown:
+        return jsonify({'error': f"Unknown tables: {', '.join(unknown)}"}), 400
+
+    since = request.args.get('since')
+    if since is None:
+        return jsonify({'changes': [], 'cursor': str(latest_cursor()), 'has_more': False}), 200
+    if not since.isdigit():
+        return jsonify({'error': 'Invalid cursor'}), 400
+    try:
+        limit = parse_limit()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    result = changes_since(int(since), limit, tables,
+                           settle_seconds=current_app.config.get('CHANGE_FEED_SETTLE_SECONDS', 2))
+    if result is None:
+        return jsonify({'error': 'Cursor expired; reload and start a new cursor'}), 410
+    changes, cursor, has_more = result
+    return json_response({'changes': changes, 'cursor': str(cursor), 'has_more': has_more}), 200
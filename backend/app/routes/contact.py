@@ -1,21 +1,27 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from flask_mail import Message
-from app import db, mail
+from app import db
+from app.changes import log_changes
 from app.models.contact import ContactSubmission
-from threading import Thread
+from app.outbox import enqueue_email, outbox
+from app.pagination import offset_page, offset_response
+from sqlalchemy import and_, func
 import os
 
 contact_bp = Blueprint('contact', __name__)
 
-def _send_emails_async(app, school_msg, auto_reply):
-    """Send both emails in a background thread so the route responds immediately."""
-    with app.app_context():
-        try:
-            mail.send(school_msg)
-            mail.send(auto_reply)
-        except Exception as e:
-            print(f"Email sending failed: {e}")
+def _queue_emails(data, school_email):
+    """Queue the school notification and the auto-reply in the outbox."""
+    enqueue_email(
+        subject=f"New Contact Message: {data.get('subject', 'No Subject')}",
+        recipients=[school_email],
+        body=f"Name: {data['name']}\nEmail: {data['email']}\nPhone: {data.get('phone', 'Not provided')}\nMessage:\n{data['message']}"
+    )
+    enqueue_email(
+        subject="Thank you for contacting Kakamega School",
+        recipients=[data['email']],
+        body=f"Dear {data['name']},\n\nThank you for reaching out to Kakamega School. We have received your message and will get back to you within 24 hours.\n\nWarm regards,\nKakamega School Administration\nOnce a Katcherian, always a Katcherian"
+    )
 
 @contact_bp.route('/', methods=['POST', 'OPTIONS'])
 def submit_contact():
@@ -38,6 +44,10 @@ def submit_contact():
                 message=data['message']
             )
             db.session.add(submission)
+            mail_username = os.getenv("MAIL_USERNAME")
+            mail_password = os.getenv("MAIL_PASSWORD")
+            if mail_username and mail_password:
+                _queue_emails(data, mail_username)
             db.session.commit()
         except Exception as db_error:
             import traceback
@@ -46,26 +56,8 @@ def submit_contact():
             db.session.rollback()
             return jsonify({'error': 'Database error'}), 500
 
-        mail_username = os.getenv("MAIL_USERNAME")
-        mail_password = os.getenv("MAIL_PASSWORD")
-
-        if mail_username and mail_password:
-            school_msg = Message(
-                subject=f"New Contact Message: {data.get('subject', 'No Subject')}",
-                recipients=[mail_username],
-                body=f"Name: {data['name']}\nEmail: {data['email']}\nPhone: {data.get('phone', 'Not provided')}\nMessage:\n{data['message']}"
-            )
-            auto_reply = Message(
-                subject="Thank you for contacting Kakamega School",
-                recipients=[data['email']],
-                body=f"Dear {data['name']},\n\nThank you for reaching out to Kakamega School. We have received your message and will get back to you within 24 hours.\n\nWarm regards,\nKakamega School Administration\nOnce a Katcherian, always a Katcherian"
-            )
-            # Fire-and-forget: don't block the response waiting for SMTP
-            Thread(
-                target=_send_emails_async,
-                args=(current_app._get_current_object(), school_msg, auto_reply),
-                daemon=True
-            ).start()
+        # Emails go out from the outbox workers; don't block the response on SMTP
+        outbox.notify()
 
         return jsonify({'message': 'Message sent successfully'}), 201
     except Exception as e:
@@ -77,8 +69,91 @@ def submit_contact():
 @contact_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_submissions():
-    submissions = ContactSubmission.query.order_by(ContactSubmission.created_at.desc()).all()
-    return jsonify([s.to_dict() for s in submissions]), 200
+    """List inbox messages newest first, a page at a time.
+
+    Filters: is_read=true|false. Paging: page, per_page. view=summary leaves
+    out the message bodies. The total match count is in the X-Total-Count header.
+    """
+    exclude = ('message',) if request.args.get('view') == 'summary' else ()
+    serializer = ContactSubmission.serializer(exclude=exclude)
+    query = db.session.query(*serializer.columns)
+
+    is_read = request.args.get('is_read')
+    if is_read is not None:
+        if is_read not in ('true', 'false'):
+            return jsonify({'error': 'is_read must be true or false'}), 400
+        query = query.filter(ContactSubmission.is_read == (is_read == 'true'))
+
+    query = query.order_by(ContactSubmission.created_at.desc(), ContactSubmission.id.desc())
+    try:
+        rows, total = offset_page(query)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return offset_response(serializer.rows_to_dicts(rows), total), 200
+
+@contact_bp.route('/unread-count', methods=['GET'])
+@jwt_required()
+def get_unread_count():
+    """Number of unread messages, for the inbox badge (answered from the is_read index)"""
+    unread = (db.session.query(func.count())
+              .select_from(ContactSubmission)
+              .filter(ContactSubmission.is_read == False)
+              .scalar())
+    return jsonify({'unread': unread}), 200
+
+def _bulk_targets(data):
+    """WHERE clause for a bulk action: {"ids": [...]} or {"all": true}."""
+    if data.get('all') is True:
+        return db.true()
+    try:
+        ids = [int(i) for i in data.get('ids') or []]
+    except (TypeError, ValueError):
+        raise ValueError('ids must be a list of integers')
+    if not ids:
+        raise ValueError('Provide ids or all')
+    return ContactSubmission.id.in_(ids)
+
+@contact_bp.route('/bulk-read', methods=['PUT'])
+@jwt_required()
+def bulk_mark_as_read():
+    """Mark many messages read with one UPDATE.
+
+    Body: {"ids": [1, 2, 3]} or {"all": true} for the whole inbox.
+    """
+    try:
+        targets = _bulk_targets(request.get_json() or {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    unread = and_(targets, ContactSubmission.is_read == False)
+    log_changes(ContactSubmission, unread)
+    result = db.session.execute(
+        db.update(ContactSubmission)
+        .where(unread)
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return jsonify({'updated': result.rowcount}), 200
+
+@contact_bp.route('/bulk-delete', methods=['POST'])
+@jwt_required()
+def bulk_delete_submissions():
+    """Delete many messages with one DELETE.
+
+    Body: {"ids": [1, 2, 3]} or {"all": true} for the whole inbox.
+    """
+    try:
+        targets = _bulk_targets(request.get_json() or {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    log_changes(ContactSubmission, targets, 'delete')
+    result = db.session.execute(
+        db.delete(ContactSubmission)
+        .where(targets)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return jsonify({'deleted': result.rowcount}), 200
 
 @contact_bp.route('/<int:id>/read', methods=['PUT'])
 @jwt_required()
@@ -1,19 +1,30 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
+from app.cache import cached, invalidates
+from app.pagination import KEYSET_PARAMS, keyset_page, page_response
 from app.models.events import Event
 
 # Blueprint for all event-related routes
 events_bp = Blueprint('events', __name__)
 
 @events_bp.route('/', methods=['GET'])
+@cached('events', params=KEYSET_PARAMS)
 def get_events():
-    """Get all events - public endpoint"""
-    events = Event.query.order_by(Event.created_at.desc()).all()  # Latest first
-    return jsonify([e.to_dict() for e in events]), 200
+    """Get events newest first, one page at a time - public endpoint
+
+    Query params: limit, cursor (from the X-Next-Cursor header) and
+    fields (comma-separated columns, e.g. fields=title,excerpt).
+    """
+    try:
+        items, next_cursor = keyset_page(Event)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return page_response(items, next_cursor), 200
 
 @events_bp.route('/', methods=['POST'])
 @jwt_required()  # Only admin can create events
+@invalidates('events')
 def create_event():
     """Create a new event"""
     data = request.get_json()
@@ -28,6 +39,7 @@ def create_event():
 
 @events_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()  # Only admin can update events
+@invalidates('events')
 def update_event(id):
     """Update an event by ID"""
     event = Event.query.get_or_404(id)
@@ -39,6 +51,7 @@ def update_event(id):
 
 @events_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()  # Only admin can delete events
+@invalidates('events')
 def delete_event(id):
     """Delete an event by ID"""
     event = Event.query.get_or_404(id)
@@ -1,19 +1,34 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
+from app.cache import cached, invalidates
+from app.gallery_pipeline import gallery_pipeline
+from app.pagination import KEYSET_PARAMS, keyset_page, page_response
 from app.models.gallery import Gallery
+from app.storage import get_storage
 
 # Blueprint for all gallery-related routes
 gallery_bp = Blueprint('gallery', __name__)
 
 @gallery_bp.route('/', methods=['GET'])
+@cached('gallery', params=KEYSET_PARAMS)
 def get_gallery():
-    """Get all gallery images - public endpoint"""
-    images = Gallery.query.order_by(Gallery.created_at.desc()).all()  # Latest first
-    return jsonify([img.to_dict() for img in images]), 200
+    """Get gallery images newest first, one page at a time - public endpoint
+
+    Query params: limit, cursor (from the X-Next-Cursor header) and
+    fields (comma-separated columns, e.g. fields=title,excerpt).
+    Processed images carry srcset (WebP) and jpeg_srcset for <img srcset>,
+    plus width, height and blurhash to size and fill the tile before it loads.
+    """
+    try:
+        items, next_cursor = keyset_page(Gallery)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return page_response(items, next_cursor), 200
 
 @gallery_bp.route('/', methods=['POST'])
 @jwt_required()  # Only admin can add images
+@invalidates('gallery')
 def create_gallery():
     """Add a new image to the gallery"""
     data = request.get_json()
@@ -24,13 +39,17 @@ def create_gallery():
     )
     db.session.add(image)
     db.session.commit()
+    # Thumbnails, size and blurhash are made in the background; srcset is filled in when ready
+    gallery_pipeline.notify()
     return jsonify(image.to_dict()), 201
 
 @gallery_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()  # Only admin can delete images
+@invalidates('gallery')
 def delete_gallery(id):
     """Delete a gallery image by ID"""
     image = Gallery.query.get_or_404(id)
     db.session.delete(image)
     db.session.commit()
+    get_storage().delete_prefix(f'gallery/{id}/')
     return jsonify({'message': 'Image deleted successfully'}), 200
\ No newline at end of file
@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify
 from app import db
+from app.readiness import readiness
 from sqlalchemy import text
 
 health_bp = Blueprint('health', __name__)
@@ -8,6 +9,14 @@ health_bp = Blueprint('health', __name__)
 def health_check():
     return jsonify({"status": "ok"}), 200
 
+@health_bp.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once the DB pool has been warmed, 503 until then.
+
+    /health only says the process is up; it never touches the database.
+    """
+    return jsonify(readiness.status()), 200 if readiness.ready else 503
+
 @health_bp.route('/ping', methods=['GET'])
 def ping():
     """Wakes up the database. Call this on page load to pre-warm the DB connection."""
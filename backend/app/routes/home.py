@@ -0,0 +1,43 @@
+from flask import Blueprint, current_app, request, jsonify
+from app import db
+from app.cache import cached
+from app.models.events import Event
+from app.models.kcse_results import KcseResult
+from app.models.news import News
+from app.models.school_stats import SchoolStat
+from app.models.testimonials import Testimonial
+from app.serializers import json_response
+
+# Blueprint for the landing page's combined payload
+home_bp = Blueprint('home', __name__)
+
+# The landing page only shows these news columns, so skip the full content
+NEWS_SUMMARY_FIELDS = ('id', 'title', 'excerpt', 'category', 'created_at')
+
+@home_bp.route('/home', methods=['GET'])
+@cached('news', 'events', 'stats', 'kcse', 'testimonials', params=('limit',))  # Dropped when any of them writes
+def get_home():
+    """Latest news, events, KCSE results and testimonials plus all school stats - public endpoint
+
+    Replaces five separate requests on the landing page with one. Pass
+    limit=N to change how many items of each list are returned.
+    """
+    default = current_app.config.get('HOME_ITEMS_DEFAULT', 6)
+    try:
+        limit = min(max(int(request.args.get('limit', default)), 1), current_app.config.get('PAGE_SIZE_MAX', 100))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+
+    def latest(model, order_by, only=None):
+        serializer = model.serializer(only=only)
+        rows = db.session.query(*serializer.columns).order_by(*order_by).limit(limit).all()
+        return serializer.rows_to_dicts(rows)
+
+    stats = SchoolStat.serializer()
+    return json_response({
+        'news': latest(News, (News.created_at.desc(), News.id.desc()), NEWS_SUMMARY_FIELDS),
+        'events': latest(Event, (Event.created_at.desc(), Event.id.desc())),
+        'stats': stats.rows_to_dicts(db.session.query(*stats.columns).all()),
+        'kcse': latest(KcseResult, (KcseResult.year.desc(),)),
+        'testimonials': latest(Testimonial, (Testimonial.created_at.desc(),)),
+    }), 200
@@ -1,12 +1,14 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
+from app.cache import cached, invalidates
 from app.models.kcse_results import KcseResult
 
 # Blueprint for all KCSE results-related routes
 kcse_bp = Blueprint('kcse', __name__)
 
 @kcse_bp.route('/', methods=['GET'])
+@cached('kcse')
 def get_kcse_results():
     """Get all KCSE results - public endpoint"""
     results = KcseResult.query.order_by(KcseResult.year.desc()).all()  # Latest year first
@@ -14,6 +16,7 @@ def get_kcse_results():
 
 @kcse_bp.route('/', methods=['POST'])
 @jwt_required()  # Only admin can add results
+@invalidates('kcse')
 def create_kcse_result():
     """Add a new KCSE result"""
     data = request.get_json()
@@ -28,6 +31,7 @@ def create_kcse_result():
 
 @kcse_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()  # Only admin can update results
+@invalidates('kcse')
 def update_kcse_result(id):
     """Update a KCSE result by ID"""
     result = KcseResult.query.get_or_404(id)
@@ -39,6 +43,7 @@ def update_kcse_result(id):
 
 @kcse_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()  # Only admin can delete results
+@invalidates('kcse')
 def delete_kcse_result(id):
     """Delete a KCSE result by ID"""
     result = KcseResult.query.get_or_404(id)
@@ -0,0 +1,24 @@
+import posixpath
+
+from flask import Blueprint, abort, send_from_directory
+from app.storage import LocalStorage, get_storage
+from app.uploads import DOCUMENTS_PREFIX
+
+# Blueprint serving files from the local storage backend (gallery derivatives)
+media_bp = Blueprint('media', __name__)
+
+@media_bp.route('/<path:key>', methods=['GET'])
+def get_media(key):
+    """Serve a stored file - public endpoint
+
+    Keys contain a content hash, so browsers and CDNs may keep them for a year.
+    Admission documents are not served here (see get_admission_document).
+    """
+    storage = get_storage()
+    if not isinstance(storage, LocalStorage):
+        abort(404)  # Remote backends serve their own URLs
+    if posixpath.normpath(key).startswith(DOCUMENTS_PREFIX):
+        abort(404)
+    response = send_from_directory(storage.root, key, max_age=365 * 24 * 3600)
+    response.headers['Cache-Control'] += ', immutable'
+    return response
@@ -1,18 +1,29 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
+from app.cache import cached, invalidates
+from app.pagination import KEYSET_PARAMS, keyset_page, page_response
 from app.models.news import News
 
 # Blueprint for all news-related routes
 news_bp = Blueprint('news', __name__)
 
 @news_bp.route('/', methods=['GET'])
+@cached('news', params=KEYSET_PARAMS)
 def get_news():
-    """Get all news articles - public endpoint"""
-    news = News.query.order_by(News.created_at.desc()).all()  # Latest first
-    return jsonify([n.to_dict() for n in news]), 200
+    """Get news articles newest first, one page at a time - public endpoint
+
+    Query params: limit, cursor (from the X-Next-Cursor header) and
+    fields (comma-separated columns, e.g. fields=title,excerpt).
+    """
+    try:
+        items, next_cursor = keyset_page(News)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return page_response(items, next_cursor), 200
 
 @news_bp.route('/<int:id>', methods=['GET'])
+@cached('news')
 def get_single_news(id):
     """Get a single news article by ID"""
     news = News.query.get_or_404(id)
@@ -20,6 +31,7 @@ def get_single_news(id):
 
 @news_bp.route('/', methods=['POST'])
 @jwt_required()  # Only admin can create news
+@invalidates('news')
 def create_news():
     """Create a new news article"""
     data = request.get_json()
@@ -35,6 +47,7 @@ def create_news():
 
 @news_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()  # Only admin can update news
+@invalidates('news')
 def update_news(id):
     """Update a news article by ID"""
     news = News.query.get_or_404(id)
@@ -46,6 +59,7 @@ def update_news(id):
 
 @news_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()  # Only admin can delete news
+@invalidates('news')
 def delete_news(id):
     """Delete a news article by ID"""
     news = News.query.get_or_404(id)
@@ -0,0 +1,47 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+from app import db
+from app.models.outbox import OutboxEmail
+from app.outbox import outbox
+from datetime import datetime
+
+# Blueprint for inspecting the outgoing email queue
+outbox_bp = Blueprint('outbox', __name__)
+
+@outbox_bp.route('/', methods=['GET'])
+@jwt_required()  # Only admin can inspect the outbox
+def get_outbox_status():
+    """Counts by status, the oldest waiting email and the most recent failures"""
+    counts = dict(
+        db.session.query(OutboxEmail.status, db.func.count(OutboxEmail.id))
+        .group_by(OutboxEmail.status).all()
+    )
+    oldest_queued = (
+        db.session.query(db.func.min(OutboxEmail.created_at))
+        .filter(OutboxEmail.status.in_(['queued', 'sending'])).scalar()
+    )
+    failures = (
+        OutboxEmail.query
+        .filter(OutboxEmail.last_error.isnot(None), OutboxEmail.status != 'sent')
+        .order_by(OutboxEmail.id.desc()).limit(20).all()
+    )
+    return jsonify({
+        'counts': {status: counts.get(status, 0) for status in ('queued', 'sending', 'sent', 'failed')},
+        'oldest_queued_at': oldest_queued.isoformat() if oldest_queued else None,
+        'workers': outbox.worker_count(),
+        'recent_failures': [e.to_dict() for e in failures],
+    }), 200
+
+@outbox_bp.route('/<int:id>/retry', methods=['POST'])
+@jwt_required()  # Only admin can requeue emails
+def retry_email(id):
+    """Put a failed email back in the queue with a fresh attempt count"""
+    email = OutboxEmail.query.get_or_404(id)
+    if email.status != 'failed':
+        return jsonify({'error': 'Only failed emails can be retried'}), 400
+    email.status = 'queued'
+    email.attempts = 0
+    email.next_attempt_at = datetime.utcnow()
+    db.session.commit()
+    outbox.notify()
+    return jsonify(email.to_dict()), 200
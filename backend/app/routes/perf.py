@@ -0,0 +1,25 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+from app.instrumentation import request_metrics
+
+# Blueprint for the per-endpoint latency summary and slow-request log
+perf_bp = Blueprint('perf', __name__)
+
+@perf_bp.route('/', methods=['GET'])
+@jwt_required()  # Only admin can view request timings
+def get_summary():
+    """p50/p95/p99 latency, query counts and DB time per endpoint over the recent window"""
+    return jsonify(request_metrics.summary()), 200
+
+@perf_bp.route('/slow', methods=['GET'])
+@jwt_required()  # Only admin can view the slow-request log
+def get_slow_requests():
+    """Recent slow or query-heavy requests with the SQL they ran, newest first"""
+    return jsonify(request_metrics.slow_requests()), 200
+
+@perf_bp.route('/reset', methods=['POST'])
+@jwt_required()  # Only admin can clear the timing data
+def reset_metrics():
+    """Start a fresh measurement window"""
+    request_metrics.reset()
+    return jsonify({'message': 'Request metrics cleared'}), 200
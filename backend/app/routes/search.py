@@ -0,0 +1,43 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app import db
+from app.cache import cached
+from app.pagination import PAGE_PARAMS, offset_response, parse_page
+from app.search import SEARCH_SOURCES, reindex_all, search
+
+# Blueprint for site-wide search
+search_bp = Blueprint('search', __name__)
+
+@search_bp.route('/', methods=['GET'])
+@cached(*SEARCH_SOURCES, params=('q', 'types', *PAGE_PARAMS))  # Dropped whenever any searchable blueprint writes
+def search_content():
+    """Search news, events, alumni and testimonials - public endpoint
+
+    Query params: q (words; each also matches as a prefix), types
+    (comma-separated subset of news,events,alumni,testimonials), page, per_page.
+    Results are ranked best first; the match count is in X-Total-Count.
+    """
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({'error': 'q is required'}), 400
+
+    types = [t for t in request.args.get('types', '').split(',') if t] or list(SEARCH_SOURCES)
+    unknown = [t for t in types if t not in SEARCH_SOURCES]
+    if unknown:
+        return jsonify({'error': f"Unknown types: {', '.join(unknown)}"}), 400
+
+    try:
+        page, per_page = parse_page()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    items, total = search(q, types, page, per_page)
+    return offset_response(items, total), 200
+
+@search_bp.route('/reindex', methods=['POST'])
+@jwt_required()  # Only admin can rebuild the index
+def reindex():
+    """Rebuild the search index from all searchable content"""
+    count = reindex_all()
+    db.session.commit()
+    return jsonify({'message': 'Search index rebuilt', 'documents': count}), 200
@@ -1,12 +1,14 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
+from app.cache import cached, invalidates
 from app.models.staff import Staff
 
 # Blueprint for all staff-related routes
 staff_bp = Blueprint('staff', __name__)
 
 @staff_bp.route('/', methods=['GET'])
+@cached('staff')
 def get_staff():
     """Get all staff members - public endpoint"""
     staff = Staff.query.all()
@@ -14,6 +16,7 @@ def get_staff():
 
 @staff_bp.route('/', methods=['POST'])
 @jwt_required()  # Only admin can add staff
+@invalidates('staff')
 def create_staff():
     """Add a new staff member"""
     data = request.get_json()
@@ -32,6 +35,7 @@ def create_staff():
 
 @staff_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()  # Only admin can update staff
+@invalidates('staff')
 def update_staff(id):
     """Update an existing staff member by ID"""
     staff = Staff.query.get_or_404(id)
@@ -43,6 +47,7 @@ def update_staff(id):
 
 @staff_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()  # Only admin can delete staff
+@invalidates('staff')
 def delete_staff(id):
     """Delete a staff member by ID"""
     staff = Staff.query.get_or_404(id)
@@ -1,12 +1,14 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
+from app.cache import cached, invalidates
 from app.models.school_stats import SchoolStat
 
 # Blueprint for all school stats routes
 stats_bp = Blueprint('stats', __name__)
 
 @stats_bp.route('/', methods=['GET'])
+@cached('stats')
 def get_stats():
     """Get all school stats - public endpoint"""
     stats = SchoolStat.query.all()
@@ -14,6 +16,7 @@ def get_stats():
 
 @stats_bp.route('/', methods=['POST'])
 @jwt_required()  # Only admin can add stats
+@invalidates('stats')
 def create_stat():
     """Create a new school stat"""
     data = request.get_json()
@@ -29,6 +32,7 @@ def create_stat():
 
 @stats_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()  # Only admin can update stats
+@invalidates('stats')
 def update_stat(id):
     """Update a school stat by ID"""
     stat = SchoolStat.query.get_or_404(id)
@@ -40,6 +44,7 @@ def update_stat(id):
 
 @stats_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()  # Only admin can delete stats
+@invalidates('stats')
 def delete_stat(id):
     """Delete a school stat by ID"""
     stat = SchoolStat.query.get_or_404(id)
@@ -1,12 +1,14 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
+from app.cache import cached, invalidates
 from app.models.testimonials import Testimonial
 
 # Blueprint for all testimonial-related routes
 testimonials_bp = Blueprint('testimonials', __name__)
 
 @testimonials_bp.route('/', methods=['GET'])
+@cached('testimonials')
 def get_testimonials():
     """Get all testimonials - public endpoint"""
     testimonials = Testimonial.query.order_by(Testimonial.created_at.desc()).all()
@@ -14,6 +16,7 @@ def get_testimonials():
 
 @testimonials_bp.route('/', methods=['POST'])
 @jwt_required()  # Only admin can add testimonials
+@invalidates('testimonials')
 def create_testimonial():
     """Add a new testimonial"""
     data = request.get_json()
@@ -28,6 +31,7 @@ def create_testimonial():
 
 @testimonials_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()  # Only admin can update testimonials
+@invalidates('testimonials')
 def update_testimonial(id):
     """Update a testimonial by ID"""
     testimonial = Testimonial.query.get_or_404(id)
@@ -39,6 +43,7 @@ def update_testimonial(id):
 
 @testimonials_bp.route('/<int:id>', methods=['DELETE'])
 @jwt_required()  # Only admin can delete testimonials
+@invalidates('testimonials')
 def delete_testimonial(id):
     """Delete a testimonial by ID"""
     testimonial = Testimonial.query.get_or_404(id)
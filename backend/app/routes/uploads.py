@@ -0,0 +1,68 @@
+from flask import Blueprint, request, jsonify, current_app
+from app import db
+from app.models.upload import Upload
+from app.uploads import UploadConflict, create_upload, upload_status, upload_throttle, write_chunk
+
+# Blueprint for resumable admission document uploads, sent before the application itself
+uploads_bp = Blueprint('uploads', __name__)
+
+@uploads_bp.route('/', methods=['POST', 'OPTIONS'])
+def start_upload():
+    """Start an upload - public endpoint
+
+    Body: {"filename", "content_type", "size"}. The returned id is then sent
+    as chunks with PUT /api/uploads/<id>?offset=N. Each IP may start
+    UPLOAD_MAX_PER_IP uploads per UPLOAD_THROTTLE_WINDOW.
+    """
+    if request.method == 'OPTIONS':
+        return '', 204
+
+    ip = request.remote_addr
+    wait = upload_throttle.retry_after(ip)
+    if wait:
+        response = jsonify({'error': 'Too many uploads. Please try again later.'})
+        response.headers['Retry-After'] = str(wait)
+        return response, 429
+
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    try:
+        upload = create_upload(data, current_app.config)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    upload_throttle.record(ip)
+    return jsonify({**upload_status(upload), 'chunk_size': current_app.config.get('UPLOAD_CHUNK_SIZE')}), 201
+
+@uploads_bp.route('/<upload_id>', methods=['PUT', 'OPTIONS'])
+def put_chunk(upload_id):
+    """Append the raw request body at ?offset=N - public endpoint
+
+    409 with the current offset when the chunk does not start there (a
+    retried or lost chunk); the client resends from that offset.
+    """
+    if request.method == 'OPTIONS':
+        return '', 204
+
+    upload = db.session.get(Upload, upload_id)
+    if upload is None:
+        return jsonify({'error': 'Upload not found'}), 404
+    offset = request.args.get('offset', '')
+    if not offset.isdigit():
+        return jsonify({'error': 'offset must be a non-negative integer'}), 400
+
+    try:
+        upload = write_chunk(upload, int(offset), request.stream, request.content_length)
+    except UploadConflict as e:
+        return jsonify({'error': str(e), 'offset': e.offset}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(upload_status(upload)), 200
+
+@uploads_bp.route('/<upload_id>', methods=['GET'])
+def get_upload(upload_id):
+    """Where an upload stands, to resume it after a dropped connection - public endpoint"""
+    upload = db.session.get(Upload, upload_id)
+    if upload is None:
+        return jsonify({'error': 'Upload not found'}), 404
+    return jsonify(upload_status(upload)), 200
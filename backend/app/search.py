@@ -0,0 +1,248 @@
+import math
+import re
+from bisect import bisect_left
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.alumni import Alumni
+from app.models.events import Event
+from app.models.news import News
+from app.models.search_document import SEARCH_VECTOR_SQL, SearchDocument
+from app.models.testimonials import Testimonial
+
+# source name -> (model, title attribute, body attributes)
+SEARCH_SOURCES = {
+    'news': (News, 'title', ('excerpt', 'content', 'category')),
+    'events': (Event, 'title', ('date', 'description')),
+    'alumni': (Alumni, 'name', ('achievement', 'description')),
+    'testimonials': (Testimonial, 'student_name', ('year', 'quote')),
+}
+_MODEL_SOURCES = {model: source for source, (model, _, _) in SEARCH_SOURCES.items()}
+
+SNIPPET_LENGTH = 200
+TOKEN_RE = re.compile(r'\w+')
+STOPWORDS = {'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+             'it', 'of', 'on', 'or', 'the', 'to', 'was', 'with'}
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall((text or '').lower()) if t not in STOPWORDS]
+
+
+def _document_text(source, obj):
+    _, title_attr, body_attrs = SEARCH_SOURCES[source]
+    title = getattr(obj, title_attr) or ''
+    body = '\n'.join(str(getattr(obj, attr)) for attr in body_attrs if getattr(obj, attr))
+    return title, body
+
+
+class InvertedIndex:
+    """In-process full-text index used when the database is not Postgres.
+
+    Built from search_documents, and rebuilt whenever that table's version
+    stamp (see _index_stamp) differs from the one it was built at, so every
+    worker process sees content committed by the others. Title terms count
+    double. Every query term must match, and each term also matches longer
+    words that start with it.
+    """
+
+    def __init__(self):
+        self._postings = {}  # term -> {(source, id): weight}
+        self._docs = {}      # (source, id) -> (title, snippet, term count, distinct terms)
+        self._vocabulary = None  # Sorted terms for prefix lookup, rebuilt lazily
+        self._lock = Lock()
+        self.stamp = None  # search_documents stamp the index was built at; None until built
+
+    def build(self, documents, stamp):
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            for source, source_id, title, body in documents:
+                self._add((source, source_id), title, body)
+            self._vocabulary = None
+            self.stamp = stamp
+
+    def _add(self, key, title, body):
+        weights = {}
+        for term in tokenize(title):
+            weights[term] = weights.get(term, 0) + 2
+        body_terms = tokenize(body)
+        for term in body_terms:
+            weights[term] = weights.get(term, 0) + 1
+        for term, weight in weights.items():
+            self._postings.setdefault(term, {})[key] = weight
+        self._docs[key] = (title, (body or '')[:SNIPPET_LENGTH], len(body_terms) + 1, tuple(weights))
+
+    def _expand(self, term):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect_left(self._vocabulary, term)
+        matches = []
+        for candidate in self._vocabulary[start:]:
+            if not candidate.startswith(term):
+                break
+            matches.append(candidate)
+        return matches
+
+    def search(self, terms, sources):
+        """Return [(score, key)] for documents matching every term, best first."""
+        with self._lock:
+            total_docs = len(self._docs) or 1
+            scores = None
+            for term in terms:
+                term_scores = {}
+                for expansion in self._expand(term):
+                    postings = self._postings[expansion]
+                    idf = math.log(1 + total_docs / len(postings))
+                    for key, weight in postings.items():
+                        term_scores[key] = term_scores.get(key, 0) + weight * idf
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {key: scores[key] + s for key, s in term_scores.items() if key in scores}
+                if not scores:
+                    return []
+            results = [
+                (score / (1 + math.log(self._docs[key][2])), key)
+                for key, score in (scores or {}).items() if key[0] in sources
+            ]
+        results.sort(key=lambda r: (-r[0], r[1]))
+        return results
+
+    def document(self, key):
+        return self._docs.get(key)
+
+
+memory_index = InvertedIndex()
+_rebuild_lock = Lock()
+_backfill_lock = Lock()
+_backfilled = False
+
+
+def _uses_postgres():
+    return db.engine.dialect.name == 'postgresql'
+
+
+def _index_stamp():
+    """Changes with every committed write to search_documents, from any process.
+
+    Each content change deletes and re-inserts its row: the count catches
+    deletes, the highest id inserts, and the newest updated_at the insert
+    that reuses the highest id (SQLite does after deleting it).
+    """
+    return tuple(db.session.query(
+        db.func.count(SearchDocument.id), db.func.max(SearchDocument.id), db.func.max(SearchDocument.updated_at),
+    ).one())
+
+
+def _refresh_memory_index():
+    """Rebuild the in-process index if search_documents changed since it was built. One aggregate query."""
+    stamp = _index_stamp()
+    if memory_index.stamp == stamp:
+        return
+    with _rebuild_lock:
+        if memory_index.stamp == stamp:
+            return  # Another request rebuilt it while we waited
+        # Read after the stamp: a commit in between makes the next search rebuild again, never skip it
+        memory_index.build(db.session.query(
+            SearchDocument.source, SearchDocument.source_id, SearchDocument.title, SearchDocument.body
+        ).yield_per(500), stamp)
+
+
+def reindex_all():
+    """Rebuild search_documents from every source table. Does not commit."""
+    db.session.execute(db.delete(SearchDocument))
+    count = 0
+    for source, (model, _, _) in SEARCH_SOURCES.items():
+        rows = []
+        for obj in model.query.yield_per(500):
+            title, body = _document_text(source, obj)
+            rows.append({'source': source, 'source_id': obj.id, 'title': title[:255], 'body': body})
+        if rows:
+            db.session.execute(db.insert(SearchDocument), rows)
+        count += len(rows)
+    return count
+
+
+def _ensure_backfilled():
+    """Index existing content the first time search runs against an empty table."""
+    global _backfilled
+    if _backfilled:
+        return
+    with _backfill_lock:
+        if _backfilled:
+            return
+        if db.session.query(SearchDocument.id).first() is None:
+            reindex_all()
+            db.session.commit()
+        _backfilled = True
+
+
+def search(q, sources, page, per_page):
+    """Ranked, paginated search. Returns (items, total)."""
+    terms = tokenize(q)
+    if not terms:
+        return [], 0
+    _ensure_backfilled()
+
+    if _uses_postgres():
+        return _search_postgres(terms, sources, page, per_page)
+
+    _refresh_memory_index()
+    results = memory_index.search(terms, set(sources))
+    items = []
+    for score, key in results[(page - 1) * per_page:page * per_page]:
+        title, snippet, _, _ = memory_index.document(key)
+        items.append({'type': key[0], 'id': key[1], 'title': title,
+                      'snippet': snippet, 'rank': round(score, 4)})
+    return items, len(results)
+
+
+def _search_postgres(terms, sources, page, per_page):
+    # Terms are \w+ only, so they are safe to splice into tsquery syntax; :* makes each a prefix match
+    tsquery = db.func.to_tsquery(db.literal_column("'english'"),
+                                 db.bindparam('q', ' & '.join(f'{term}:*' for term in terms)))
+    vector = db.literal_column(f"({SEARCH_VECTOR_SQL})")
+    rank = db.func.ts_rank_cd(vector, tsquery)
+    query = (
+        db.session.query(SearchDocument.source, SearchDocument.source_id, SearchDocument.title,
+                         db.func.substr(SearchDocument.body, 1, SNIPPET_LENGTH), rank)
+        .filter(vector.op('@@')(tsquery))
+        .filter(SearchDocument.source.in_(sources))
+    )
+    total = query.order_by(None).count()
+    rows = query.order_by(rank.desc(), SearchDocument.id).limit(per_page).offset((page - 1) * per_page).all()
+    items = [{'type': source, 'id': source_id, 'title': title, 'snippet': snippet, 'rank': round(score, 4)}
+             for source, source_id, title, snippet, score in rows]
+    return items, total
+
+
+@event.listens_for(Session, 'after_flush')
+def _index_flushed_content(session, flush_context):
+    """Mirror created, updated and deleted content into search_documents.
+
+    Runs inside the same transaction as the content change; in-process
+    indexes notice the commit through the table's stamp.
+    """
+    changes = []
+    for obj in list(session.new) + list(session.dirty):
+        source = _MODEL_SOURCES.get(type(obj))
+        if source:
+            changes.append((source, obj.id) + _document_text(source, obj))
+    for obj in session.deleted:
+        source = _MODEL_SOURCES.get(type(obj))
+        if source:
+            changes.append((source, obj.id, None, None))
+    if not changes:
+        return
+
+    connection = session.connection()
+    for source, source_id, title, body in changes:
+        connection.execute(db.delete(SearchDocument).where(
+            SearchDocument.source == source, SearchDocument.source_id == source_id))
+        if title is not None:
+            connection.execute(db.insert(SearchDocument).values(
+                source=source, source_id=source_id, title=title[:255], body=body))
@@ -0,0 +1,104 @@
+import json
+from datetime import date, datetime
+
+from flask import current_app
+from sqlalchemy import inspect
+
+from app.instrumentation import timed_serialization
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder gives the same output, slower
+    orjson = None
+
+
+def _encode_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data):
+    """Encode to JSON bytes with sorted keys, as jsonify does; datetimes become ISO 8601."""
+    with timed_serialization():
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        return json.dumps(data, default=_encode_default, sort_keys=True).encode()
+
+
+def json_response(data, status=200):
+    return current_app.response_class(dumps(data), status=status, mimetype='application/json')
+
+
+class ModelSerializer:
+    """Column list and dict layout for a model, derived from its mapper.
+
+    Used both by the models' to_dict() and by list endpoints that select the
+    columns as plain rows, so the two can never disagree about which fields
+    are returned. The row path skips ORM object hydration and leaves datetimes
+    for the JSON encoder instead of calling isoformat() per row.
+    """
+
+    def __init__(self, model, exclude=(), only=None):
+        exclude = set(exclude) | set(getattr(model, '__serialize_exclude__', ()))
+        keys = [attr.key for attr in inspect(model).column_attrs if attr.key not in exclude]
+        if only is not None:
+            keys = [key for key in keys if key in only]
+        self.model = model
+        self.keys = keys
+        self.columns = [getattr(model, key) for key in keys]
+        # name -> (source column, function of that column's value)
+        self.computed = {name: spec for name, spec in getattr(model, '__serialize_computed__', {}).items()
+                         if spec[0] in keys}
+
+    def object_to_dict(self, obj):
+        with timed_serialization():
+            data = {}
+            for key in self.keys:
+                value = getattr(obj, key)
+                data[key] = value.isoformat() if isinstance(value, (datetime, date)) else value
+            for name, (source, fn) in self.computed.items():
+                data[name] = fn(data[source])
+            return data
+
+    def row_to_dict(self, row):
+        """Dict for a row selected with self.columns; datetimes are left for dumps()."""
+        data = dict(zip(self.keys, row))
+        for name, (source, fn) in self.computed.items():
+            data[name] = fn(data[source])
+        return data
+
+    def rows_to_dicts(self, rows):
+        keys, computed = self.keys, self.computed
+        with timed_serialization():
+            if not computed:
+                return [dict(zip(keys, row)) for row in rows]
+            return [self.row_to_dict(row) for row in rows]
+
+
+_serializers = {}
+MAX_SERIALIZERS = 1024  # fields= combinations are client-chosen; past this, build without keeping
+
+
+class SerializerMixin:
+    """Gives a model a to_dict() generated from its columns.
+
+    Set __serialize_exclude__ for columns that must never be returned and
+    __serialize_computed__ = {'name': ('source_column', fn)} for derived fields.
+    """
+    __serialize_exclude__ = ()
+    __serialize_computed__ = {}
+
+    @classmethod
+    def serializer(cls, exclude=(), only=None):
+        # Column order comes from the model, so duplicates and order in `only` don't matter
+        key = (cls, frozenset(exclude), frozenset(only) if only is not None else None)
+        serializer = _serializers.get(key)
+        if serializer is None:
+            serializer = ModelSerializer(cls, exclude, only)
+            if len(_serializers) < MAX_SERIALIZERS:
+                _serializers[key] = serializer
+        return serializer
+
+    def to_dict(self):
+        return self.serializer().object_to_dict(self)
@@ -0,0 +1,135 @@
+import fcntl
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from flask import current_app
+
+
+class LockHeld(Exception):
+    """Raised by storage.lock() when another request already holds the lock."""
+
+
+class LocalStorage:
+    """Files kept under a directory on this machine and served by app/routes/media.py.
+
+    Keys are relative paths such as "gallery/12/3fa9c1d2-640.webp". Stands in
+    for a remote object store: another backend only needs the same methods
+    (resumable uploads use write_at/iter_chunks/rename, which map onto
+    multipart uploads in object stores, and lock, which needs a shared lock
+    service there).
+    """
+
+    def __init__(self, root, base_url=None):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip('/') if base_url else None
+
+    def path(self, key):
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f'Invalid storage key: {key}')
+        return path
+
+    def save(self, key, data):
+        """Write bytes to `key`, replacing it atomically."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return key
+
+    def write_at(self, key, offset, chunks):
+        """Write an iterable of byte chunks into `key` starting at `offset`.
+
+        Anything already stored past `offset` is dropped first, so a resumed
+        upload overwrites a partly received chunk. Returns the bytes written.
+        """
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        written = 0
+        with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+            f.seek(offset)
+            f.truncate()
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        return written
+
+    def iter_chunks(self, key, limit=None, chunk_size=1024 * 1024):
+        """Yield the stored bytes of `key` (the first `limit` of them) a chunk at a time."""
+        remaining = limit
+        with open(self.path(key), 'rb') as f:
+            while remaining is None or remaining > 0:
+                chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    @contextmanager
+    def lock(self, key):
+        """Hold an exclusive lock named `key` for the duration of the block, across
+        every process sharing this directory. Raises LockHeld instead of waiting."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise LockHeld(key)
+            yield  # Closing the file releases the lock
+
+    def rename(self, source, target):
+        path = self.path(target)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self.path(source), path)
+        return target
+
+    def delete(self, key):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def open(self, key):
+        return open(self.path(key), 'rb')
+
+    def exists(self, key):
+        return os.path.isfile(self.path(key))
+
+    def delete_prefix(self, prefix):
+        """Remove every file under `prefix` (a directory-like key ending in /)."""
+        shutil.rmtree(self.path(prefix.rstrip('/')), ignore_errors=True)
+
+    def url(self, key):
+        """Public URL for `key`: under MEDIA_URL, else relative to this API's /media route.
+
+        Never built from the request's Host, which clients control and which
+        would end up in cached responses shared with everyone.
+        """
+        return f"{self.base_url or '/media'}/{key}"
+
+
+# STORAGE_BACKEND -> fn(config) building the backend
+STORAGE_BACKENDS = {
+    'local': lambda config: LocalStorage(config.get('MEDIA_ROOT', 'media'), config.get('MEDIA_URL')),
+}
+
+
+def init_storage(app):
+    backend = app.config.get('STORAGE_BACKEND', 'local')
+    if backend not in STORAGE_BACKENDS:
+        raise RuntimeError(f'Unknown STORAGE_BACKEND: {backend}')
+    app.extensions['storage'] = STORAGE_BACKENDS[backend](app.config)
+
+
+def get_storage():
+    return current_app.extensions['storage']
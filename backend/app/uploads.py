@@ -0,0 +1,353 @@
+import hashlib
+import mimetypes
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+
+from flask import url_for
+from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import ClientDisconnected
+
+from app import background_workers_allowed, db
+from app.login_guard import throttle_backend
+from app.models.admission import DOCUMENT_FIELDS
+from app.models.admission_document import AdmissionDocument
+from app.models.upload import StoredFile, Upload
+from app.storage import LockHeld, get_storage
+
+READ_SIZE = 64 * 1024       # Bytes read from the request body at a time
+MAX_CACHED_HASHES = 1000    # Uploads whose running hash is kept between chunks
+DOCUMENTS_PREFIX = 'documents/'  # Storage keys of finished documents; never served publicly
+
+
+class UploadConflict(Exception):
+    """A chunk did not start where the upload left off; `offset` is where it did."""
+
+    def __init__(self, message, offset):
+        super().__init__(message)
+        self.offset = offset
+
+
+class _RunningHashes:
+    """sha256 state of uploads in progress, so each chunk only hashes its own bytes.
+
+    Kept in process memory. When another process received the earlier chunks
+    (or after a restart) the hash is rebuilt by reading back the part file.
+    """
+
+    def __init__(self):
+        self._hashes = OrderedDict()  # upload id -> (bytes hashed, hasher)
+        self._lock = Lock()
+
+    def take(self, upload, storage):
+        with self._lock:
+            cached = self._hashes.pop(upload.id, None)
+        if cached and cached[0] == upload.received:
+            return cached[1]
+        hasher = hashlib.sha256()
+        if upload.received:
+            for chunk in storage.iter_chunks(part_key(upload.id), limit=upload.received):
+                hasher.update(chunk)
+        return hasher
+
+    def put(self, upload_id, hashed, hasher):
+        with self._lock:
+            self._hashes[upload_id] = (hashed, hasher)
+            while len(self._hashes) > MAX_CACHED_HASHES:
+                self._hashes.popitem(last=False)
+
+    def forget(self, upload_id):
+        with self._lock:
+            self._hashes.pop(upload_id, None)
+
+
+running_hashes = _RunningHashes()
+
+
+def part_key(upload_id):
+    return f"uploads/{upload_id}.part"
+
+
+def lock_key(upload_id):
+    return f"uploads/{upload_id}.lock"
+
+
+class UploadThrottle:
+    """Per-IP limit on started uploads over a sliding window, so one client
+    can't fill the disk with abandoned ones. Shares the login throttle's backend.
+    """
+
+    def __init__(self):
+        self.backend = None
+
+    def init_app(self, app):
+        self.window = app.config.get('UPLOAD_THROTTLE_WINDOW', 3600)
+        self.max_per_ip = app.config.get('UPLOAD_MAX_PER_IP', 30)
+        self.backend = throttle_backend(app)
+        app.extensions['upload_throttle'] = self
+
+    def retry_after(self, ip):
+        """Seconds the caller must wait before starting another upload, or 0 if allowed."""
+        count, wait = self.backend.count(f'upload:{ip}', self.window)
+        return int(wait) + 1 if count >= self.max_per_ip else 0
+
+    def record(self, ip):
+        self.backend.hit(f'upload:{ip}', self.window)
+
+
+upload_throttle = UploadThrottle()
+
+
+def upload_status(upload):
+    data = {
+        'id': upload.id,
+        'filename': upload.filename,
+        'size': upload.size,
+        'offset': upload.received,
+        'status': upload.status,
+    }
+    if upload.file is not None:
+        data['sha256'] = upload.file.sha256  # No URL: documents are only served to admins
+    return data
+
+
+def document_url(stored):
+    """Where admins read a stored document (see get_admission_document).
+
+    A path on this API, not a full URL: the request's host is client-controlled.
+    """
+    return url_for('admissions.get_admission_document', sha256=stored.sha256)
+
+
+def create_upload(data, config):
+    """Start an upload from {"filename", "content_type", "size"}. Raises ValueError. Commits."""
+    try:
+        size = int(data.get('size'))
+    except (TypeError, ValueError):
+        raise ValueError('size must be the file size in bytes')
+    limit = config.get('UPLOAD_MAX_BYTES', 10 * 1024 * 1024)
+    if not 0 < size <= limit:
+        raise ValueError(f'size must be between 1 and {limit} bytes')
+    content_type = (data.get('content_type') or '').lower()
+    allowed = config.get('UPLOAD_CONTENT_TYPES', 'application/pdf,image/jpeg,image/png,image/webp').split(',')
+    if content_type not in allowed:
+        raise ValueError(f"content_type must be one of: {', '.join(allowed)}")
+
+    upload = Upload(id=uuid.uuid4().hex, filename=(data.get('filename') or '')[:255],
+                    content_type=content_type, size=size, received=0, status='uploading')
+    db.session.add(upload)
+    db.session.commit()
+    return upload
+
+
+def _body_chunks(stream, length, hasher):
+    """Read up to `length` bytes from the request body, hashing as they pass.
+
+    A client that disconnects part way just ends the chunk early: what did
+    arrive is kept and the next request resumes after it.
+    """
+    remaining = length
+    while remaining > 0:
+        try:
+            chunk = stream.read(min(READ_SIZE, remaining))
+        except (ClientDisconnected, OSError):
+            return
+        if not chunk:
+            return
+        remaining -= len(chunk)
+        hasher.update(chunk)
+        yield chunk
+
+
+def _check_chunk(upload, offset, length):
+    if upload.status != 'uploading':
+        raise UploadConflict('Upload already complete', upload.received)
+    if offset != upload.received:
+        raise UploadConflict('Chunk does not start at the upload offset', upload.received)
+    if length is None or offset + length > upload.size:
+        raise ValueError('Chunk needs a Content-Length and must not run past the declared size')
+
+
+def write_chunk(upload, offset, stream, length):
+    """Append one chunk of the request body at `offset`, finishing the upload on the last byte.
+
+    Streams straight to storage; the chunk is never held in memory whole.
+    One chunk per upload is written at a time across all processes (a
+    storage lock), and the offset is checked again once the lock is held.
+    Raises UploadConflict if `offset` is not where the upload stands or
+    another chunk is being written, and ValueError for chunks that run past
+    the declared size. Commits.
+    """
+    _check_chunk(upload, offset, length)
+    storage = get_storage()
+    try:
+        with storage.lock(lock_key(upload.id)):
+            db.session.refresh(upload)  # Another request may have moved it on before we got the lock
+            _check_chunk(upload, offset, length)
+            _write_locked(upload, offset, stream, length, storage)
+    except LockHeld:
+        raise UploadConflict('Another chunk of this upload is being written', upload.received)
+    return upload
+
+
+def _write_locked(upload, offset, stream, length, storage):
+    hasher = running_hashes.take(upload, storage)
+    try:
+        written = storage.write_at(part_key(upload.id), offset, _body_chunks(stream, length, hasher))
+    except Exception:
+        running_hashes.forget(upload.id)  # The hash may include bytes that never reached storage
+        raise
+
+    # Conditional on the old offset as a backstop; the lock already keeps chunks apart
+    moved = db.session.execute(
+        db.update(Upload).where(Upload.id == upload.id, Upload.received == offset)
+        .values(received=offset + written)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    db.session.refresh(upload)
+    if not moved:
+        running_hashes.forget(upload.id)
+        raise UploadConflict('Another chunk was written at this offset', upload.received)
+    running_hashes.put(upload.id, upload.received, hasher)
+
+    if upload.received == upload.size:
+        _finish(upload, hasher.hexdigest(), storage)
+
+
+def _finish(upload, sha256, storage):
+    """Keep the part file as a StoredFile, or drop it if the same content is already stored."""
+    stored = StoredFile.query.filter_by(sha256=sha256).first()
+    if stored is None:
+        extension = mimetypes.guess_extension(upload.content_type) or ''
+        key = f"{DOCUMENTS_PREFIX}{sha256[:2]}/{sha256}{extension}"
+        storage.rename(part_key(upload.id), key)
+        try:
+            with db.session.begin_nested():
+                stored = StoredFile(sha256=sha256, size=upload.size, content_type=upload.content_type,
+                                    storage_key=key)
+                db.session.add(stored)
+        except IntegrityError:
+            # The same file finished in parallel; both wrote identical bytes to the same key
+            stored = StoredFile.query.filter_by(sha256=sha256).one()
+    else:
+        storage.delete(part_key(upload.id))
+
+    upload.file = stored
+    upload.status = 'complete'
+    db.session.commit()
+    running_hashes.forget(upload.id)
+    storage.delete(lock_key(upload.id))
+
+
+def resolve_uploads(uploads):
+    """Map {"<document field>": "<upload id>"} from a submission to finished StoredFiles.
+
+    Raises ValueError naming the first field that is unknown or not fully uploaded.
+    """
+    if not uploads:
+        return {}
+    if not isinstance(uploads, dict):
+        raise ValueError('uploads must map document fields to upload ids')
+    unknown = [field for field in uploads if field not in DOCUMENT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown document fields: {', '.join(unknown)}")
+    found = {upload.id: upload for upload in
+             Upload.query.filter(Upload.id.in_([str(i) for i in uploads.values()])).all()}
+    files = {}
+    for field, upload_id in uploads.items():
+        upload = found.get(str(upload_id))
+        if upload is None or upload.status != 'complete':
+            raise ValueError(f'Upload for {field} is missing or not finished')
+        files[field] = upload.file
+    return files
+
+
+def attach_documents(admission, files):
+    """Link finished uploads to an application and point its document fields at them. Does not commit."""
+    for field, stored in files.items():
+        setattr(admission, field, document_url(stored))
+        db.session.add(AdmissionDocument(admission=admission, field=field, file=stored))
+
+
+def prune_uploads(hours):
+    """Drop uploads older than `hours` and stored files no application uses. Returns counts. Commits.
+
+    Rows go with bulk DELETEs and files only after the commit, so two
+    processes pruning at once don't trip over each other.
+    """
+    storage = get_storage()
+    cutoff = datetime.utcnow() - timedelta(hours=hours)
+    expired = db.session.query(Upload.id, Upload.status).filter(Upload.created_at < cutoff).all()
+    for start in range(0, len(expired), 1000):
+        ids = [upload.id for upload in expired[start:start + 1000]]
+        db.session.execute(db.delete(Upload).where(Upload.id.in_(ids)).execution_options(synchronize_session=False))
+
+    in_use = db.select(AdmissionDocument.file_id).union(
+        db.select(Upload.file_id).where(Upload.file_id.isnot(None)))
+    orphans = db.session.query(StoredFile.id, StoredFile.storage_key).filter(
+        StoredFile.id.not_in(in_use), StoredFile.created_at < cutoff).all()
+    for start in range(0, len(orphans), 1000):
+        ids = [stored.id for stored in orphans[start:start + 1000]]
+        db.session.execute(db.delete(StoredFile).where(StoredFile.id.in_(ids))
+                           .execution_options(synchronize_session=False))
+    db.session.commit()
+
+    for upload in expired:
+        if upload.status == 'uploading':
+            storage.delete(part_key(upload.id))
+        storage.delete(lock_key(upload.id))
+    for stored in orphans:
+        storage.delete(stored.storage_key)
+    return len(expired), len(orphans)
+
+
+class UploadPruner:
+    """A background thread running prune_uploads every UPLOAD_PRUNE_INTERVAL seconds.
+
+    Each web process runs one; the bulk deletes make overlapping runs
+    harmless. `flask prune-uploads` does the same on demand.
+    """
+
+    def __init__(self):
+        self._app = None
+        self._thread = None
+        self._stop = Event()
+        self._lock = Lock()
+
+    def init_app(self, app):
+        self._app = app
+        app.extensions['upload_pruner'] = self
+
+    def start(self):
+        with self._lock:
+            if self._thread or self._app is None or not background_workers_allowed(self._app):
+                return
+            if not self._app.config.get('UPLOAD_PRUNE_INTERVAL', 3600):
+                return
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name='upload-pruner', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread:
+            thread.join(timeout=5)
+
+    def _run(self):
+        config = self._app.config
+        while not self._stop.is_set():
+            try:
+                with self._app.app_context():
+                    uploads, files = prune_uploads(config.get('UPLOAD_EXPIRY_HOURS', 24))
+                if uploads or files:
+                    print(f"Pruned {uploads} expired uploads and {files} unused files")
+            except Exception as e:
+                print(f"Upload pruner error: {e}")
+            self._stop.wait(config.get('UPLOAD_PRUNE_INTERVAL', 3600))
+
+
+upload_pruner = UploadPruner()
@@ -0,0 +1,5 @@
+from app.asgi import create_asgi_app
+
+# Async serving mode for read-heavy traffic (see app/asgi.py):
+#     uvicorn asgi:app --host 0.0.0.0 --port $PORT --workers 2
+app = create_asgi_app()
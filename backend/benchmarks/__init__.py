@@ -0,0 +1,11 @@
+def bench_config(database_url, **overrides):
+    """Config subclass for benchmark runs: given database, no real mail, no image
+    downloads, and no background threads competing with the measured requests."""
+    from config import Config
+
+    attrs = {'SQLALCHEMY_DATABASE_URI': database_url, 'MAIL_USERNAME': None, 'MAIL_PASSWORD': None,
+             'GALLERY_WORKERS': 0, 'BACKGROUND_WORKERS_ENABLED': False, 'UPLOAD_PRUNE_INTERVAL': 0}
+    if database_url.startswith('sqlite'):
+        attrs['SQLALCHEMY_ENGINE_OPTIONS'] = {}  # SQLite rejects connect_timeout
+    attrs.update(overrides)
+    return type('BenchConfig', (Config,), attrs)
@@ -0,0 +1,226 @@
+"""Throughput and p50/p95/p99 latency for every blueprint against seeded data.
+
+Seeds a database with benchmarks.seed volumes (reused between runs if it was
+seeded at the same scale), then drives each route below through the Flask
+test client. The response cache is off unless --with-cache is given, so the
+numbers measure the handlers rather than cache hits.
+
+Baselines are JSON files in benchmarks/baselines/. They are only comparable
+on the machine and database that produced them, so save one before a change
+and compare after it (reference.json is from the default SQLite run on the
+machine that added this script, kept as an example of the format):
+    python -m benchmarks.endpoints --save before
+    python -m benchmarks.endpoints --compare before   # exit status 1 on regressions
+
+Run from backend/:
+    python -m benchmarks.endpoints --scale 0.1 --requests 50
+    python -m benchmarks.endpoints --database-url postgresql://... --only admissions
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.instrumentation import percentile
+from benchmarks import bench_config
+from benchmarks.seed import VOLUMES, seed
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+ADMIN_EMAIL = 'bench@example.com'
+ADMIN_PASSWORD = 'bench-password'
+
+ADMISSION = {
+    'applicant_name': 'Bench Applicant', 'gender': 'Female', 'date_of_birth': '2012-05-01',
+    'previous_school': 'Kakamega Primary School', 'parent_name': 'Bench Parent',
+    'parent_phone': '0712345678', 'parent_email': 'parent@example.com', 'kjsea_score': 55,
+}
+
+# name -> (method, path or fn(rng, counts) -> path, JSON body, needs admin token)
+ROUTES = {
+    'health': ('GET', '/api/health', None, False),
+    'home': ('GET', '/api/home', None, False),
+    'news_list': ('GET', '/api/news', None, False),
+    'news_list_fields': ('GET', '/api/news?fields=title,excerpt&limit=20', None, False),
+    'news_detail': ('GET', lambda rng, n: f"/api/news/{rng.randint(1, n['news'])}", None, False),
+    'events_list': ('GET', '/api/events', None, False),
+    'gallery_list': ('GET', '/api/gallery', None, False),
+    'staff_list': ('GET', '/api/staff', None, False),
+    'alumni_list': ('GET', '/api/alumni', None, False),
+    'kcse_list': ('GET', '/api/kcse', None, False),
+    'testimonials_list': ('GET', '/api/testimonials', None, False),
+    'stats_list': ('GET', '/api/stats', None, False),
+    'search': ('GET', lambda rng, n: f"/api/search?q={rng.choice(['rugby', 'science fair', 'music', 'chem'])}",
+               None, False),
+    'admissions_page': ('GET', lambda rng, n: f"/api/admissions?page={rng.randint(1, 50)}&per_page=50",
+                        None, True),
+    'admissions_summary_filtered': ('GET', '/api/admissions?view=summary&status=flagged&grade_band=ME&per_page=50',
+                                    None, True),
+    'admissions_detail': ('GET', lambda rng, n: f"/api/admissions/{rng.randint(1, n['admissions'])}", None, True),
+    'admissions_stats': ('GET', '/api/admissions/stats', None, True),
+    'admissions_duplicates': ('GET', '/api/admissions/duplicates', None, True),
+    'admissions_analytics': ('GET', '/api/admissions/analytics?score=50', None, True),
+    'admissions_allocation': ('POST', '/api/admissions/allocation',
+                              {'capacity': 400, 'gender_quotas': {'Male': 200, 'Female': 200},
+                               'default_school_quota': 40}, True),
+    'admissions_submit': ('POST', '/api/admissions', ADMISSION, False),
+    'contact_inbox': ('GET', '/api/contact', None, True),
+    'contact_inbox_unread': ('GET', '/api/contact?is_read=false&view=summary&per_page=50', None, True),
+    'contact_unread_count': ('GET', '/api/contact/unread-count', None, True),
+    'contact_submit': ('POST', '/api/contact', {'name': 'Bench', 'email': 'bench@example.com',
+                                                'message': 'Benchmark message'}, False),
+    'auth_me': ('GET', '/api/auth/me', None, True),
+    'auth_login': ('POST', '/api/auth/login', {'email': ADMIN_EMAIL, 'password': ADMIN_PASSWORD}, False),
+    'outbox_status': ('GET', '/api/outbox', None, True),
+    'perf_summary': ('GET', '/api/perf', None, True),
+}
+
+
+def prepare_database(app, scale):
+    """Seed unless the database already holds this scale's data. Returns row counts."""
+    from app import bcrypt, db
+    from app.models.admin import AdminUser
+    from app.models.news import News
+
+    expected = {table: max(1, int(volume * scale)) for table, volume in VOLUMES.items()}
+    with app.app_context():
+        db.create_all()
+        # News is never written by the routes below, so its count identifies the scale
+        if db.session.query(News.id).count() != expected['news']:
+            db.drop_all()
+            db.create_all()
+            started = time.perf_counter()
+            seed(scale)
+            print(f"Seeded at scale {scale} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        if AdminUser.query.filter_by(email=ADMIN_EMAIL).first() is None:
+            db.session.add(AdminUser(email=ADMIN_EMAIL,
+                                     password_hash=bcrypt.generate_password_hash(ADMIN_PASSWORD).decode('utf-8')))
+            db.session.commit()
+    return expected
+
+
+def run_route(app, name, token, counts, requests, concurrency, warmup):
+    method, path, body, admin = ROUTES[name]
+    headers = {'Accept-Encoding': 'gzip, br'}
+    if admin:
+        headers['Authorization'] = f'Bearer {token}'
+    rng = random.Random(name)
+
+    def call(_):
+        client = app.test_client()
+        url = path(rng, counts) if callable(path) else path
+        started = time.perf_counter()
+        response = client.open(url, method=method, json=body, headers=headers)
+        return response.status_code, time.perf_counter() - started
+
+    for i in range(warmup):
+        call(i)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(call, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for _, latency in results)
+    errors = sum(1 for status, _ in results if status >= 400)
+    return {
+        'requests': requests,
+        'errors': errors,
+        'rps': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+    }
+
+
+def compare(results, baseline, tolerance, noise_ms):
+    """Routes whose p95 grew by more than `tolerance` (and by at least noise_ms)."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline['routes'].get(name)
+        if before is None:
+            continue
+        limit = max(before['p95_ms'] * (1 + tolerance), before['p95_ms'] + noise_ms)
+        if result['p95_ms'] > limit:
+            regressions.append((name, before['p95_ms'], result['p95_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', help='Defaults to a SQLite file in the temp directory')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier on benchmarks.seed volumes')
+    parser.add_argument('--requests', type=int, default=100, help='Timed requests per route')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--only', help='Comma-separated substrings of route names to run')
+    parser.add_argument('--with-cache', action='store_true', help='Leave the response cache on')
+    parser.add_argument('--save', metavar='NAME', help='Write results to baselines/NAME.json')
+    parser.add_argument('--compare', metavar='NAME', help='Compare p95 against baselines/NAME.json')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p95 growth, as a fraction')
+    parser.add_argument('--noise-ms', type=float, default=1.0, help='Ignore p95 changes smaller than this')
+    args = parser.parse_args()
+
+    from app import create_app
+    from flask_jwt_extended import create_access_token
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.gettempdir(), 'katch-bench.db')}"
+    app = create_app(bench_config(
+        database_url,
+        RESPONSE_CACHE_ENABLED=args.with_cache,
+        BCRYPT_LOG_ROUNDS=4,  # Login is benchmarked separately in benchmarks.login_throughput
+        LOGIN_MAX_ATTEMPTS_PER_IP=10 ** 9,
+        LOGIN_MAX_FAILURES_PER_EMAIL=10 ** 9,
+        PERF_SLOW_REQUEST_MS=10 ** 9,
+    ))
+    counts = prepare_database(app, args.scale)
+    with app.app_context():
+        from app.models.admin import AdminUser
+        token = create_access_token(identity=str(AdminUser.query.filter_by(email=ADMIN_EMAIL).first().id))
+
+    names = list(ROUTES)
+    if args.only:
+        patterns = args.only.split(',')
+        names = [name for name in names if any(p in name for p in patterns)]
+
+    results = {}
+    print(f"{'route':<30} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    for name in names:
+        r = results[name] = run_route(app, name, token, counts, args.requests, args.concurrency, args.warmup)
+        print(f"{name:<30} {r['rps']:>8.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+              f"{r['errors']:>6}")
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f'{args.save}.json')
+        with open(path, 'w') as f:
+            json.dump({
+                'meta': {
+                    'database': database_url.split(':', 1)[0],
+                    'scale': args.scale,
+                    'requests': args.requests,
+                    'concurrency': args.concurrency,
+                    'cache': args.with_cache,
+                    'python': platform.python_version(),
+                    'machine': platform.machine(),
+                },
+                'routes': results,
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Saved baseline to {path}")
+
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f'{args.compare}.json')) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.noise_ms)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: p95 {before:.2f} ms -> {after:.2f} ms")
+        if regressions:
+            sys.exit(1)
+        print(f"No p95 regressions beyond {args.tolerance:.0%} against {args.compare}")
+
+
+if __name__ == '__main__':
+    main()
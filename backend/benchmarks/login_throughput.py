@@ -0,0 +1,91 @@
+"""Login throughput at different bcrypt cost factors.
+
+Seeds one admin into a throwaway SQLite database per cost factor and fires
+concurrent POST /api/auth/login requests through the Flask test client.
+Throttling is disabled so only hashing and the verifier pool are measured.
+
+Run from backend/:
+    python -m benchmarks.login_throughput --costs 4,8,10,12 --requests 40 --concurrency 8
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+
+
+def run(cost, requests, concurrency, workers, queue_depth):
+    from app import create_app, db, bcrypt
+    from app.models.admin import AdminUser
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        BCRYPT_LOG_ROUNDS = cost
+        LOGIN_HASH_WORKERS = workers
+        LOGIN_HASH_QUEUE_DEPTH = queue_depth
+        LOGIN_MAX_ATTEMPTS_PER_IP = 10 ** 9
+        LOGIN_MAX_FAILURES_PER_EMAIL = 10 ** 9
+        MAIL_USERNAME = None
+        MAIL_PASSWORD = None
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.add(AdminUser(
+            email='bench@example.com',
+            password_hash=bcrypt.generate_password_hash('bench-password', cost).decode('utf-8'),
+        ))
+        db.session.commit()
+
+    def login(_):
+        client = app.test_client()
+        started = time.perf_counter()
+        response = client.post('/api/auth/login',
+                               json={'email': 'bench@example.com', 'password': 'bench-password'})
+        return response.status_code, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(login, range(requests)))
+    elapsed = time.perf_counter() - started
+    os.remove(path)
+
+    ok = sorted(latency for status, latency in results if status == 200)
+    shed = sum(1 for status, _ in results if status == 503)
+    p95 = ok[int(len(ok) * 0.95) - 1] if ok else 0
+    return {
+        'cost': cost,
+        'ok': len(ok),
+        'shed_503': shed,
+        'logins_per_sec': len(ok) / elapsed,
+        'p50_ms': statistics.median(ok) * 1000 if ok else 0,
+        'p95_ms': p95 * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--costs', default='4,8,10,12')
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=Config.LOGIN_HASH_WORKERS)
+    parser.add_argument('--queue-depth', type=int, default=10 ** 6,
+                        help='Verifier queue depth; lower it to see load shedding')
+    args = parser.parse_args()
+
+    print(f"{'cost':>4} {'ok':>5} {'503':>5} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for cost in (int(c) for c in args.costs.split(',')):
+        r = run(cost, args.requests, args.concurrency, args.workers, args.queue_depth)
+        print(f"{r['cost']:>4} {r['ok']:>5} {r['shed_503']:>5} {r['logins_per_sec']:>9.1f} "
+              f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""Fill a database with realistic volumes of every kind of content.
+
+Rows go in with bulk INSERTs, then the search index is rebuilt. Random
+content comes from a fixed seed, so the same arguments always give the same
+data.
+
+Run from backend/:
+    python -m benchmarks.seed --database-url sqlite:////tmp/bench.db --scale 0.1
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+from benchmarks import bench_config
+
+# Row counts at --scale 1
+VOLUMES = {
+    'admissions': 50000,
+    'contact': 10000,
+    'news': 2000,
+    'gallery': 5000,
+    'events': 500,
+    'staff': 120,
+    'alumni': 300,
+    'testimonials': 200,
+    'kcse': 20,
+}
+BATCH_SIZE = 2000
+
+FIRST_NAMES = ['Brian', 'Faith', 'Kevin', 'Mercy', 'Dennis', 'Sharon', 'Collins', 'Esther', 'Victor',
+               'Joy', 'Emmanuel', 'Cynthia', 'Ian', 'Purity', 'Allan', 'Winnie', 'Felix', 'Naomi']
+LAST_NAMES = ['Otieno', 'Wanjiru', 'Kiprop', 'Achieng', 'Mwangi', 'Wafula', 'Chebet', 'Omondi',
+              'Njeri', 'Barasa', 'Kamau', 'Akinyi', 'Mutua', 'Nekesa', 'Korir', 'Wekesa']
+SCHOOLS = [f'{name} Primary School' for name in (
+    'Kakamega', 'Lurambi', 'Shinyalu', 'Malava', 'Butere', 'Mumias', 'Navakholo', 'Ikolomani',
+    'Khwisero', 'Matungu', 'Likuyani', 'Lugari', 'Bukura', 'Shianda', 'Musoli', 'Eregi')]
+CATEGORIES = ['Academics', 'Sports', 'Events', 'Music', 'Drama', 'Science', 'Community']
+WORDS = ('school students term results sports music drama science fair kakamega county national '
+         'championship rugby football athletics library laboratory prize giving parents meeting form '
+         'examination mathematics chemistry biology physics history geography debate club trip').split()
+
+
+def sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def name(rng):
+    return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+
+
+def timestamps(rng, count, days=3 * 365):
+    """`count` ascending datetimes spread over the last `days` days."""
+    now = datetime.utcnow()
+    return sorted(now - timedelta(seconds=rng.uniform(0, days * 86400)) for _ in range(count))
+
+
+def _insert(model, rows):
+    from app import db
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(db.insert(model), rows[start:start + BATCH_SIZE])
+
+
+def _admissions(rng, count):
+    numbers = {}
+    rows = []
+    for created_at in timestamps(rng, count):
+        numbers[created_at.year] = numbers.get(created_at.year, 0) + 1
+        score = round(min(72, max(0, rng.gauss(42, 12))), 1)
+        status = rng.choices(['pending', 'flagged', 'accepted', 'rejected'], [4, 2, 3, 2])[0]
+        rows.append({
+            'application_number': f'KS-{created_at.year}-{numbers[created_at.year]:04d}',
+            'applicant_name': name(rng),
+            'gender': rng.choice(['Male', 'Female']),
+            'date_of_birth': f'{rng.randint(2010, 2013)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+            'nationality': 'Kenyan',
+            'previous_school': rng.choice(SCHOOLS),
+            'parent_name': name(rng),
+            'parent_relationship': rng.choice(['Father', 'Mother', 'Guardian']),
+            'parent_phone': f'07{rng.randint(10000000, 99999999)}',
+            'parent_email': f'parent{len(rows)}@example.com',
+            'kjsea_score': score,
+            'kjsea_result_url': f'https://res.cloudinary.com/demo/raw/upload/results/{len(rows)}.pdf',
+            'birth_cert_url': f'https://res.cloudinary.com/demo/raw/upload/birth/{len(rows)}.pdf',
+            'passport_photo_url': f'https://res.cloudinary.com/demo/image/upload/photos/{len(rows)}.jpg',
+            'school_leaving_cert_url': '',
+            'medical_report_url': '',
+            'status': status,
+            'is_flagged': score >= 50,
+            'admin_notes': sentence(rng) if status in ('accepted', 'rejected') else None,
+            'created_at': created_at,
+        })
+    return rows
+
+
+def seed(scale=1.0, seed=42):
+    """Insert VOLUMES * scale rows per table. Needs an app context; commits."""
+    from app import db
+    from app.models.admission import Admission
+    from app.models.alumni import Alumni
+    from app.models.contact import ContactSubmission
+    from app.models.events import Event
+    from app.models.gallery import Gallery
+    from app.models.kcse_results import KcseResult
+    from app.models.news import News
+    from app.models.school_stats import SchoolStat
+    from app.models.staff import Staff
+    from app.models.testimonials import Testimonial
+    from app.search import reindex_all
+
+    rng = random.Random(seed)
+    counts = {table: max(1, int(volume * scale)) for table, volume in VOLUMES.items()}
+
+    _insert(Admission, _admissions(rng, counts['admissions']))
+    _insert(ContactSubmission, [{
+        'name': name(rng), 'email': f'visitor{i}@example.com', 'phone': f'07{rng.randint(10000000, 99999999)}',
+        'subject': sentence(rng, 4), 'message': sentence(rng, 40), 'is_read': rng.random() < 0.7,
+        'created_at': created_at,
+    } for i, created_at in enumerate(timestamps(rng, counts['contact']))])
+    _insert(News, [{
+        'title': sentence(rng, 6), 'excerpt': sentence(rng, 25), 'content': ' '.join(sentence(rng) for _ in range(30)),
+        'category': rng.choice(CATEGORIES), 'created_at': created_at,
+    } for created_at in timestamps(rng, counts['news'])])
+    _insert(Gallery, [{
+        'image_url': f'https://res.cloudinary.com/demo/image/upload/gallery/{i}.jpg',
+        'title': sentence(rng, 5), 'category': rng.choice(CATEGORIES), 'created_at': created_at,
+    } for i, created_at in enumerate(timestamps(rng, counts['gallery']))])
+    _insert(Event, [{
+        'title': sentence(rng, 5), 'date': created_at.strftime('%B %d, %Y'),
+        'description': ' '.join(sentence(rng) for _ in range(5)), 'created_at': created_at,
+    } for created_at in timestamps(rng, counts['events'])])
+    _insert(Staff, [{
+        'name': name(rng), 'photo_url': f'https://res.cloudinary.com/demo/image/upload/staff/{i}.jpg',
+        'subject': rng.choice(['Mathematics', 'English', 'Kiswahili', 'Chemistry', 'Biology', 'History']),
+        'email': f'staff{i}@example.com', 'phone': f'07{rng.randint(10000000, 99999999)}',
+        'role': 'Teacher', 'is_leadership': i < 5,
+    } for i in range(counts['staff'])])
+    _insert(Alumni, [{
+        'name': name(rng), 'achievement': sentence(rng, 4), 'description': sentence(rng, 40),
+    } for _ in range(counts['alumni'])])
+    _insert(Testimonial, [{
+        'student_name': name(rng), 'year': f'Class of {rng.randint(2000, 2025)}', 'quote': sentence(rng, 30),
+    } for _ in range(counts['testimonials'])])
+    _insert(KcseResult, [{
+        'year': str(2025 - i), 'mean_grade': rng.choice(['A-', 'B+', 'B', 'B+']),
+        'university_entry_percentage': f'{rng.randint(70, 98)}%',
+    } for i in range(counts['kcse'])])
+    _insert(SchoolStat, [{'stat_key': key, 'stat_value': value, 'stat_label': label, 'stat_category': 'general'}
+                         for key, value, label in [('students', '2100', 'Students Enrolled'),
+                                                   ('teachers', '120', 'Teachers'),
+                                                   ('clubs', '35', 'Clubs and Societies'),
+                                                   ('founded', '1932', 'Year Founded')]])
+    reindex_all()
+    db.session.commit()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier on the default volumes')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url', required=True)
+    args = parser.parse_args()
+
+    from app import create_app, db
+    with create_app(bench_config(args.database_url)).app_context():
+        db.create_all()
+        for table, count in seed(args.scale, args.seed).items():
+            print(f'{table:<14} {count:>7}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Cold-start timings: imports, create_app(), first requests and DB readiness.
+
+Each run is a fresh interpreter, as on a scale-to-zero host. Uses a
+throwaway SQLite database unless --database-url is given; pass
+--auto-create to time the old boot path that ran db.create_all().
+
+Run from backend/:
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --database-url postgresql://... --auto-create
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import bench_config
+
+STAGES = ('process_ms', 'import_ms', 'create_app_ms', 'first_health_ms', 'first_db_request_ms', 'ready_ms')
+
+
+def child(database_url, auto_create):
+    """Boot the app once and print stage timings (ms since this function started) as JSON."""
+    started = time.perf_counter()
+    elapsed = lambda: round((time.perf_counter() - started) * 1000, 1)
+
+    from app import create_app
+    from app.readiness import readiness
+    timings = {'import_ms': elapsed()}
+
+    app = create_app(bench_config(database_url, AUTO_CREATE_TABLES=auto_create))
+    timings['create_app_ms'] = elapsed()
+
+    client = app.test_client()
+    client.get('/api/health')
+    timings['first_health_ms'] = elapsed()
+    client.get('/api/news')
+    timings['first_db_request_ms'] = elapsed()
+
+    while not readiness.ready and time.perf_counter() - started < 60:
+        time.sleep(0.002)
+    timings['ready_ms'] = elapsed()
+    print(json.dumps(timings))
+
+
+def run_once(database_url, auto_create):
+    args = [sys.executable, '-m', 'benchmarks.startup', '--child', '--database-url', database_url]
+    if auto_create:
+        args.append('--auto-create')
+    started = time.perf_counter()
+    output = subprocess.run(args, check=True, capture_output=True, text=True).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings['process_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--database-url', help='Defaults to a throwaway SQLite file')
+    parser.add_argument('--auto-create', action='store_true', help='Run db.create_all() during boot')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.database_url, args.auto_create)
+
+    path = None
+    database_url = args.database_url
+    if database_url is None:
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        database_url = f"sqlite:///{path}"
+    if not args.auto_create:
+        # Same as `flask --app run create-tables` at release time
+        from app import create_app, db
+        with create_app(bench_config(database_url)).app_context():
+            db.create_all()
+
+    try:
+        runs = [run_once(database_url, args.auto_create) for _ in range(args.runs)]
+    finally:
+        if path:
+            os.remove(path)
+
+    print(f"{'stage':<20} {'median':>8} {'min':>8} {'max':>8}   (cumulative ms, {len(runs)} runs)")
+    for stage in STAGES:
+        values = [r[stage] for r in runs]
+        print(f"{stage:<20} {statistics.median(values):>8.1f} {min(values):>8.1f} {max(values):>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
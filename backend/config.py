@@ -20,9 +20,32 @@ class Config:
         "connect_args": {"connect_timeout": 10},  # fail fast if DB is unreachable
     }
     
+    # Tables are created by `flask --app run create-tables` at release time;
+    # set this only for local development against a throwaway database
+    AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "false").lower() == "true"
+    
+    # Connections opened in the background at boot so the first requests
+    # don't pay for the DB handshake (see app/readiness.py)
+    DB_WARM_CONNECTIONS = int(os.getenv("DB_WARM_CONNECTIONS", "2"))
+    
     # JWT secret key and token expiry set to 24 hours
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "jwt-secret-key")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    ADMIN_IDENTITY_TTL = int(os.getenv("ADMIN_IDENTITY_TTL", "300"))  # Seconds to cache the admin behind a token
+    
+    # bcrypt cost for admin passwords; existing hashes are upgraded on next login
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", "12"))
+    
+    # Login protection (see app/login_guard.py)
+    LOGIN_HASH_WORKERS = int(os.getenv("LOGIN_HASH_WORKERS", "2"))  # Threads running bcrypt
+    LOGIN_HASH_QUEUE_DEPTH = int(os.getenv("LOGIN_HASH_QUEUE_DEPTH", "8"))  # Checks running or waiting before 503
+    LOGIN_THROTTLE_WINDOW = int(os.getenv("LOGIN_THROTTLE_WINDOW", "900"))  # Sliding window in seconds
+    LOGIN_MAX_ATTEMPTS_PER_IP = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_IP", "20"))
+    LOGIN_MAX_FAILURES_PER_EMAIL = int(os.getenv("LOGIN_MAX_FAILURES_PER_EMAIL", "5"))
+    LOGIN_THROTTLE_BACKEND = os.getenv("LOGIN_THROTTLE_BACKEND")  # "module:Class"; in-memory if unset. Uploads use it too
+    
+    # Number of proxies in front of the app (Render adds one) for client IPs and scheme
+    PROXY_COUNT = int(os.getenv("PROXY_COUNT", "1"))
     
     # Email settings for contact form notifications
     MAIL_SERVER = "smtp.gmail.com"
@@ -32,5 +55,107 @@ class Config:
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_USERNAME")  # Use same Gmail as sender
     
+    # Start the outbox and gallery workers in this process. `flask` commands
+    # never start them; turn this off for web processes that should only serve
+    BACKGROUND_WORKERS_ENABLED = os.getenv("BACKGROUND_WORKERS_ENABLED", "true").lower() == "true"
+    
+    # Outbox workers (see app/outbox.py): each keeps one SMTP connection per batch
+    MAIL_WORKERS = int(os.getenv("MAIL_WORKERS", "2"))
+    MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "20"))
+    MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "5"))
+    MAIL_RETRY_BACKOFF = int(os.getenv("MAIL_RETRY_BACKOFF", "30"))  # Seconds, doubled per attempt
+    MAIL_POLL_INTERVAL = int(os.getenv("MAIL_POLL_INTERVAL", "30"))  # Seconds between idle polls
+    MAIL_CLAIM_TIMEOUT = int(os.getenv("MAIL_CLAIM_TIMEOUT", "300"))  # Seconds before a stuck send is retried
+    
+    # In-memory cache for public GET responses (see app/cache.py)
+    # TTL bounds staleness when several workers each hold their own copy;
+    # beyond MAX_ENTRIES the least recently used responses are dropped
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+    
+    # gzip/brotli for JSON responses at least this many bytes (see app/compression.py)
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    
+    # Per-request timings (see app/instrumentation.py): Server-Timing header,
+    # percentiles over the last PERF_WINDOW requests per endpoint, and a log of
+    # slow requests or ones that look like N+1 query loops. Server-Timing goes to
+    # admin requests only unless PERF_SERVER_TIMING sends it to every client
+    PERF_TIMING_ENABLED = os.getenv("PERF_TIMING_ENABLED", "true").lower() == "true"
+    PERF_SERVER_TIMING = os.getenv("PERF_SERVER_TIMING", "false").lower() == "true"
+    PERF_WINDOW = int(os.getenv("PERF_WINDOW", "500"))
+    PERF_SLOW_REQUEST_MS = int(os.getenv("PERF_SLOW_REQUEST_MS", "500"))
+    PERF_MAX_QUERIES = int(os.getenv("PERF_MAX_QUERIES", "20"))  # More statements than this is logged
+    PERF_REPEATED_STATEMENTS = int(os.getenv("PERF_REPEATED_STATEMENTS", "10"))  # Same SQL this often is logged
+    PERF_SLOW_LOG_SIZE = int(os.getenv("PERF_SLOW_LOG_SIZE", "100"))
+    
+    # Page size for keyset-paginated list endpoints (see app/pagination.py)
+    PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+    PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "100"))
+    
+    # Items per list in the /api/home landing page bundle
+    HOME_ITEMS_DEFAULT = int(os.getenv("HOME_ITEMS_DEFAULT", "6"))
+    
+    # Keep running admission totals in admission_counters instead of
+    # aggregating the admissions table on every stats request
+    ADMISSION_COUNTERS_ENABLED = os.getenv("ADMISSION_COUNTERS_ENABLED", "false").lower() == "true"
+    
+    # Rows per INSERT/COPY and commit in bulk admission imports (see app/admission_import.py)
+    ADMISSION_IMPORT_BATCH_SIZE = int(os.getenv("ADMISSION_IMPORT_BATCH_SIZE", "1000"))
+    
+    # Most applications one PUT /api/admissions/bulk-status may change (and email)
+    BULK_STATUS_MAX = int(os.getenv("BULK_STATUS_MAX", "1000"))
+    
+    # What submit_admission does with a likely repeat of an application from
+    # this intake year (see app/duplicates.py): "link" saves it pointing at the
+    # first one for an admin to merge, "reject" answers 409, "off" skips the check
+    DUPLICATE_POLICY = os.getenv("DUPLICATE_POLICY", "link")
+    
+    # /api/changes feed (see app/changes.py): entries younger than the settle
+    # time are held back so slow transactions are not skipped; history older
+    # than the retention is removed by `flask prune-changes`
+    CHANGE_FEED_SETTLE_SECONDS = int(os.getenv("CHANGE_FEED_SETTLE_SECONDS", "2"))
+    CHANGE_LOG_RETENTION_DAYS = int(os.getenv("CHANGE_LOG_RETENTION_DAYS", "30"))
+    
+    # File storage (see app/storage.py). MEDIA_URL is the public base URL of
+    # stored files; set it in production, otherwise URLs are relative paths
+    # under this API's own /media route
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+    MEDIA_ROOT = os.getenv("MEDIA_ROOT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "media"))
+    MEDIA_URL = os.getenv("MEDIA_URL")
+    
+    # Gallery derivative pipeline (see app/gallery_pipeline.py): widths of the
+    # resized WebP/JPEG copies, encoder quality and worker threads.
+    # GALLERY_SOURCE_DIR reads originals from a local directory instead of
+    # downloading them (development stand-in for Cloudinary)
+    GALLERY_WIDTHS = os.getenv("GALLERY_WIDTHS", "320,640,960,1280")
+    GALLERY_WEBP_QUALITY = int(os.getenv("GALLERY_WEBP_QUALITY", "78"))
+    GALLERY_JPEG_QUALITY = int(os.getenv("GALLERY_JPEG_QUALITY", "80"))
+    GALLERY_WORKERS = int(os.getenv("GALLERY_WORKERS", "1"))
+    GALLERY_POLL_INTERVAL = int(os.getenv("GALLERY_POLL_INTERVAL", "60"))  # Seconds between checks when idle
+    GALLERY_CLAIM_TIMEOUT = int(os.getenv("GALLERY_CLAIM_TIMEOUT", "600"))  # Retry images claimed this long ago
+    GALLERY_FETCH_TIMEOUT = int(os.getenv("GALLERY_FETCH_TIMEOUT", "15"))
+    GALLERY_MAX_SOURCE_BYTES = int(os.getenv("GALLERY_MAX_SOURCE_BYTES", str(20 * 1024 * 1024)))
+    GALLERY_SOURCE_DIR = os.getenv("GALLERY_SOURCE_DIR")
+    
+    # Resumable admission document uploads (see app/uploads.py): largest file,
+    # chunk size suggested to the browser, accepted types, and how long an
+    # unfinished upload is kept. Each web process prunes expired uploads every
+    # UPLOAD_PRUNE_INTERVAL seconds (0 leaves it to `flask prune-uploads`)
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+    UPLOAD_CONTENT_TYPES = os.getenv("UPLOAD_CONTENT_TYPES", "application/pdf,image/jpeg,image/png,image/webp")
+    UPLOAD_EXPIRY_HOURS = int(os.getenv("UPLOAD_EXPIRY_HOURS", "24"))
+    UPLOAD_PRUNE_INTERVAL = int(os.getenv("UPLOAD_PRUNE_INTERVAL", "3600"))
+    UPLOAD_THROTTLE_WINDOW = int(os.getenv("UPLOAD_THROTTLE_WINDOW", "3600"))  # Sliding window in seconds
+    UPLOAD_MAX_PER_IP = int(os.getenv("UPLOAD_MAX_PER_IP", "30"))  # Uploads one IP may start per window
+    
+    # Async serving mode (asgi.py, see app/asgi.py): connections in the async
+    # driver's pool for public reads, and threads running the Flask app for
+    # every other request
+    ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "10"))
+    ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "10"))
+    
     # Frontend URL for CORS
     FRONTEND_URL = os.getenv("FRONTEND_URL")
\ No newline at end of file
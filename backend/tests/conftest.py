@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import bcrypt, create_app, db  # noqa: E402
+from app.cache import response_cache  # noqa: E402
+from config import Config  # noqa: E402
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build the app on a fresh database, with config overrides as keyword arguments.
+
+    TEST_DATABASE_URL (Postgres) if set, else a SQLite file rather than
+    :memory: so every thread gets a real connection of its own.
+    """
+    url = os.getenv('TEST_DATABASE_URL') or f"sqlite:///{tmp_path / 'test.db'}"
+    apps = []
+    response_cache.clear()  # Module-level, so entries would outlive the previous test's app
+
+    def make(**overrides):
+        settings = {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': url.replace('postgres://', 'postgresql://', 1),
+            'SQLALCHEMY_ENGINE_OPTIONS': {} if url.startswith('sqlite') else Config.SQLALCHEMY_ENGINE_OPTIONS,
+            'AUTO_CREATE_TABLES': True,
+            'MEDIA_ROOT': str(tmp_path / 'media'),
+            'PROXY_COUNT': 0,
+            'JWT_SECRET_KEY': 'test-jwt-secret-at-least-32-bytes-long',
+            **overrides,
+        }
+        app = create_app(type('TestConfig', (Config,), settings))
+        apps.append(app)
+        return app
+
+    yield make
+    for app in apps[:1]:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def admin_headers(app):
+    """Authorization header for an admin account on `app`."""
+    from flask_jwt_extended import create_access_token
+    from app.models.admin import AdminUser
+
+    with app.app_context():
+        admin = AdminUser(email='admin@example.com', password_hash=bcrypt.generate_password_hash('secret').decode())
+        db.session.add(admin)
+        db.session.commit()
+        return {'Authorization': f'Bearer {create_access_token(identity=str(admin.id))}'}
@@ -0,0 +1,31 @@
+from app import db
+from app.models.admission import Admission
+
+SCHOOLS = ['St. Mary 100% Academy', 'St. Mary 1000 Academy', 'Kakamega_Primary', 'Kakamega-Primary']
+
+
+def _seed(app):
+    with app.app_context():
+        db.session.add_all([
+            Admission(application_number=f'KS-2026-{i:04d}', applicant_name=f'Applicant {i}', gender='Male',
+                      date_of_birth='2012-01-01', previous_school=school, parent_name='Parent',
+                      parent_phone=f'07000000{i:02d}', parent_email=f'parent{i}@example.com', kjsea_score=40 + i)
+            for i, school in enumerate(SCHOOLS)
+        ])
+        db.session.commit()
+
+
+def _schools(client, headers, term):
+    response = client.get('/api/admissions/', query_string={'previous_school': term, 'sort': 'kjsea_score'},
+                          headers=headers)
+    assert response.status_code == 200
+    return [a['previous_school'] for a in response.get_json()]
+
+
+def test_previous_school_search_treats_wildcards_literally(app, admin_headers):
+    _seed(app)
+    client = app.test_client()
+
+    assert _schools(client, admin_headers, '100%') == ['St. Mary 100% Academy']
+    assert _schools(client, admin_headers, 'kakamega_') == ['Kakamega_Primary']
+    assert _schools(client, admin_headers, 'ST. MARY') == SCHOOLS[:2]
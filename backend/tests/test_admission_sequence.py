@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Barrier
+
+from app import db
+from app.models.admission import Admission
+from app.models.admission_sequence import AdmissionSequence
+
+SUBMISSIONS = 40
+
+
+def _application(i):
+    return {
+        'applicant_name': f'Applicant {chr(97 + i % 26)}{chr(97 + i // 26)}',
+        'gender': 'Female',
+        'date_of_birth': '2012-01-01',
+        'previous_school': 'Kakamega Primary',
+        'parent_name': 'Parent',
+        'parent_phone': f'07000000{i:02d}',
+        'parent_email': f'parent{i}@example.com',
+        'kjsea_score': 40,
+    }
+
+
+def test_concurrent_submissions_get_distinct_numbers(app):
+    # Every thread submits at once, starting with no counter row for the year,
+    # so they also race to create it
+    start = Barrier(SUBMISSIONS)
+
+    def submit(i):
+        client = app.test_client()
+        start.wait()
+        return client.post('/api/admissions/', json=_application(i))
+
+    with ThreadPoolExecutor(SUBMISSIONS) as pool:
+        responses = list(pool.map(submit, range(SUBMISSIONS)))
+
+    assert [r.status_code for r in responses] == [201] * SUBMISSIONS
+    numbers = [r.get_json()['application_number'] for r in responses]
+    assert len(set(numbers)) == SUBMISSIONS
+
+    year = datetime.utcnow().year
+    assert sorted(numbers) == [f'KS-{year}-{n:04d}' for n in range(1, SUBMISSIONS + 1)]
+    with app.app_context():
+        stored = [number for (number,) in db.session.query(Admission.application_number)]
+        assert sorted(stored) == sorted(numbers)
+        assert db.session.get(AdmissionSequence, year).last_value == SUBMISSIONS
+
+
+def test_counter_continues_after_numbers_already_issued(app):
+    year = datetime.utcnow().year
+    with app.app_context():
+        db.session.add(Admission(application_number=f'KS-{year}-0007', **_application(0)))
+        db.session.commit()
+
+    response = app.test_client().post('/api/admissions/', json=_application(1))
+    assert response.status_code == 201
+    assert response.get_json()['application_number'] == f'KS-{year}-0008'
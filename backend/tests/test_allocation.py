@@ -0,0 +1,79 @@
+import random
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.allocation import AllocationRequest, _Pool, allocate, normalize
+
+Row = namedtuple('Row', 'id application_number applicant_name gender previous_school kjsea_score status created_at')
+
+
+def _rank_order(rows):
+    # Same order as _load_pool: score descending, earlier application first (no date last), then id
+    return sorted(rows, key=lambda r: (-r.kjsea_score, r.created_at is None, r.created_at or datetime.min, r.id))
+
+
+def _sequential(pool, params):
+    """One applicant at a time in rank order: through if both quotas still have room,
+    then the first `capacity` of those get seats. Reasons name the quota that
+    stopped an applicant, so a waitlisted applicant only shows capacity if more
+    seats alone would have taken them."""
+    genders, schools, taken, accepted, reasons = Counter(), Counter(), 0, [], []
+    for row in pool.rows:
+        gender, school = normalize(row.gender), normalize(row.previous_school)
+        school_cap = params.school_quotas.get(school, params.default_school_quota)
+        gender_full = gender in params.gender_quotas and genders[gender] >= params.gender_quotas[gender]
+        school_full = school_cap is not None and schools[school] >= school_cap
+        if gender_full or school_full:
+            accepted.append(False)
+            reasons.append('school_quota' if school_full else 'gender_quota')
+            continue
+        genders[gender] += 1
+        schools[school] += 1
+        taken += 1
+        accepted.append(taken <= params.capacity)
+        reasons.append('accepted' if taken <= params.capacity else 'capacity')
+    return accepted, reasons
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_allocate_matches_sequential_reference(seed):
+    rng = random.Random(seed)
+    size = rng.randint(0, 200)
+    schools = [f'School {i}' for i in range(rng.randint(1, 12))]
+    start = datetime(2026, 1, 1)
+    rows = [
+        # Few distinct scores and submission times, so ties are common; names vary in case and spacing
+        Row(i + 1, f'KS-2026-{i + 1:04d}', f'Applicant {i}', rng.choice(['Male', 'female ', 'FEMALE']),
+            rng.choice(schools) + rng.choice(['', ' ']), float(rng.randint(30, 40)), 'pending',
+            rng.choice([None, start + timedelta(seconds=rng.randint(0, 50))]))
+        for i in range(size)
+    ]
+    pool = _Pool(_rank_order(rows))
+    params = AllocationRequest({
+        'capacity': rng.randint(0, size + 5),  # Often cuts the list short of what the quotas allow
+        'gender_quotas': rng.choice([{}, {'Male': rng.randint(0, size)},
+                                     {'female': rng.randint(0, size), 'MALE': rng.randint(0, size)}]),
+        'school_quotas': {rng.choice(schools): rng.randint(0, 10)} if rng.random() < 0.7 else {},
+        'default_school_quota': rng.choice([None, rng.randint(0, 20)]),
+    })
+
+    accepted, reasons = allocate(pool, params)
+    expected_accepted, expected_reasons = _sequential(pool, params)
+
+    assert accepted.tolist() == expected_accepted
+    assert reasons.tolist() == expected_reasons
+
+
+def test_tied_scores_share_a_rank_and_keep_submission_order():
+    rows = [
+        Row(1, '', '', 'Male', 'A', 50.0, 'pending', datetime(2026, 1, 2)),
+        Row(2, '', '', 'Male', 'A', 50.0, 'pending', datetime(2026, 1, 1)),
+        Row(3, '', '', 'Male', 'A', 60.0, 'pending', None),
+        Row(4, '', '', 'Male', 'A', 50.0, 'pending', None),
+    ]
+    pool = _Pool(_rank_order(rows))
+
+    assert [row.id for row in pool.rows] == [3, 2, 1, 4]
+    assert pool.ranks.tolist() == [1, 2, 2, 2]
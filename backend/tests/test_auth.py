@@ -0,0 +1,36 @@
+import pytest
+
+from app import db
+from app.models.admin import AdminUser
+
+
+@pytest.mark.parametrize('body', [
+    {'password': 'secret'},
+    {'email': 123, 'password': 'secret'},
+    {'email': ['admin@example.com'], 'password': 'secret'},
+    {'email': '   ', 'password': 'secret'},
+    {'email': 'admin@example.com', 'password': 5},
+    ['admin@example.com', 'secret'],
+])
+def test_login_rejects_malformed_credentials(app, body):
+    response = app.test_client().post('/api/auth/login', json=body)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Email and password are required'}
+
+
+def test_login_with_valid_credentials(app, admin_headers):
+    response = app.test_client().post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'secret'})
+    assert response.status_code == 200
+    assert response.get_json()['admin']['email'] == 'admin@example.com'
+
+
+def test_me_for_a_deleted_admin_is_404(app, admin_headers):
+    client = app.test_client()
+    assert client.get('/api/auth/me', headers=admin_headers).status_code == 200
+    with app.app_context():
+        db.session.delete(AdminUser.query.one())
+        db.session.commit()
+
+    response = client.get('/api/auth/me', headers=admin_headers)
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Admin not found'}
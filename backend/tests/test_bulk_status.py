@@ -0,0 +1,67 @@
+import pytest
+
+from app import db
+from app.models.admission import Admission
+from app.models.admission_counter import AdmissionCounter
+from app.models.outbox import OutboxEmail
+
+
+@pytest.fixture
+def app(make_app, monkeypatch):
+    # The routes read the mail credentials from the environment when they queue emails
+    monkeypatch.setenv('MAIL_USERNAME', 'school@example.com')
+    monkeypatch.setenv('MAIL_PASSWORD', 'secret')
+    return make_app(ADMISSION_COUNTERS_ENABLED=True, BULK_STATUS_MAX=5, BACKGROUND_WORKERS_ENABLED=False)
+
+
+def _seed(app, statuses):
+    with app.app_context():
+        admissions = [
+            Admission(application_number=f'KS-2026-{i:04d}', applicant_name=f'Applicant {i}', gender='Female',
+                      date_of_birth='2012-01-01', previous_school='Kakamega Primary', parent_name='Parent',
+                      parent_phone=f'07000000{i:02d}', parent_email=f'parent{i}@example.com',
+                      kjsea_score=60, status=status)
+            for i, status in enumerate(statuses)
+        ]
+        db.session.add_all(admissions)
+        db.session.flush()
+        AdmissionCounter.rebuild()
+        db.session.commit()
+        return [a.id for a in admissions]
+
+
+def _status_counts(app):
+    with app.app_context():
+        return AdmissionCounter.read()['status']
+
+
+def test_bulk_accept_updates_statuses_counters_and_outbox(app, admin_headers):
+    ids = _seed(app, ['pending', 'pending', 'flagged', 'accepted', 'pending'])
+    before = _status_counts(app)
+
+    response = app.test_client().put('/api/admissions/bulk-status', headers=admin_headers,
+                                     json={'status': 'accepted', 'ids': ids[:4], 'admin_notes': 'Welcome'})
+
+    assert response.status_code == 200
+    assert response.get_json() == {'updated': 4, 'ids': ids[:4], 'status': 'accepted'}
+    with app.app_context():
+        assert [db.session.get(Admission, i).status for i in ids] == ['accepted'] * 4 + ['pending']
+        # One decision email per applicant whose status changed; ids[3] was already accepted
+        assert sorted(e.recipients for e in OutboxEmail.query) == [
+            'parent0@example.com', 'parent1@example.com', 'parent2@example.com']
+
+    after = _status_counts(app)
+    deltas = {status: after[status] - before[status] for status in after}
+    assert deltas == {'pending': -2, 'flagged': -1, 'accepted': 3, 'rejected': 0}
+
+
+def test_bulk_status_refuses_more_than_max_ids(app, admin_headers):
+    ids = _seed(app, ['pending'] * 6)
+
+    response = app.test_client().put('/api/admissions/bulk-status', headers=admin_headers,
+                                     json={'status': 'accepted', 'ids': ids})
+
+    assert response.status_code == 400
+    with app.app_context():
+        assert {a.status for a in Admission.query} == {'pending'}
+        assert OutboxEmail.query.count() == 0
@@ -0,0 +1,55 @@
+import pytest
+
+from app.cache import response_cache
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _news(client, headers, title):
+    response = client.post('/api/news/', json={'title': title, 'excerpt': 'Excerpt'}, headers=headers)
+    assert response.status_code == 201
+
+
+def test_matching_etag_gets_304(client):
+    first = client.get('/api/news/')
+    assert first.status_code == 200 and first.headers['ETag']
+
+    again = client.get('/api/news/', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.get_data() == b''
+
+
+def test_unread_and_reordered_params_share_one_entry(client):
+    client.get('/api/news/?limit=5&fields=title')
+    client.get('/api/news/?fields=title&limit=5')
+    client.get('/api/news/?limit=5&fields=title&_=123&utm_source=x')
+    client.get('/api/news?fields=title&limit=5')
+    assert len(response_cache) == 1
+
+    client.get('/api/news/?limit=6&fields=title')
+    assert len(response_cache) == 2
+
+
+def test_entries_are_evicted_past_max_entries(make_app):
+    client = make_app(RESPONSE_CACHE_MAX_ENTRIES=3).test_client()
+    for limit in range(1, 6):
+        assert client.get(f'/api/news/?limit={limit}').status_code == 200
+    assert len(response_cache) == 3
+
+    # Least recently used go first: limit=1 and limit=2 were evicted
+    keys = list(response_cache._entries)
+    assert keys == ['/api/news?limit=3', '/api/news?limit=4', '/api/news?limit=5']
+
+
+def test_admin_write_clears_public_list(client, admin_headers):
+    _news(client, admin_headers, 'First')
+    before = client.get('/api/news/')
+    assert [item['title'] for item in before.get_json()] == ['First']
+
+    _news(client, admin_headers, 'Second')
+    after = client.get('/api/news/', headers={'If-None-Match': before.headers['ETag']})
+    assert after.status_code == 200
+    assert [item['title'] for item in after.get_json()] == ['Second', 'First']
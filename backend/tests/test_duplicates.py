@@ -0,0 +1,74 @@
+from app import db
+from app.models.admission import Admission
+from app.models.admission_document import AdmissionDocument
+
+
+def _application(name, date_of_birth='2012-03-04', phone='0711000000', email='parent@example.com', **extra):
+    return {
+        'applicant_name': name,
+        'gender': 'Male',
+        'date_of_birth': date_of_birth,
+        'previous_school': 'Kakamega Primary',
+        'parent_name': 'Parent',
+        'parent_phone': phone,
+        'parent_email': email,
+        'kjsea_score': 45,
+        **extra,
+    }
+
+
+def _submit(client, application):
+    response = client.post('/api/admissions/', json=application)
+    assert response.status_code == 201
+    return response.get_json()['application_number']
+
+
+def _admission(app, number):
+    with app.app_context():
+        return Admission.query.filter_by(application_number=number).one()
+
+
+def test_same_child_is_linked_despite_other_contacts(app):
+    client = app.test_client()
+    first = _submit(client, _application('Brian Otieno'))
+    again = _submit(client, _application('brian  OTIENO', phone='0722000000', email='other@example.com'))
+
+    assert _admission(app, again).duplicate_of_id == _admission(app, first).id
+
+
+def test_twins_sharing_contacts_are_not_linked(app):
+    client = app.test_client()
+    _submit(client, _application('Brian Otieno'))
+    twin = _submit(client, _application('Brenda Otieno'))
+
+    assert _admission(app, twin).duplicate_of_id is None
+
+
+def test_siblings_sharing_contacts_are_not_linked(app):
+    client = app.test_client()
+    _submit(client, _application('Brian Otieno'))
+    sibling = _submit(client, _application('Kevin Otieno', date_of_birth='2013-09-10'))
+
+    assert _admission(app, sibling).duplicate_of_id is None
+
+
+def test_merge_moves_documents_the_primary_lacks(app, admin_headers):
+    client = app.test_client()
+    body = b'%PDF-1.4 birth certificate'
+    upload_id = client.post('/api/uploads/', json={'filename': 'cert.pdf', 'content_type': 'application/pdf',
+                                                   'size': len(body)}).get_json()['id']
+    assert client.put(f'/api/uploads/{upload_id}?offset=0', data=body).status_code == 200
+
+    primary = _submit(client, _application('Brian Otieno'))
+    duplicate = _submit(client, _application('Brian Otieno', uploads={'birth_cert_url': upload_id}))
+    primary_id, duplicate_id = _admission(app, primary).id, _admission(app, duplicate).id
+
+    response = client.post(f'/api/admissions/{primary_id}/merge', headers=admin_headers)
+    assert response.status_code == 200
+    assert response.get_json() == {'merged': [duplicate]}
+
+    with app.app_context():
+        assert db.session.get(Admission, duplicate_id) is None
+        assert db.session.get(Admission, primary_id).birth_cert_url
+        document = AdmissionDocument.query.one()
+        assert (document.admission_id, document.field) == (primary_id, 'birth_cert_url')
@@ -0,0 +1,24 @@
+ORIGIN = {'Origin': 'https://katch-jade.vercel.app'}
+
+
+def test_server_timing_only_for_admins(app, admin_headers):
+    client = app.test_client()
+
+    public = client.get('/api/news/', headers=ORIGIN)
+    assert 'Server-Timing' not in public.headers
+    assert 'Timing-Allow-Origin' not in public.headers
+    assert 'Server-Timing' not in public.headers['Access-Control-Expose-Headers']
+
+    bad_token = client.get('/api/news/', headers={**ORIGIN, 'Authorization': 'Bearer not-a-token'})
+    assert 'Server-Timing' not in bad_token.headers
+
+    admin = client.get('/api/news/', headers={**ORIGIN, **admin_headers})
+    assert admin.headers['Server-Timing'].startswith('db;')
+    assert admin.headers['Timing-Allow-Origin'] == ORIGIN['Origin']
+    assert 'Server-Timing' in admin.headers['Access-Control-Expose-Headers']
+
+
+def test_server_timing_for_everyone_when_configured(make_app):
+    response = make_app(PERF_SERVER_TIMING=True).test_client().get('/api/news/', headers=ORIGIN)
+    assert 'Server-Timing' in response.headers
+    assert 'Server-Timing' in response.headers['Access-Control-Expose-Headers']
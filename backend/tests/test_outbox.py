@@ -0,0 +1,130 @@
+import socketserver
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models.outbox import OutboxEmail
+from app.outbox import enqueue_emails
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: one connection, any number of messages."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply('220 localhost ready')
+        recipients = []
+        while True:
+            line = self.rfile.readline().decode().strip()
+            command = line[:4].upper()
+            if not line or command == 'QUIT':
+                self.reply('221 bye')
+                return
+            if command in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif command == 'MAIL':
+                recipients = []
+                self.reply('250 ok')
+            elif command == 'RCPT':
+                address = line.split(':', 1)[1].strip(' <>')
+                if address in server.rejected:
+                    self.reply('550 no such user')
+                else:
+                    recipients.append(address)
+                    self.reply('250 ok')
+            elif command == 'DATA':
+                self.reply('354 go ahead')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                server.messages.append(recipients)
+                self.reply('250 queued')
+            else:
+                self.reply('250 ok')
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.connections, server.messages, server.rejected = 0, [], set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def mail_app(make_app, smtp_server):
+    app = make_app(MAIL_SERVER='127.0.0.1', MAIL_PORT=smtp_server.server_address[1], MAIL_USE_TLS=False,
+                   MAIL_USERNAME='school@example.com', MAIL_PASSWORD='secret',
+                   MAIL_DEFAULT_SENDER='school@example.com', MAIL_SUPPRESS_SEND=False,
+                   BACKGROUND_WORKERS_ENABLED=False)
+    app.extensions['mail'].username = None  # The stand-in has no AUTH
+    return app
+
+
+def _queue(app, *recipients):
+    with app.app_context():
+        enqueue_emails([('Subject', [r], 'Body') for r in recipients])
+        db.session.commit()
+
+
+def _statuses(app):
+    with app.app_context():
+        return {e.recipients: (e.status, e.attempts) for e in OutboxEmail.query.order_by(OutboxEmail.id)}
+
+
+def test_batch_is_sent_over_one_connection(mail_app, smtp_server):
+    _queue(mail_app, 'a@example.com', 'b@example.com', 'c@example.com')
+    outbox = mail_app.extensions['outbox']
+    with mail_app.app_context():
+        assert outbox.process_batch() is True
+        assert outbox.process_batch() is False
+
+    assert smtp_server.connections == 1
+    assert smtp_server.messages == [['a@example.com'], ['b@example.com'], ['c@example.com']]
+    assert set(_statuses(mail_app).values()) == {('sent', 1)}
+
+
+def test_rejected_recipient_is_retried_later(mail_app, smtp_server):
+    smtp_server.rejected.add('bad@example.com')
+    _queue(mail_app, 'a@example.com', 'bad@example.com')
+    with mail_app.app_context():
+        mail_app.extensions['outbox'].process_batch()
+        retry_at = OutboxEmail.query.filter_by(recipients='bad@example.com').one().next_attempt_at
+
+    assert _statuses(mail_app) == {'a@example.com': ('sent', 1), 'bad@example.com': ('queued', 1)}
+    assert retry_at > datetime.utcnow()
+
+
+def test_outcome_is_not_written_over_a_newer_claim(mail_app, smtp_server):
+    _queue(mail_app, 'a@example.com', 'b@example.com')
+    outbox = mail_app.extensions['outbox']
+    with mail_app.app_context():
+        batch = outbox._claim_batch()
+        token = batch[0].claim_token
+        # Another worker reclaims the first email after this send took too long
+        db.session.execute(db.update(OutboxEmail).where(OutboxEmail.id == batch[0].id)
+                           .values(claim_token='newer', claimed_at=datetime.utcnow() + timedelta(seconds=1)))
+        db.session.commit()
+
+        assert outbox._settle(batch[0], token, 1, status='sent') is False
+        assert outbox._settle(batch[1], token, 1, status='sent') is True
+
+    assert _statuses(mail_app) == {'a@example.com': ('sending', 0), 'b@example.com': ('sent', 1)}
+
+
+def test_notify_does_not_start_disabled_workers(mail_app):
+    outbox = mail_app.extensions['outbox']
+    _queue(mail_app, 'a@example.com')
+    outbox.notify()
+    outbox.start()
+
+    assert outbox._threads == []
+    assert _statuses(mail_app) == {'a@example.com': ('queued', 0)}
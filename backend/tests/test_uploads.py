@@ -0,0 +1,91 @@
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models.upload import StoredFile, Upload
+from app.storage import get_storage
+from app.uploads import part_key, prune_uploads
+
+BODY = b'%PDF-1.4 result slip'
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _start(client, size=len(BODY)):
+    response = client.post('/api/uploads/', json={'filename': 'slip.pdf', 'content_type': 'application/pdf',
+                                                  'size': size})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def _put(client, upload_id, offset, chunk):
+    return client.put(f'/api/uploads/{upload_id}?offset={offset}', data=chunk)
+
+
+def _upload(client, body=BODY):
+    upload_id = _start(client, len(body))
+    assert _put(client, upload_id, 0, body).status_code == 200
+    return upload_id
+
+
+def test_upload_resumes_at_the_reported_offset(client):
+    upload_id = _start(client)
+    assert _put(client, upload_id, 0, BODY[:8]).get_json()['offset'] == 8
+
+    # After a dropped connection the client asks where to carry on
+    status = client.get(f'/api/uploads/{upload_id}').get_json()
+    assert (status['offset'], status['status']) == (8, 'uploading')
+
+    done = _put(client, upload_id, 8, BODY[8:]).get_json()
+    assert done['status'] == 'complete'
+    assert done['sha256'] == hashlib.sha256(BODY).hexdigest()
+
+
+@pytest.mark.parametrize('offset', [0, 12])
+def test_chunk_at_the_wrong_offset_is_refused(client, offset):
+    upload_id = _start(client)
+    _put(client, upload_id, 0, BODY[:8])
+
+    response = _put(client, upload_id, offset, BODY[offset:])
+    assert response.status_code == 409
+    assert response.get_json()['offset'] == 8
+    assert client.get(f'/api/uploads/{upload_id}').get_json()['offset'] == 8
+
+
+def test_identical_files_are_stored_once(app, client):
+    first, second = _upload(client), _upload(client)
+
+    with app.app_context():
+        files = StoredFile.query.all()
+        assert len(files) == 1
+        assert {db.session.get(Upload, i).file_id for i in (first, second)} == {files[0].id}
+        storage = get_storage()
+        assert storage.exists(files[0].storage_key)
+        assert not storage.exists(part_key(second))
+
+
+def test_prune_drops_expired_uploads_and_unused_files(app, client):
+    finished = _upload(client)
+    abandoned = _start(client)
+    _put(client, abandoned, 0, BODY[:8])
+    fresh = _start(client)
+
+    with app.app_context():
+        old = datetime.utcnow() - timedelta(hours=25)
+        db.session.execute(db.update(Upload).where(Upload.id.in_([finished, abandoned])).values(created_at=old))
+        db.session.execute(db.update(StoredFile).values(created_at=old))
+        db.session.commit()
+        key = StoredFile.query.one().storage_key
+
+        assert prune_uploads(24) == (2, 1)
+
+        assert [u.id for u in Upload.query] == [fresh]
+        assert StoredFile.query.count() == 0
+        storage = get_storage()
+        assert not storage.exists(key)
+        assert not storage.exists(part_key(abandoned))
@@ -11,6 +11,7 @@ const categories = ["All", "Academics", "Sports", "Events", "Facilities", "Gener
 // Interface matching Gallery model from Flask backend
 interface Photo {
   src: string;
+  srcSet?: string; // Resized WebP copies, once the backend has made them
   title: string;
   category: string;
 }
@@ -50,19 +51,26 @@ const Gallery = () => {
   // State for extra photos added via admin dashboard
   const [backendPhotos, setBackendPhotos] = useState<Photo[]>([]);
   const [loading, setLoading] = useState(true);
+  const [cursor, setCursor] = useState<string | null>(null);
+  const [moreLoading, setMoreLoading] = useState(false);
+
+  // Fetch one page of gallery images added via admin dashboard,
+  // converted to the same format as hardcoded photos
+  const fetchBackendPage = async (after?: string | null) => {
+    const page = await getGallery<{ image_url: string; srcset: string | null; title: string; category: string }>(after);
+    setCursor(page.nextCursor);
+    return page.items.map((img): Photo => ({
+      src: img.image_url,
+      srcSet: img.srcset ?? undefined,
+      title: img.title,
+      category: img.category
+    }));
+  };
 
-  // Fetch gallery images added via admin dashboard
   const fetchBackendGallery = async () => {
     setLoading(true);
     try {
-      const data = await getGallery();
-      // Convert backend images to same format as hardcoded photos
-      const converted: Photo[] = data.map((img: { image_url: string; title: string; category: string }) => ({
-        src: img.image_url,
-        title: img.title,
-        category: img.category
-      }));
-      setBackendPhotos(converted);
+      setBackendPhotos(await fetchBackendPage());
     } catch (err) {
       console.error("Could not load gallery from backend:", err);
     } finally {
@@ -70,6 +78,19 @@ const Gallery = () => {
     }
   };
 
+  // Append the next page of backend images
+  const loadMoreBackendGallery = async () => {
+    setMoreLoading(true);
+    try {
+      const more = await fetchBackendPage(cursor);
+      setBackendPhotos((prev) => [...prev, ...more]);
+    } catch (err) {
+      console.error("Could not load more gallery images:", err);
+    } finally {
+      setMoreLoading(false);
+    }
+  };
+
   // Fetch backend gallery when page loads
   useEffect(() => {
     fetchBackendGallery();
@@ -129,6 +150,8 @@ const Gallery = () => {
                 >
                   <img
                     src={photo.src}
+                    srcSet={photo.srcSet}
+                    sizes="(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
                     alt={photo.title}
                     className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-500"
                     loading="lazy"
@@ -143,6 +166,18 @@ const Gallery = () => {
               ))}
             </div>
           )}
+          {/* More admin uploads, fetched only when asked for */}
+          {!loading && cursor && (
+            <div className="flex justify-center mt-8">
+              <button
+                onClick={loadMoreBackendGallery}
+                disabled={moreLoading}
+                className="px-5 py-2 rounded-full text-sm font-medium bg-secondary text-secondary-foreground hover:bg-secondary/80 disabled:opacity-50"
+              >
+                {moreLoading ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </div>
       </section>
 
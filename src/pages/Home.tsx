@@ -48,9 +48,9 @@ const Home = () => {
   const fetchNews = async () => {
     setNewsLoading(true);
     try {
-      const data = await getNews();
-      // Show only the latest 3 news articles on homepage
-      setNews(data.slice(0, 3));
+      // Only the latest 3 news articles show on the homepage
+      const { items } = await getNews<NewsItem>(null, 3);
+      setNews(items);
     } catch (err) {
       console.error("Could not load news:", err);
     } finally {
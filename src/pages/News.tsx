@@ -10,7 +10,6 @@ interface NewsItem {
   id: number;
   title: string;
   excerpt: string;
-  content: string;
   category: string;
   created_at: string;
 }
@@ -38,17 +37,22 @@ const News = () => {
   // State for news articles from backend
   const [news, setNews] = useState<NewsItem[]>([]);
   const [newsLoading, setNewsLoading] = useState(true);
+  const [newsCursor, setNewsCursor] = useState<string | null>(null);
+  const [moreNewsLoading, setMoreNewsLoading] = useState(false);
 
   // State for events from backend
   const [events, setEvents] = useState<EventItem[]>([]);
   const [eventsLoading, setEventsLoading] = useState(true);
+  const [eventsCursor, setEventsCursor] = useState<string | null>(null);
+  const [moreEventsLoading, setMoreEventsLoading] = useState(false);
 
-  // Fetch news articles from Flask backend
+  // Fetch the first page of news articles from Flask backend
   const fetchNews = async () => {
     setNewsLoading(true);
     try {
-      const data = await getNews();
-      setNews(data);
+      const page = await getNews<NewsItem>();
+      setNews(page.items);
+      setNewsCursor(page.nextCursor);
     } catch (err) {
       console.error("Could not load news:", err);
     } finally {
@@ -56,12 +60,27 @@ const News = () => {
     }
   };
 
-  // Fetch upcoming events from Flask backend
+  // Append the next page of news articles
+  const loadMoreNews = async () => {
+    setMoreNewsLoading(true);
+    try {
+      const page = await getNews<NewsItem>(newsCursor);
+      setNews((prev) => [...prev, ...page.items]);
+      setNewsCursor(page.nextCursor);
+    } catch (err) {
+      console.error("Could not load more news:", err);
+    } finally {
+      setMoreNewsLoading(false);
+    }
+  };
+
+  // Fetch the first page of upcoming events from Flask backend
   const fetchEvents = async () => {
     setEventsLoading(true);
     try {
-      const data = await getEvents();
-      setEvents(data);
+      const page = await getEvents<EventItem>();
+      setEvents(page.items);
+      setEventsCursor(page.nextCursor);
     } catch (err) {
       console.error("Could not load events:", err);
     } finally {
@@ -69,6 +88,20 @@ const News = () => {
     }
   };
 
+  // Append the next page of events
+  const loadMoreEvents = async () => {
+    setMoreEventsLoading(true);
+    try {
+      const page = await getEvents<EventItem>(eventsCursor);
+      setEvents((prev) => [...prev, ...page.items]);
+      setEventsCursor(page.nextCursor);
+    } catch (err) {
+      console.error("Could not load more events:", err);
+    } finally {
+      setMoreEventsLoading(false);
+    }
+  };
+
   // Fetch both news and events when page loads
   useEffect(() => {
     fetchNews();
@@ -140,6 +173,18 @@ const News = () => {
               ))}
             </div>
           )}
+          {/* Next page, fetched only when asked for */}
+          {!newsLoading && newsCursor && (
+            <div className="flex justify-center mt-8">
+              <button
+                onClick={loadMoreNews}
+                disabled={moreNewsLoading}
+                className="px-5 py-2 rounded-full text-sm font-medium bg-secondary text-secondary-foreground hover:bg-secondary/80 disabled:opacity-50"
+              >
+                {moreNewsLoading ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </div>
       </section>
 
@@ -186,6 +231,18 @@ const News = () => {
               ))}
             </div>
           )}
+          {/* Next page, fetched only when asked for */}
+          {!eventsLoading && eventsCursor && (
+            <div className="flex justify-center mt-8">
+              <button
+                onClick={loadMoreEvents}
+                disabled={moreEventsLoading}
+                className="px-5 py-2 rounded-full text-sm font-medium bg-secondary text-secondary-foreground hover:bg-secondary/80 disabled:opacity-50"
+              >
+                {moreEventsLoading ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </div>
       </section>
     </Layout>
@@ -17,6 +17,7 @@ interface Testimonial {
 interface GalleryImage {
   id: number;
   image_url: string;
+  srcset: string | null; // Resized WebP copies, once the backend has made them
   title: string;
   category: string;
   created_at: string;
@@ -64,8 +65,8 @@ const StudentLife = () => {
   const fetchGallery = async () => {
     setGalleryLoading(true);
     try {
-      const data = await getGallery();
-      setGalleryImages(data.slice(0, 2));
+      const { items } = await getGallery<GalleryImage>(null, 2);
+      setGalleryImages(items);
     } catch (err) {
       console.error("Could not load gallery:", err);
     } finally {
@@ -163,6 +164,8 @@ const StudentLife = () => {
                 >
                   <img
                     src={image.image_url}
+                    srcSet={image.srcset ?? undefined}
+                    sizes="(min-width: 768px) 50vw, 100vw"
                     alt={image.title}
                     className="w-full h-64 object-cover"
                     loading="lazy"
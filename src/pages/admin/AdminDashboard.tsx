@@ -17,7 +17,8 @@ import {
   getGallery, createGalleryImage, deleteGalleryImage,
   getTestimonials, createTestimonial, deleteTestimonial,
   getContactSubmissions, markSubmissionRead, deleteSubmission,
-  getAdmissions, getAdmissionStats, updateAdmissionStatus, deleteAdmission
+  getAdmissions, getAdmissionStats, updateAdmissionStatus, deleteAdmission,
+  isProtectedDocument, openAdmissionDocument
 } from "@/services/api";
 import schoolBadge from "@/assets/school-badge.jpeg";
 
@@ -212,6 +213,20 @@ const SectionHeader = ({ icon: Icon, title, desc, onAdd, addLabel, badge }: {
   </div>
 );
 
+// Fetches the next page of a paged list when clicked
+const LoadMoreButton = ({ onLoad }: { onLoad: () => Promise<void> }) => {
+  const [loading, setLoading] = useState(false);
+  const load = async () => {
+    setLoading(true);
+    try { await onLoad(); } finally { setLoading(false); }
+  };
+  return (
+    <div className="flex justify-center mt-4">
+      <Button variant="outline" size="sm" onClick={load} disabled={loading}>{loading ? "Loading..." : "Load more"}</Button>
+    </div>
+  );
+};
+
 // ─── Main Dashboard ───────────────────────────────────────────────────────────
 
 const AdminDashboard = () => {
@@ -237,18 +252,21 @@ const AdminDashboard = () => {
   // ── News state ──
   const [news, setNews] = useState<NewsItem[]>([]);
   const [newsLoading, setNewsLoading] = useState(true);
+  const [newsCursor, setNewsCursor] = useState<string | null>(null);
   const [showNewsModal, setShowNewsModal] = useState(false);
   const [newsForm, setNewsForm] = useState({ title: "", excerpt: "", category: "" });
 
   // ── Events state ──
   const [events, setEvents] = useState<EventItem[]>([]);
   const [eventsLoading, setEventsLoading] = useState(true);
+  const [eventsCursor, setEventsCursor] = useState<string | null>(null);
   const [showEventModal, setShowEventModal] = useState(false);
   const [eventForm, setEventForm] = useState({ title: "", date: "", description: "" });
 
   // ── Gallery state ──
   const [gallery, setGallery] = useState<GalleryImage[]>([]);
   const [galleryLoading, setGalleryLoading] = useState(true);
+  const [galleryCursor, setGalleryCursor] = useState<string | null>(null);
   const [showGalleryModal, setShowGalleryModal] = useState(false);
   const [galleryForm, setGalleryForm] = useState({ image_url: "", title: "", category: "" });
 
@@ -301,25 +319,40 @@ const AdminDashboard = () => {
 
   const fetchNews = async () => {
     setNewsLoading(true);
-    try { setNews(await getNews()); }
+    try { const page = await getNews<NewsItem>(); setNews(page.items); setNewsCursor(page.nextCursor); }
     catch { toast({ title: "Error", description: "Could not load news", variant: "destructive" }); }
     finally { setNewsLoading(false); }
   };
 
+  const loadMoreNews = async () => {
+    try { const page = await getNews<NewsItem>(newsCursor); setNews(prev => [...prev, ...page.items]); setNewsCursor(page.nextCursor); }
+    catch { toast({ title: "Error", description: "Could not load more news", variant: "destructive" }); }
+  };
+
   const fetchEvents = async () => {
     setEventsLoading(true);
-    try { setEvents(await getEvents()); }
+    try { const page = await getEvents<EventItem>(); setEvents(page.items); setEventsCursor(page.nextCursor); }
     catch { toast({ title: "Error", description: "Could not load events", variant: "destructive" }); }
     finally { setEventsLoading(false); }
   };
 
+  const loadMoreEvents = async () => {
+    try { const page = await getEvents<EventItem>(eventsCursor); setEvents(prev => [...prev, ...page.items]); setEventsCursor(page.nextCursor); }
+    catch { toast({ title: "Error", description: "Could not load more events", variant: "destructive" }); }
+  };
+
   const fetchGallery = async () => {
     setGalleryLoading(true);
-    try { setGallery(await getGallery()); }
+    try { const page = await getGallery<GalleryImage>(); setGallery(page.items); setGalleryCursor(page.nextCursor); }
     catch { toast({ title: "Error", description: "Could not load gallery", variant: "destructive" }); }
     finally { setGalleryLoading(false); }
   };
 
+  const loadMoreGallery = async () => {
+    try { const page = await getGallery<GalleryImage>(galleryCursor); setGallery(prev => [...prev, ...page.items]); setGalleryCursor(page.nextCursor); }
+    catch { toast({ title: "Error", description: "Could not load more gallery", variant: "destructive" }); }
+  };
+
   const fetchTestimonials = async () => {
     setTestimonialsLoading(true);
     try { setTestimonials(await getTestimonials()); }
@@ -830,6 +863,7 @@ const AdminDashboard = () => {
               ))}
             </div>
           )}
+          {!newsLoading && newsCursor && <LoadMoreButton onLoad={loadMoreNews} />}
         </section>
 
         {/* ── Events Management ── */}
@@ -849,6 +883,7 @@ const AdminDashboard = () => {
               ))}
             </div>
           )}
+          {!eventsLoading && eventsCursor && <LoadMoreButton onLoad={loadMoreEvents} />}
         </section>
 
         {/* ── Gallery Management ── */}
@@ -870,6 +905,7 @@ const AdminDashboard = () => {
               ))}
             </div>
           )}
+          {!galleryLoading && galleryCursor && <LoadMoreButton onLoad={loadMoreGallery} />}
         </section>
 
         {/* ── Testimonials Management ── */}
@@ -1089,7 +1125,11 @@ const AdminDashboard = () => {
                     <div key={label} className="flex items-center justify-between bg-muted/40 rounded-lg px-4 py-2.5 text-sm">
                       <span className="text-muted-foreground">{label}</span>
                       {url ? (
-                        <a href={url} target="_blank" rel="noopener noreferrer" className="inline-flex items-center gap-1 text-primary font-medium hover:underline text-xs">
+                        <a href={url} target="_blank" rel="noopener noreferrer" className="inline-flex items-center gap-1 text-primary font-medium hover:underline text-xs"
+                          onClick={isProtectedDocument(url) ? (e) => {
+                            e.preventDefault();
+                            openAdmissionDocument(url).catch(() => toast({ title: "Error", description: "Could not open document", variant: "destructive" }));
+                          } : undefined}>
                           <ExternalLink className="w-3.5 h-3.5" /> View
                         </a>
                       ) : (
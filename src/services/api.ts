@@ -1,5 +1,8 @@
 // Base URL for the Flask backend AP
 const API_URL = 'https://kakamega-school-backend.onrender.com/api'
+// Media and document links from the API may be paths on the backend's origin
+const API_ORIGIN = new URL(API_URL).origin
+const withApiOrigin = (url: string) => (url.startsWith('/') ? `${API_ORIGIN}${url}` : url)
 // Helper function to get the JWT token from localStorage
 const getToken = () => localStorage.getItem('access_token')
 
@@ -9,6 +12,38 @@ const getHeaders = () => ({
   ...(getToken() && { Authorization: `Bearer ${getToken()}` })
 })
 
+// List endpoints return one page at a time
+const PAGE_SIZE = 100  // The backend's PAGE_SIZE_MAX
+
+// News, events, gallery: one page per call, newest first, with only the
+// columns the cards show. Pass nextCursor back in to load the next page;
+// it is null on the last one
+export type CursorPage<T> = { items: T[]; nextCursor: string | null }
+const fetchCursorPage = async <T>(url: string, fields: string, cursor?: string | null, limit = PAGE_SIZE):
+  Promise<CursorPage<T>> => {
+  const params = new URLSearchParams({ limit: String(limit), fields, ...(cursor && { cursor }) })
+  const res = await fetch(`${url}?${params}`, { headers: getHeaders() })
+  const body = await res.json()
+  if (!res.ok) throw new Error(body.error ?? `Request failed (${res.status})`)
+  return { items: body, nextCursor: res.headers.get('X-Next-Cursor') }
+}
+const NEWS_FIELDS = 'id,title,excerpt,category,created_at'
+const EVENT_FIELDS = 'id,title,date,description,created_at'  // Events have no excerpt or image
+const GALLERY_FIELDS = 'id,image_url,srcset,jpeg_srcset,title,category,created_at'
+
+// Admin tables: every row, numbered pages until X-Total-Count. An error response is returned as-is
+const fetchAllByPage = async (url: string, filters: Record<string, string> = {}) => {
+  const items: unknown[] = []
+  for (let page = 1; ; page++) {
+    const params = new URLSearchParams({ ...filters, page: String(page), per_page: String(PAGE_SIZE) })
+    const res = await fetch(`${url}?${params}`, { headers: getHeaders() })
+    const body = await res.json()
+    if (!res.ok) return body
+    items.push(...body)
+    if (body.length < PAGE_SIZE || items.length >= Number(res.headers.get('X-Total-Count') ?? 0)) return items
+  }
+}
+
 // AUTH
 export const loginAdmin = (email: string, password: string) =>
   fetch(`${API_URL}/auth/login`, {
@@ -39,8 +74,8 @@ export const deleteStaff = (id: number) =>
   }).then(res => res.json())
 
 // NEWS
-export const getNews = () =>
-  fetch(`${API_URL}/news/`, { headers: getHeaders() }).then(res => res.json())
+export const getNews = <T>(cursor?: string | null, limit?: number) =>
+  fetchCursorPage<T>(`${API_URL}/news/`, NEWS_FIELDS, cursor, limit)
 export const createNews = (data: object) =>
   fetch(`${API_URL}/news/`, {
     method: 'POST',
@@ -54,8 +89,8 @@ export const deleteNews = (id: number) =>
   }).then(res => res.json())
 
 // EVENTS
-export const getEvents = () =>
-  fetch(`${API_URL}/events/`, { headers: getHeaders() }).then(res => res.json())
+export const getEvents = <T>(cursor?: string | null, limit?: number) =>
+  fetchCursorPage<T>(`${API_URL}/events/`, EVENT_FIELDS, cursor, limit)
 export const createEvent = (data: object) =>
   fetch(`${API_URL}/events/`, {
     method: 'POST',
@@ -69,8 +104,18 @@ export const deleteEvent = (id: number) =>
   }).then(res => res.json())
 
 // GALLERY
-export const getGallery = () =>
-  fetch(`${API_URL}/gallery/`, { headers: getHeaders() }).then(res => res.json())
+type GallerySrcsets = { srcset?: string | null; jpeg_srcset?: string | null }
+const srcsetWithApiOrigin = (srcset?: string | null) =>
+  srcset && srcset.split(', ').map(withApiOrigin).join(', ')
+export const getGallery = <T>(cursor?: string | null, limit?: number): Promise<CursorPage<T>> =>
+  fetchCursorPage<GallerySrcsets>(`${API_URL}/gallery/`, GALLERY_FIELDS, cursor, limit).then(page => ({
+    ...page,
+    items: page.items.map(image => ({
+      ...image,
+      srcset: srcsetWithApiOrigin(image.srcset),
+      jpeg_srcset: srcsetWithApiOrigin(image.jpeg_srcset)
+    })) as T[]
+  }))
 export const createGalleryImage = (data: object) =>
   fetch(`${API_URL}/gallery/`, {
     method: 'POST',
@@ -114,8 +159,7 @@ export const deleteAlumni = (id: number) =>
   }).then(res => res.json())
 
 // CONTACT SUBMISSIONS
-export const getContactSubmissions = () =>
-  fetch(`${API_URL}/contact/`, { headers: getHeaders() }).then(res => res.json())
+export const getContactSubmissions = () => fetchAllByPage(`${API_URL}/contact/`)
 export const submitContact = (data: object) =>
   fetch(`${API_URL}/contact/`, {
     method: 'POST',
@@ -141,9 +185,7 @@ export const submitAdmission = (data: object) =>
     body: JSON.stringify(data)
   }).then(res => res.json())
 export const getAdmissions = (status?: string) =>
-  fetch(`${API_URL}/admissions/${status ? `?status=${status}` : ''}`, {
-    headers: getHeaders()
-  }).then(res => res.json())
+  fetchAllByPage(`${API_URL}/admissions/`, status ? { status } : {})
 export const getAdmissionStats = () =>
   fetch(`${API_URL}/admissions/stats`, { headers: getHeaders() }).then(res => res.json())
 export const updateAdmissionStatus = (id: number, data: object) =>
@@ -156,4 +198,25 @@ export const deleteAdmission = (id: number) =>
   fetch(`${API_URL}/admissions/${id}`, {
     method: 'DELETE',
     headers: getHeaders()
-  }).then(res => res.json())
\ No newline at end of file
+  }).then(res => res.json())
+
+// Documents uploaded through /api/uploads are only served to admins, so a plain link
+// can't open them: fetch with the token and show the file from a blob URL.
+// Newer rows store the path alone (/api/admissions/documents/...), older ones the full URL
+export const isProtectedDocument = (url: string) =>
+  withApiOrigin(url).startsWith(`${API_URL}/admissions/documents/`)
+export const openAdmissionDocument = (url: string) => {
+  const tab = window.open('', '_blank')  // Opened now, while the click still allows pop-ups
+  return fetch(withApiOrigin(url), { headers: getHeaders() })
+    .then(res => {
+      if (!res.ok) throw new Error(`Document request failed (${res.status})`)
+      return res.blob()
+    })
+    .then(blob => {
+      if (tab) tab.location.href = URL.createObjectURL(blob)
+    })
+    .catch(err => {
+      tab?.close()
+      throw err
+    })
+}
\ No newline at end of file